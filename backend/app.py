@@ -1,37 +1,229 @@
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 
-app = Flask(__name__)
+jwt = JWTManager()
+bcrypt = Bcrypt()
 
-CORS(app, resources={r"/*": {"origins": "*"}})
 
-app.config["JWT_SECRET_KEY"] = "super-secret-key-change-this"
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = 86400
-app.config["TEACHER_SECRET_KEY"] = "FACULTY2024"
+def create_app(config=None):
+    """Build the Flask app.
 
-jwt = JWTManager(app)
-bcrypt = Bcrypt(app)
+    Cheap by design: the analytics stack (pandas, numpy, sklearn) is imported
+    by the first request that needs it, and schema work is a single version
+    check once the database is current.
+    """
+    app = Flask(__name__)
 
-# --- DATABASE INIT ---
-from database.init_db import init_database
-init_database()
+    CORS(app, resources={r"/*": {"origins": "*"}})
 
-# --- IMPORT BLUEPRINTS ---
-from routes.upload_routes import upload_bp
-from routes.auth_routes import auth_bp
-from routes.ml_routes import ml_bp
-from routes.student_routes import student_bp
+    app.config["JWT_SECRET_KEY"] = "super-secret-key-change-this"
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = 86400
+    app.config["TEACHER_SECRET_KEY"] = "FACULTY2024"
+    # Work factor for passwords; logins re-hash stored hashes of another cost
+    app.config["BCRYPT_LOG_ROUNDS"] = 12
+    # Login bcrypt pool: workers (default: all cores, 0 = request thread) and
+    # queue depth past which logins get 503 + Retry-After
+    app.config["LOGIN_VERIFY_WORKERS"] = None
+    app.config["LOGIN_MAX_PENDING"] = None
+    # Initial passwords of auto-created / bulk-uploaded students (hashed in parallel)
+    app.config["BULK_PASSWORD_LOG_ROUNDS"] = 10
+    # LRU bound for cached /api/ml responses (invalidated per teacher on upload)
+    app.config["RESPONSE_CACHE_MAX_ENTRIES"] = 1024
+    # Rows per committed batch when streaming a CSV upload
+    app.config["UPLOAD_CHUNK_SIZE"] = 5000
+    # Rejected CSV lines listed in an upload report (the count is always exact)
+    app.config["UPLOAD_MAX_REPORTED_REJECTIONS"] = 1000
+    # Background upload jobs (?async=1): worker threads and spool directory
+    # (defaults to upload_spool/ next to the database)
+    app.config["UPLOAD_JOB_WORKERS"] = 2
+    app.config["UPLOAD_SPOOL_DIR"] = None
+    # A running job is taken over by another worker only after its lease
+    # (renewed per chunk) expires; must exceed the slowest chunk
+    app.config["UPLOAD_JOB_LEASE_SECONDS"] = 600
+    # Rows per Parquet row group / Arrow batch in /api/export/performance
+    app.config["EXPORT_BATCH_ROWS"] = 50000
+    # Trained risk models (defaults to risk_models/ next to the database);
+    # the active one is loaded in the background when the app starts
+    app.config["RISK_MODEL_DIR"] = None
+    app.config["RISK_MODEL_PRELOAD"] = True
+    # Intervention / suggestion rules (defaults to ml/rules.json); edits are
+    # picked up on the next request
+    app.config["RULES_PATH"] = None
+    # Threads computing /api/dashboard sections concurrently
+    app.config["DASHBOARD_WORKERS"] = 4
+    # Structured JSON line per request on the "request_log" logger
+    app.config["REQUEST_LOG"] = True
+    # Apply pending migrations at start-up; turn off when `flask migrate`
+    # runs once per deploy, so worker spawns only check the version
+    app.config["AUTO_MIGRATE"] = True
 
-app.register_blueprint(upload_bp)
-app.register_blueprint(auth_bp)
-app.register_blueprint(ml_bp)
-app.register_blueprint(student_bp)
+    if config:
+        app.config.update(config)
 
-@app.route("/")
-def home():
-    return jsonify({"message": "Backend running"})
+    jwt.init_app(app)
+    bcrypt.init_app(app)
 
+    # --- METRICS (/metrics, per-request latency and SQL log line) ---
+    from utils import metrics
+    metrics.init_app(app)
+
+    # --- DATABASE CONNECTIONS (pooled, one per request) ---
+    from database import db
+    db.init_app(app)
+
+    # --- DATABASE INIT (pending migrations only) ---
+    from database.init_db import init_database, schema_is_current
+    with app.app_context():
+        if app.config["AUTO_MIGRATE"]:
+            init_database()
+        elif not schema_is_current():
+            app.logger.warning("Database schema is behind, run `flask migrate`")
+
+    # --- BACKGROUND UPLOAD JOBS (resumed after a restart) ---
+    from services import upload_jobs
+    upload_jobs.init_app(app)
+
+    # --- RISK MODEL (active version warm-loaded in the background) ---
+    from services import risk_models
+    risk_models.init_app(app)
+
+    register_commands(app)
+
+    # --- IMPORT BLUEPRINTS ---
+    from routes.upload_routes import upload_bp
+    from routes.auth_routes import auth_bp
+    from routes.ml_routes import ml_bp
+    from routes.student_routes import student_bp
+    from routes.export_routes import export_bp
+    from routes.admin_routes import admin_bp
+    from routes.dashboard_routes import dashboard_bp
+
+    app.register_blueprint(upload_bp)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(ml_bp)
+    app.register_blueprint(student_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(dashboard_bp)
+
+    @app.route("/")
+    def home():
+        return jsonify({"message": "Backend running"})
+
+    return app
+
+
+def register_commands(app):
+    from database.init_db import init_database
+
+    @app.cli.command("migrate")
+    def migrate_command():
+        """Apply pending schema migrations."""
+        applied = init_database()
+        print(f"Applied migrations: {applied}" if applied else "Schema is up to date")
+
+    @app.cli.command("rebuild-aggregates")
+    def rebuild_aggregates_command():
+        """Verify the aggregate tables against performance, then rebuild them."""
+        from models.aggregates import find_aggregate_mismatches, rebuild_aggregates
+
+        print(f"Mismatched groups before rebuild: {find_aggregate_mismatches()}")
+        rebuild_aggregates()
+        print(f"Mismatched groups after rebuild: {find_aggregate_mismatches()}")
+
+    @app.cli.command("rebuild-student-features")
+    @click.option("--check-only", is_flag=True, help="Report mismatches without rebuilding")
+    def rebuild_student_features_command(check_only):
+        """Verify the student feature store against a full recompute, then rebuild it."""
+        from models.student_features import find_feature_mismatches, rebuild_student_features
+
+        print(f"Mismatched students: {find_feature_mismatches()}")
+
+        if not check_only:
+            rebuild_student_features()
+            print(f"Mismatched students after rebuild: {find_feature_mismatches()}")
+
+    @app.cli.command("rebuild-cube")
+    @click.option("--check-only", is_flag=True, help="Report mismatches without rebuilding")
+    def rebuild_cube_command(check_only):
+        """Verify the institution rollup cube against performance, then rebuild it."""
+        from models.cube import find_cube_mismatches, rebuild_cube
+
+        print(f"Mismatched cube cells: {find_cube_mismatches()}")
+
+        if not check_only:
+            rebuild_cube()
+            print(f"Mismatched cube cells after rebuild: {find_cube_mismatches()}")
+
+    @app.cli.command("train-risk-model")
+    @click.option("--no-activate", is_flag=True, help="Store the model without making it active")
+    def train_risk_model_command(no_activate):
+        """Fit the next-semester failure model on all performance history."""
+        from services.risk_models import train_and_register
+
+        entry = train_and_register(activate=not no_activate)
+        print(f"Stored {entry['artifact']} ({entry['samples']} samples, "
+              f"holdout AUC {entry['holdout_auc']})"
+              + ("" if no_activate else ", now active"))
+
+    @app.cli.command("risk-models")
+    @click.option("--activate", "version", type=int, default=None, help="Make this version active")
+    def risk_models_command(version):
+        """List stored risk model versions, or switch the active one."""
+        from ml.model_registry import activate_model, list_models
+        from services.risk_models import MODEL_NAME, get_model_dir
+
+        directory = get_model_dir()
+
+        if version is not None:
+            activate_model(directory, MODEL_NAME, version)
+            print(f"Activated {MODEL_NAME} v{version}; restart workers to load it")
+
+        for entry in list_models(directory, MODEL_NAME):
+            print(f"{'*' if entry['active'] else ' '} v{entry['version']}  {entry['created_at']}  "
+                  f"samples={entry['samples']}  auc={entry['holdout_auc']}")
+
+    @app.cli.command("check-rules")
+    @click.argument("path", required=False)
+    def check_rules_command(path):
+        """Validate a rule file (default: the configured one) before deploying it."""
+        from ml.rule_engine import load_rules
+        from services.rules import get_rules_path
+
+        path = path or get_rules_path()
+
+        try:
+            book = load_rules(path)
+        except (OSError, ValueError) as e:
+            raise click.ClickException(str(e))
+
+        print(f"{path}: version {book.version}")
+        for name, rule_set in book.rule_sets.items():
+            print(f"  {name}: {len(rule_set.outcomes)} rules ({rule_set.mode})")
+
+    @app.cli.command("export-performance")
+    @click.option("--format", "fmt", default="parquet", help="csv, parquet or arrow")
+    @click.option("--output", required=True, help="File to write")
+    @click.option("--teacher-id", type=int, default=None, help="Teacher user id (default: institution)")
+    @click.option("--semester", default=None)
+    def export_performance_command(fmt, output, teacher_id, semester):
+        """Stream performance data to a CSV, Parquet or Arrow IPC file."""
+        from services.export_service import export_performance, describe_throughput
+
+        stats = {}
+
+        with open(output, "wb") as f:
+            for chunk in export_performance(fmt, teacher_id, semester, stats=stats):
+                f.write(chunk)
+
+        print(f"Wrote {output}: {describe_throughput(stats)}")
+
+
+# WSGI servers and `flask --app wsgi` use wsgi.app. No app at import time
+# here: hashing pool workers re-import the main module, and under
+# `python app.py` that must not run the factory again in each of them.
 if __name__ == "__main__":
-    app.run(port=5000, debug=True)
\ No newline at end of file
+    create_app().run(port=5000, debug=True)
\ No newline at end of file
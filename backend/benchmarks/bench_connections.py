@@ -0,0 +1,70 @@
+"""Per-request connection overhead: fresh sqlite3.connect versus the pool.
+
+Run from the backend folder:
+
+    python benchmarks/bench_connections.py --requests 2000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Connections a typical dashboard request used to open (class health opens two)
+CONNECTIONS_PER_REQUEST = 2
+
+
+def fresh_request(path):
+    for _ in range(CONNECTIONS_PER_REQUEST):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        conn.close()
+
+
+def pooled_request(app):
+    from database.db import get_read_connection
+
+    with app.app_context():
+        for _ in range(CONNECTIONS_PER_REQUEST):
+            conn = get_read_connection()
+            conn.execute("SELECT COUNT(*) FROM users").fetchone()
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_connections_"))
+
+    from wsgi import app
+    from database.db import get_database_path, get_pool_stats
+
+    with app.app_context():
+        path = get_database_path()
+
+    for label, request in (
+        ("fresh connect", lambda: fresh_request(path)),
+        ("pooled", lambda: pooled_request(app)),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            request()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<14} {elapsed * 1e6 / args.requests:8.1f} us/request")
+
+    for name, stats in get_pool_stats().items():
+        print(name, stats)
+
+    print("journal_mode:", sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0])
+
+
+if __name__ == "__main__":
+    main()
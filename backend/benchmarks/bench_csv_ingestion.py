@@ -0,0 +1,116 @@
+"""Streaming chunked CSV upload versus loading the whole file at once.
+
+Run from the backend folder:
+
+    python benchmarks/bench_csv_ingestion.py --rows 1000000 --students 10000
+
+Each mode runs in a fresh process so peak RSS is reported per mode.
+"""
+import argparse
+import csv
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+MODES = ("parse-only", "streaming", "whole-file")
+
+
+def write_csv(path, n_rows, n_students, bad_every=1000, seed=11):
+    """One row per (student, subject); every ``bad_every``-th row is invalid."""
+    rnd = random.Random(seed)
+    n_subjects = -(-n_rows // n_students)
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "subject", "semester", "marks", "attendance"])
+
+        for i in range(n_rows):
+            marks = "n/a" if i % bad_every == bad_every - 1 else rnd.randint(0, 100)
+            writer.writerow([
+                f"STU{i % n_students:06d}",
+                f"Subject {i // n_students:03d}",
+                "1",
+                marks,
+                rnd.randint(30, 100)
+            ])
+
+    return n_subjects
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, path, chunk_size):
+    from werkzeug.datastructures import FileStorage
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_csv_"))
+
+    from wsgi import app
+    from models.performance import insert_performance_data
+    from services.ingestion_service import ingest_csv
+    from utils.csv_parser import RejectedRows, iter_csv_chunks, parse_csv
+
+    app.config["BULK_PASSWORD_LOG_ROUNDS"] = 4
+
+    with open(path, "rb") as f, app.app_context():
+        upload = FileStorage(stream=f, filename="upload.csv")
+        start = time.perf_counter()
+
+        if mode == "parse-only":
+            rejected = RejectedRows(0)
+            rows = sum(len(chunk) for chunk in iter_csv_chunks(upload, chunk_size, rejected))
+        elif mode == "streaming":
+            rows = ingest_csv(upload, "1", 1, chunk_size)["accepted"]
+        else:
+            data = parse_csv(upload)
+            rows = len(data)
+            insert_performance_data(data, "1", 1)
+
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"{mode:<11} {rows:>9} rows  {elapsed:8.1f} s  "
+        f"{rows / elapsed:>10,.0f} rows/s  peak RSS {peak_rss_mb():7.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.file, args.chunk_size)
+        return
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_csv_"), "upload.csv")
+    n_subjects = write_csv(path, args.rows, args.students)
+    print(
+        f"{args.rows} rows, {args.students} students x {n_subjects} subjects, "
+        f"{os.path.getsize(path) / 2**20:.1f} MB on disk"
+    )
+
+    for mode in args.modes.split(","):
+        subprocess.run([
+            sys.executable, os.path.abspath(__file__),
+            "--mode", mode,
+            "--file", path,
+            "--chunk-size", str(args.chunk_size)
+        ], check=True)
+
+
+if __name__ == "__main__":
+    main()
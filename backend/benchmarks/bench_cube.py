@@ -0,0 +1,214 @@
+"""Admin analytics: GROUP BY over performance versus the rollup cube.
+
+Run from the backend folder:
+
+    python benchmarks/bench_cube.py --students 50000
+
+Fills a scratch database straight through SQL (no password hashing) with
+an institution of departments, batches and sections over several academic
+years - 50k students give 2.4M performance rows - then times typical admin
+slices computed from raw performance against the same slices read from
+agg_institution_cube, checking they agree. Also times a full cube rebuild
+and the incremental refresh a 5k-row upload adds.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DEPARTMENTS = ("CSE", "ECE", "MECH", "CIVIL", "EEE")
+SECTIONS = ("A", "B", "C")
+BATCHES = ("2021", "2022", "2023", "2024")
+YEARS = ("2022-2023", "2023-2024", "2024-2025", "2025-2026")
+SEMESTERS_PER_YEAR = 2
+SUBJECTS_PER_SEMESTER = 6
+
+# (label, group_by, filters) - what the admin views ask for
+SLICES = (
+    ("by department", ["department"], {}),
+    ("year x department", ["academic_year", "department"], {}),
+    ("one year, by batch x section", ["batch", "section"], {"academic_year": ["2024-2025"]}),
+    ("one department, by subject", ["subject"], {"department": ["CSE"]}),
+    ("one semester, dept x batch x section", ["department", "batch", "section"], {"semester": ["7"]}),
+)
+
+NAIVE_DIMENSIONS = {
+    "academic_year": "sem.academic_year",
+    "semester": "sem.name",
+    "department": "s.department",
+    "section": "s.section",
+    "batch": "s.batch",
+    "subject": "sub.name",
+}
+
+
+def populate(cursor, students, seed=7):
+    rnd = random.Random(seed)
+
+    cursor.execute("INSERT INTO users (roll_number, password_hash, role) VALUES ('bench-teacher', '-', 'teacher')")
+    teacher_user_id = cursor.lastrowid
+    cursor.execute("INSERT INTO teachers (user_id, department) VALUES (?, 'ALL')", (teacher_user_id,))
+    teacher_id = cursor.lastrowid
+
+    cursor.executemany(
+        "INSERT INTO users (roll_number, password_hash, role) VALUES (?, '-', 'student')",
+        [(f"CUBE{i:07d}",) for i in range(students)]
+    )
+    cursor.execute("SELECT id FROM users WHERE roll_number LIKE 'CUBE%' ORDER BY id")
+    user_ids = [r["id"] for r in cursor.fetchall()]
+    cursor.executemany(
+        "INSERT INTO students (user_id, name, department, section, batch) VALUES (?, ?, ?, ?, ?)",
+        [
+            (uid, f"Student {i}", DEPARTMENTS[i % 5], SECTIONS[i // 5 % 3], BATCHES[i // 15 % 4])
+            for i, uid in enumerate(user_ids)
+        ]
+    )
+    cursor.execute("SELECT id FROM students ORDER BY id")
+    student_ids = [r["id"] for r in cursor.fetchall()]
+
+    allocations = []
+    number = 0
+    for year in YEARS:
+        for _ in range(SEMESTERS_PER_YEAR):
+            number += 1
+            cursor.execute("INSERT INTO semesters (name, academic_year) VALUES (?, ?)", (str(number), year))
+            semester_id = cursor.lastrowid
+            for k in range(SUBJECTS_PER_SEMESTER):
+                cursor.execute("INSERT INTO subjects (name) VALUES (?)", (f"S{number}-{k}",))
+                subject_id = cursor.lastrowid
+                cursor.execute(
+                    "INSERT INTO subject_allocations (subject_id, teacher_id, semester_id) VALUES (?, ?, ?)",
+                    (subject_id, teacher_id, semester_id)
+                )
+                allocations.append((cursor.lastrowid, f"S{number}-{k}", str(number)))
+
+    ability = [rnd.gauss(60, 15) for _ in student_ids]
+
+    for allocation_id, subject, semester in allocations:
+        cursor.executemany("""
+            INSERT INTO performance
+            (student_id, teacher_id, subject, semester, marks, attendance, recorded_at, allocation_id)
+            VALUES (?, ?, ?, ?, ?, ?, '2025-01-01', ?)
+        """, [
+            (
+                sid, teacher_user_id, subject, semester,
+                max(0, min(100, int(ability[i] + rnd.gauss(0, 10)))),
+                rnd.randint(40, 100), allocation_id
+            )
+            for i, sid in enumerate(student_ids)
+        ])
+
+    return teacher_user_id, len(student_ids) * len(allocations)
+
+
+def naive_slice(cursor, group_by, filters):
+    """The same slice straight from performance."""
+    where = [f"{NAIVE_DIMENSIONS[d]} IN ({', '.join('?' * len(v))})" for d, v in filters.items()]
+    params = [value for values in filters.values() for value in values]
+    keys = ", ".join(NAIVE_DIMENSIONS[d] for d in group_by)
+
+    cursor.execute(f"""
+        SELECT {keys}, COUNT(*) as n, SUM(p.marks) as sum_marks
+        FROM performance p
+        JOIN subject_allocations sa ON p.allocation_id = sa.id
+        JOIN semesters sem ON sa.semester_id = sem.id
+        JOIN subjects sub ON sa.subject_id = sub.id
+        JOIN students s ON p.student_id = s.id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        GROUP BY {keys}
+    """, params)
+
+    return {
+        tuple(row[:len(group_by)]): (row["n"], row["sum_marks"])
+        for row in cursor.fetchall()
+    }
+
+
+def timed(func, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_cube_")
+    os.environ["DATABASE_PATH"] = os.path.join(workdir, "bench.db")
+
+    from app import create_app
+    from database.db import get_connection
+    from models.cube import (
+        apply_cube_deltas,
+        collect_cube_deltas,
+        find_cube_mismatches,
+        load_student_dimensions,
+        query_cube,
+        rebuild_cube
+    )
+
+    app = create_app()
+
+    with app.app_context():
+        conn = get_connection()
+        cursor = conn.cursor()
+        (_, rows), seconds = timed(lambda: populate(cursor, args.students))
+        conn.commit()
+        print(f"populated {rows:,} performance rows in {seconds:.1f}s")
+
+        _, seconds = timed(rebuild_cube)
+        cursor.execute("SELECT COUNT(*) as c FROM agg_institution_cube")
+        print(f"cube rebuild            : {seconds * 1000:9.1f} ms  "
+              f"({cursor.fetchone()['c']:,} cells)")
+
+        for label, group_by, filters in SLICES:
+            expected, naive = timed(lambda: naive_slice(cursor, group_by, filters))
+            result, cube = timed(lambda: query_cube(group_by, filters), args.repeat)
+
+            assert {
+                tuple(r[d] for d in group_by): (r["records"], r["average_marks"]) for r in result
+            } == {
+                key: (n, round(sum_marks / n, 2)) for key, (n, sum_marks) in expected.items()
+            }, label
+
+            print(f"{label:<38} naive {naive * 1000:8.1f} ms   cube {cube * 1000:6.2f} ms")
+
+        # Incremental refresh for one 5k-row upload chunk (rolled back)
+        cursor.execute("""
+            SELECT p.student_id, sa.semester_id, sa.subject_id, p.marks, p.attendance
+            FROM performance p JOIN subject_allocations sa ON p.allocation_id = sa.id
+            LIMIT 5000
+        """)
+        batch = cursor.fetchall()
+
+        def refresh():
+            apply_cube_deltas(cursor, collect_cube_deltas(
+                (
+                    (r["semester_id"], r["subject_id"], r["student_id"],
+                     (r["marks"], r["attendance"]), (min(r["marks"] + 1, 100), r["attendance"]))
+                    for r in batch
+                ),
+                load_student_dimensions(cursor, {r["student_id"] for r in batch})
+            ))
+
+        _, seconds = timed(refresh)
+        conn.rollback()
+        print(f"incremental refresh, 5k-row upload: {seconds * 1000:.1f} ms")
+
+        conn.close()
+        print(f"cube mismatches: {find_cube_mismatches()}")
+
+
+if __name__ == "__main__":
+    main()
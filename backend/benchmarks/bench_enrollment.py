@@ -0,0 +1,127 @@
+"""Admin enrollment: per-student INSERT loop versus the set-based endpoints.
+
+Run from the backend folder:
+
+    python benchmarks/bench_enrollment.py --students 20000
+
+Provisions students through /api/admin/bulk-students on a scratch
+database, then times the old one-INSERT-per-student assignment loop
+against /api/admin/assign-all-to-semester and /api/admin/assign-students,
+including a re-run where every enrollment is skipped.
+"""
+import argparse
+import csv
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def legacy_assign_all(semester_id):
+    """The pre-change assign_all_students_to_semester body."""
+    from database.db import get_connection
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT id FROM students")
+    for student in cursor.fetchall():
+        cursor.execute("""
+            INSERT OR IGNORE INTO student_semester_enrollment
+            (student_id, semester_id)
+            VALUES (?, ?)
+        """, (student["id"], semester_id))
+
+    conn.commit()
+    conn.close()
+
+
+def students_csv(count):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["roll_number", "password", "name", "department", "section", "batch"])
+    for i in range(count):
+        writer.writerow([f"ENR{i:06d}", f"pw{i}", f"Student {i}", "BTECH", "ABC"[i % 3], "2024"])
+    return buffer.getvalue().encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=20000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_enrollment_")
+    os.environ["DATABASE_PATH"] = os.path.join(workdir, "bench.db")
+
+    from app import create_app
+    from database.db import get_connection
+    from services.password_service import hash_passwords
+
+    app = create_app({"BCRYPT_LOG_ROUNDS": 4, "BULK_PASSWORD_LOG_ROUNDS": 4})
+    logging.getLogger("request_log").disabled = True
+    client = app.test_client()
+
+    with app.app_context():
+        conn = get_connection()
+        conn.execute(
+            "INSERT INTO users (roll_number, password_hash, role) VALUES (?, ?, 'admin')",
+            ("bench-admin", hash_passwords(["bench"], rounds=4)[0])
+        )
+        conn.commit()
+        conn.close()
+
+    token = client.post("/api/login", json={"roll_number": "bench-admin", "password": "bench"}).json
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    semester_ids = []
+    for name in ("S1", "S2", "S3", "S4"):
+        client.post("/api/admin/semester", json={"name": name, "academic_year": "2025-2026"}, headers=headers)
+    semester_ids = [s["id"] for s in client.get("/api/admin/semesters", headers=headers).json][-4:]
+
+    def timed_post(path, **kwargs):
+        start = time.perf_counter()
+        response = client.post(path, headers=headers, **kwargs)
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response.json, elapsed
+
+    body = students_csv(args.students)
+    report, elapsed = timed_post(
+        "/api/admin/bulk-students",
+        data={"file": (io.BytesIO(body), "students.csv"), "semester_id": str(semester_ids[0])},
+        content_type="multipart/form-data"
+    )
+    print(f"bulk-students        {elapsed * 1000:9.1f} ms  {report}")
+
+    report, elapsed = timed_post(
+        "/api/admin/bulk-students",
+        data={"file": (io.BytesIO(body), "students.csv"), "semester_id": str(semester_ids[0])},
+        content_type="multipart/form-data"
+    )
+    print(f"bulk-students re-run {elapsed * 1000:9.1f} ms  {report}")
+
+    with app.app_context():
+        start = time.perf_counter()
+        legacy_assign_all(semester_ids[1])
+        print(f"legacy assign-all    {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    for label in ("assign-all", "assign-all re-run"):
+        report, elapsed = timed_post(
+            "/api/admin/assign-all-to-semester", json={"semester_id": semester_ids[2]}
+        )
+        print(f"{label:<20} {elapsed * 1000:9.1f} ms  {report}")
+
+    student_ids = list(range(1, args.students + 1))
+    report, elapsed = timed_post(
+        "/api/admin/assign-students", json={"semester_id": semester_ids[3], "student_ids": student_ids}
+    )
+    print(f"assign-students      {elapsed * 1000:9.1f} ms  {report}")
+
+
+if __name__ == "__main__":
+    main()
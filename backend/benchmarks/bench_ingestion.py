@@ -0,0 +1,170 @@
+"""Rows/second for insert_performance_data versus the old per-row path.
+
+Run from the backend folder:
+
+    python benchmarks/bench_ingestion.py --rows 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def make_rows(n_rows, n_subjects=6, seed=42):
+    rnd = random.Random(seed)
+    n_students = max(1, n_rows // n_subjects)
+
+    return [
+        {
+            "student_id": f"STU{i % n_students:05d}",
+            "subject": f"Subject {i // n_students % n_subjects}",
+            "marks": rnd.randint(0, 100),
+            "attendance": rnd.randint(40, 100),
+        }
+        for i in range(n_rows)
+    ]
+
+
+def legacy_get_or_create_student(cursor, roll_number):
+    """The pre-bulk student lookup: inline bcrypt for every new student."""
+    from flask_bcrypt import Bcrypt
+    from flask import current_app
+
+    # 🔹 Check if user exists
+    cursor.execute(
+        "SELECT id FROM users WHERE roll_number = ?",
+        (roll_number,)
+    )
+    user = cursor.fetchone()
+
+    if not user:
+        # 🔥 Hash password = roll_number
+        bcrypt = Bcrypt(current_app)
+        hashed_password = bcrypt.generate_password_hash(
+            roll_number
+        ).decode("utf-8")
+
+        cursor.execute(
+            "INSERT INTO users (roll_number, password_hash, role) VALUES (?, ?, 'student')",
+            (roll_number, hashed_password)
+        )
+
+        user_id = cursor.lastrowid
+    else:
+        user_id = user["id"]
+
+    # 🔹 Check if student record exists
+    cursor.execute(
+        "SELECT id FROM students WHERE user_id = ?",
+        (user_id,)
+    )
+    student = cursor.fetchone()
+
+    if not student:
+        cursor.execute(
+            """
+            INSERT INTO students
+            (user_id, name, department, section, batch) 
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (user_id, roll_number, "BTECH", "A", "2024")
+        )
+        student_id = cursor.lastrowid
+    else:
+        student_id = student["id"]
+
+    return student_id
+
+
+def legacy_insert(rows, semester, teacher_id):
+    """The pre-bulk ingestion loop: one lookup chain per CSV row."""
+    from database.db import get_connection
+    from models.performance import (
+        get_or_create_subject,
+        get_or_create_subject_allocation,
+    )
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    for row in rows:
+        subject_id = get_or_create_subject(cursor, row["subject"])
+        student_id = legacy_get_or_create_student(cursor, row["student_id"])
+        allocation_id = get_or_create_subject_allocation(
+            cursor, subject_id, teacher_id, semester
+        )
+
+        cursor.execute("""
+            SELECT id FROM performance
+            WHERE student_id = ? AND subject = ? AND semester = ? AND teacher_id = ?
+        """, (student_id, row["subject"], semester, teacher_id))
+        existing = cursor.fetchone()
+
+        if existing:
+            cursor.execute("""
+                UPDATE performance
+                SET marks = ?, attendance = ?, recorded_at = ?
+                WHERE id = ?
+            """, (row["marks"], row["attendance"], datetime.now().isoformat(), existing["id"]))
+        else:
+            cursor.execute("""
+                INSERT INTO performance
+                (student_id, teacher_id, subject, semester, marks, attendance, recorded_at, allocation_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (student_id, teacher_id, row["subject"], semester,
+                  row["marks"], row["attendance"], datetime.now().isoformat(), allocation_id))
+
+    conn.commit()
+    conn.close()
+
+
+def run(label, insert, rows):
+    """Time a first upload (new students), a new semester for the same
+    students (pure inserts) and a re-upload (pure updates)."""
+    results = {}
+    for phase, semester in (("first upload", "1"), ("new semester", "2"), ("re-upload", "2")):
+        start = time.perf_counter()
+        insert(rows, semester, 1)
+        elapsed = time.perf_counter() - start
+        results[phase] = len(rows) / elapsed
+        print(f"{label:<8} {phase:<13} {len(rows):>7} rows  {elapsed:8.2f}s  {results[phase]:10.0f} rows/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+
+    for label, use_bulk in (("legacy", False), ("bulk", True)):
+        if label == "legacy" and args.skip_legacy:
+            continue
+
+        # Each run gets its own scratch database
+        os.chdir(tempfile.mkdtemp(prefix=f"bench_{label}_"))
+        for name in list(sys.modules):
+            if name == "app" or name.split(".")[0] in ("database", "models", "routes", "services"):
+                del sys.modules[name]
+
+        from wsgi import app
+        from models.performance import insert_performance_data
+
+        # Hashing cost is benchmarked separately, keep it cheap here
+        app.config["BCRYPT_LOG_ROUNDS"] = 4
+        app.config["BULK_PASSWORD_LOG_ROUNDS"] = 4
+
+        with app.app_context():
+            run(label, insert_performance_data if use_bulk else legacy_insert, rows)
+
+
+if __name__ == "__main__":
+    main()
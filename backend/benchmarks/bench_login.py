@@ -0,0 +1,93 @@
+"""Login throughput: inline bcrypt versus the verify pool, plus load shedding.
+
+Run from the backend folder:
+
+    python benchmarks/bench_login.py --users 50 --concurrency 16 --rounds 10
+
+Fires concurrent /api/login requests from a thread pool against a scratch
+database and reports logins/second (and per core) for each mode, then
+floods a deliberately small queue to show 503 + Retry-After shedding.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def fire(app, users, concurrency, total):
+    client_local = {}
+
+    def one(i):
+        # Test clients are not thread-safe; one per worker thread
+        client = client_local.setdefault(threading.get_ident(), app.test_client())
+        roll_number = users[i % len(users)]
+        response = client.post("/api/login", json={"roll_number": roll_number, "password": roll_number})
+        return response.status_code, response.headers.get("Retry-After")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one, range(total)))
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_login_")
+    os.environ["DATABASE_PATH"] = os.path.join(workdir, "bench.db")
+
+    from app import create_app
+    from database.db import get_connection
+    from services.password_service import hash_passwords
+
+    app = create_app({"BCRYPT_LOG_ROUNDS": args.rounds})
+    # Importing app already built the default app and its request log
+    logging.getLogger("request_log").disabled = True
+    users = [f"LOGIN{i:05d}" for i in range(args.users)]
+
+    with app.app_context():
+        hashes = hash_passwords(users, rounds=args.rounds)
+        conn = get_connection()
+        conn.executemany(
+            "INSERT INTO users (roll_number, password_hash, role) VALUES (?, ?, 'student')",
+            zip(users, hashes)
+        )
+        conn.commit()
+        conn.close()
+
+    cores = os.cpu_count() or 1
+    print(f"cores: {cores}  rounds: {args.rounds}  concurrency: {args.concurrency}")
+
+    for label, workers in (("inline", 0), ("pool", None)):
+        app.config["LOGIN_VERIFY_WORKERS"] = workers
+        app.config["LOGIN_MAX_PENDING"] = args.concurrency * 2
+        fire(app, users, args.concurrency, cores * 2)  # warm up
+        seconds, results = fire(app, users, args.concurrency, args.logins)
+        statuses = Counter(status for status, _ in results)
+        rate = args.logins / seconds
+        print(f"{label:>7}: {rate:8.1f} logins/s  {rate / cores:8.1f} per core  {dict(statuses)}")
+
+    # 🔹 Shedding: a queue far smaller than the offered load
+    app.config["LOGIN_VERIFY_WORKERS"] = None
+    app.config["LOGIN_MAX_PENDING"] = 2
+    seconds, results = fire(app, users, args.concurrency, args.logins)
+    shed = [retry for status, retry in results if status == 503]
+    print(f"   shed: {len(shed)}/{args.logins} answered 503 "
+          f"(Retry-After {sorted(set(shed))}) in {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
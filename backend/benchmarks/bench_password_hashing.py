@@ -0,0 +1,51 @@
+"""Serial Flask-Bcrypt hashing versus the parallel password service.
+
+Run from the backend folder:
+
+    python benchmarks/bench_password_hashing.py --accounts 500 --rounds 10
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from flask import Flask
+from flask_bcrypt import Bcrypt
+
+from services.password_service import hash_passwords
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config["BCRYPT_LOG_ROUNDS"] = args.rounds
+    passwords = [f"STU{i:05d}" for i in range(args.accounts)]
+
+    with app.app_context():
+        start = time.perf_counter()
+        bcrypt = Bcrypt(app)
+        for password in passwords:
+            bcrypt.generate_password_hash(password)
+        serial = time.perf_counter() - start
+
+        hash_passwords(passwords[:os.cpu_count() * 2])  # warm the pool
+        start = time.perf_counter()
+        hashes = hash_passwords(passwords, rounds=args.rounds)
+        parallel = time.perf_counter() - start
+
+        assert bcrypt.check_password_hash(hashes[-1], passwords[-1])
+
+    print(f"cores:    {os.cpu_count()}")
+    print(f"serial:   {serial:7.2f}s  {args.accounts / serial:8.1f} hashes/s")
+    print(f"parallel: {parallel:7.2f}s  {args.accounts / parallel:8.1f} hashes/s")
+
+
+if __name__ == "__main__":
+    main()
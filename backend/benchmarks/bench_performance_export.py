@@ -0,0 +1,98 @@
+"""Reading performance out: /api/performance modes and bulk export formats.
+
+Run from the backend folder:
+
+    python benchmarks/bench_performance_export.py --students 5000 --semesters 8
+
+Reports time to first byte, total time and peak Python heap for full JSON,
+keyset pages and NDJSON, then rows/s for CSV, Parquet and Arrow export.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from synthetic import SyntheticSchool
+
+
+def measure(client, url, headers):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    response = client.get(url, headers=headers, buffered=False)
+    body = iter(response.response)
+    first = next(body)
+    ttfb = time.perf_counter() - start
+
+    size = len(first) + sum(len(chunk) for chunk in body)
+    total = time.perf_counter() - start
+    response.close()
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ttfb, total, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--semesters", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_export_"))
+
+    from wsgi import app
+    from flask_jwt_extended import create_access_token
+    from models.performance import insert_performance_data
+
+    app.config["BULK_PASSWORD_LOG_ROUNDS"] = 4
+    school = SyntheticSchool(
+        students=args.students, teachers=1, subjects=6, semesters=args.semesters
+    )
+
+    with app.app_context():
+        for teacher, semester in school.uploads():
+            insert_performance_data(school.rows(teacher, semester), str(semester), 1)
+
+        token = create_access_token(identity="1", additional_claims={"role": "teacher"})
+
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+    rows = school.total_rows
+    print(f"{rows} performance rows for one teacher")
+
+    for label, url in (
+        ("full JSON", "/api/performance"),
+        ("one page", f"/api/performance?limit={args.page_size}"),
+        ("NDJSON", "/api/performance?format=ndjson"),
+    ):
+        ttfb, total, peak, size = measure(client, url, headers)
+        print(
+            f"{label:<10} TTFB {ttfb * 1000:8.1f} ms  total {total * 1000:8.1f} ms  "
+            f"peak heap {peak / 2**20:7.1f} MB  body {size / 2**20:6.1f} MB"
+        )
+
+    # Export throughput, without tracemalloc overhead
+    from services.export_service import export_performance, describe_throughput
+
+    with app.app_context():
+        for fmt in ("csv", "parquet", "arrow"):
+            stats = {}
+            try:
+                for _ in export_performance(fmt, 1, stats=stats):
+                    pass
+            except RuntimeError as e:
+                print(f"export {fmt:<8} skipped: {e}")
+                continue
+            print(f"export {fmt:<8} {describe_throughput(stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Risk model inference: one predict_proba per student versus one per cohort.
+
+Run from the backend folder:
+
+    python benchmarks/bench_risk_model.py --students 20000
+
+Trains the risk model on a synthetic school (no database needed), then
+scores the cohort three ways: the hand-tuned per-student risk score the
+endpoints used before, the trained model called once per student, and the
+trained model called once for everyone.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from bench_risk_scoring import legacy_risk_score
+from synthetic import SyntheticSchool
+
+from ml.feature_engineering import features_from_sums
+from ml.risk_engine import risk_levels
+from ml.risk_model import build_training_set, feature_matrix, train_risk_model
+
+
+def semester_sums(school):
+    """agg_student_semester rows for the whole school (teacher 0 owns all)."""
+    sums = {}
+
+    for teacher, semester in school.uploads():
+        for row in school.rows(teacher, semester):
+            key = (0, row["student_id"], semester)
+            n, sm, ssq, sa, fails = sums.get(key, (0, 0, 0, 0, 0))
+            marks = row["marks"]
+            sums[key] = (
+                n + 1, sm + marks, ssq + marks * marks,
+                sa + row["attendance"], fails + (marks < 40)
+            )
+
+    return [
+        {
+            "teacher_user_id": teacher, "student_id": student, "x": x,
+            "n": n, "sum_marks": sm, "sum_sq_marks": ssq,
+            "sum_attendance": sa, "fail_count": fails,
+        }
+        for (teacher, student, x), (n, sm, ssq, sa, fails) in sums.items()
+    ]
+
+
+def current_sums(rows):
+    """student_features rows: every semester summed per student."""
+    totals = {}
+
+    for r in rows:
+        t = totals.setdefault(r["student_id"], dict.fromkeys(
+            ("n", "sum_marks", "sum_sq_marks", "sum_attendance", "fail_count",
+             "sum_x", "sum_xx", "sum_x_marks", "sum_x_attendance", "max_x"), 0
+        ))
+        x = r["x"]
+        for column in ("n", "sum_marks", "sum_sq_marks", "sum_attendance", "fail_count"):
+            t[column] += r[column]
+        t["sum_x"] += x * r["n"]
+        t["sum_xx"] += x * x * r["n"]
+        t["sum_x_marks"] += x * r["sum_marks"]
+        t["sum_x_attendance"] += x * r["sum_attendance"]
+        t["max_x"] = max(t["max_x"], x)
+
+    return list(totals.values())
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--subjects", type=int, default=6)
+    parser.add_argument("--semesters", type=int, default=4)
+    parser.add_argument("--per-student-limit", type=int, default=2000,
+                        help="Students scored one call at a time (extrapolated)")
+    args = parser.parse_args()
+
+    school = SyntheticSchool(
+        students=args.students, teachers=1, subjects=args.subjects, semesters=args.semesters
+    )
+    rows = semester_sums(school)
+
+    (model, metrics), train_seconds = timed(lambda: train_risk_model(*build_training_set(rows)))
+    print(f"trained on {metrics['samples']} samples in {train_seconds:.2f}s, "
+          f"holdout AUC {metrics['holdout_auc']}")
+
+    students = current_sums(rows)
+    sample = students[:args.per_student_limit]
+    scale = len(students) / len(sample)
+
+    def per_student_rules():
+        return [legacy_risk_score({
+            name: values.item() for name, values in features_from_sums(s).items()
+        }) for s in sample]
+
+    def per_student_model():
+        return [
+            model.predict_proba(feature_matrix(features_from_sums(s)))[0, 1]
+            for s in sample
+        ]
+
+    def batch_model():
+        sums = {column: [s[column] for s in students] for column in students[0]}
+        scores = model.predict_proba(feature_matrix(features_from_sums(sums)))[:, 1] * 100
+        return scores, risk_levels(scores)
+
+    _, rules = timed(per_student_rules)
+    per_student, model_loop = timed(per_student_model)
+    (scores, _), batch = timed(batch_model)
+
+    assert np.allclose(np.array(per_student) * 100, scores[:len(sample)])
+
+    print(f"students: {len(students)}")
+    print(f"per-student rules : {rules * scale * 1000:9.1f} ms (extrapolated)")
+    print(f"per-student model : {model_loop * scale * 1000:9.1f} ms (extrapolated)")
+    print(f"batch predict_proba: {batch * 1000:8.1f} ms  "
+          f"{len(students) / batch:,.0f} students/s")
+
+
+if __name__ == "__main__":
+    main()
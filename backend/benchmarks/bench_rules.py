@@ -0,0 +1,146 @@
+"""Recommendation rules: per-student if-chains versus the compiled rule set.
+
+Run from the backend folder:
+
+    python benchmarks/bench_rules.py --students 50000
+
+Generates a cohort of feature arrays (no database needed) and produces the
+interventions and suggestions the way generate_interventions and
+generate_suggestions did before (one if-chain per student) and through the
+compiled ml/rules.json, checking both give identical output. Also times
+compiling the rule file, which is what a hot reload costs.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from ml.rule_engine import apply_rules, load_rules
+from ml.suggestions import generate_suggestions
+from services.rules import DEFAULT_RULES_PATH
+
+
+def legacy_intervention(risk_score, avg_marks, avg_att):
+    """The pre-change generate_interventions loop body."""
+    if risk_score >= 60:
+        priority = "Immediate"
+        recommendation = "Schedule 1-on-1 mentoring and assign remedial tasks."
+    elif risk_score >= 30:
+        priority = "Monitor"
+        recommendation = "Provide additional practice materials and monitor weekly."
+    else:
+        priority = "Low"
+        recommendation = "Encourage consistent performance."
+
+    if avg_att < 60:
+        recommendation += " Focus on improving attendance."
+    if avg_marks < 40:
+        recommendation += " Provide subject-specific doubt clearing sessions."
+
+    return priority, recommendation
+
+
+def legacy_suggestions(features):
+    """The pre-change generate_suggestions body."""
+    suggestions = []
+
+    if features["attendance_rate"] < 75:
+        suggestions.append("Improve attendance to at least 75%")
+    if features["average_marks"] < 50:
+        suggestions.append("Focus on improving low-performing subjects")
+    if features["failed_subjects"] > 0:
+        suggestions.append("Arrange remedial support for failed subjects")
+    if features["performance_trend"] < 0:
+        suggestions.append("Performance declining, schedule mentoring session")
+
+    if not suggestions:
+        suggestions.append("Performance stable. Continue consistent effort.")
+
+    return suggestions
+
+
+def cohort(students, seed=0):
+    rng = np.random.default_rng(seed)
+    marks = np.round(np.clip(rng.normal(62, 18, students), 0, 100), 2)
+    attendance = np.round(np.clip(rng.normal(78, 14, students), 0, 100), 2)
+
+    return {
+        "average_marks": marks,
+        "average_attendance": attendance,
+        "attendance_rate": attendance,
+        "risk_score": rng.choice([25.0, 30.0, 50.0, 55.0, 75.0, 80.0], students),
+        "failed_subjects": rng.poisson(0.6, students),
+        "marks_variance": rng.gamma(2.0, 60.0, students),
+        "performance_trend": rng.normal(0, 4, students),
+        "attendance_trend": rng.normal(0, 3, students),
+    }
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    features = cohort(args.students)
+    rows = [
+        {name: values[i].item() for name, values in features.items()}
+        for i in range(args.students)
+    ]
+
+    rules, compile_seconds = timed(lambda: load_rules(DEFAULT_RULES_PATH), args.repeat)
+
+    def legacy_interventions():
+        return [
+            legacy_intervention(r["risk_score"], r["average_marks"], r["average_attendance"])
+            for r in rows
+        ]
+
+    def compiled_interventions():
+        return apply_rules(
+            [rules["intervention_priority"], rules["intervention_notes"]], features,
+            lambda p, notes: (p["priority"], " ".join([p["text"]] + [n["text"] for n in notes]))
+        )
+
+    def compiled_masks():
+        return [
+            rules[name].evaluate(features)
+            for name in ("intervention_priority", "intervention_notes", "suggestions")
+        ]
+
+    expected, legacy_iv = timed(legacy_interventions, args.repeat)
+    actual, compiled_iv = timed(compiled_interventions, args.repeat)
+    assert expected == actual
+
+    expected, legacy_sg = timed(lambda: [legacy_suggestions(r) for r in rows], args.repeat)
+    actual, compiled_sg = timed(lambda: generate_suggestions(features, rules), args.repeat)
+    assert expected == actual
+
+    _, masks = timed(compiled_masks, args.repeat)
+
+    print(f"students: {args.students}  rules version {rules.version}")
+    print(f"compile rule file       : {compile_seconds * 1000:8.2f} ms")
+    print(f"interventions  if-chain : {legacy_iv * 1000:8.1f} ms")
+    print(f"interventions  compiled : {compiled_iv * 1000:8.1f} ms")
+    print(f"suggestions    if-chain : {legacy_sg * 1000:8.1f} ms")
+    print(f"suggestions    compiled : {compiled_sg * 1000:8.1f} ms")
+    print(f"mask evaluation only    : {masks * 1000:8.1f} ms  (3 rule sets, "
+          f"{args.students / masks:,.0f} students/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Per-student insight latency as a teacher's class grows.
+
+Run from the backend folder:
+
+    python benchmarks/bench_student_insight.py --class-sizes 100,1000,5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "English", "Programming", "Electronics"]
+SEMESTERS = ["1", "2", "3", "4"]
+REPEATS = 20
+
+
+def class_scan_insight(student_id, teacher_id):
+    """The previous access path: load the whole class, then filter."""
+    from models.performance import get_all_performance_data
+
+    df = pd.DataFrame(get_all_performance_data(teacher_id))
+    return df[df["student_id"] == student_id]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--class-sizes", default="100,1000,5000")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_insight_"))
+
+    from wsgi import app
+    from models.performance import insert_performance_data
+    from services.ml_service import get_student_insight
+
+    app.config["BULK_PASSWORD_LOG_ROUNDS"] = 4
+    rnd = random.Random(3)
+    loaded = 0
+
+    with app.app_context():
+        for class_size in (int(size) for size in args.class_sizes.split(",")):
+            for semester in SEMESTERS:
+                rows = [
+                    {
+                        "student_id": f"STU{i:05d}",
+                        "subject": subject,
+                        "marks": rnd.randint(0, 100),
+                        "attendance": rnd.randint(30, 100),
+                    }
+                    for i in range(loaded, class_size)
+                    for subject in SUBJECTS
+                ]
+                insert_performance_data(rows, semester, 1)
+            loaded = class_size
+
+            for label, insight in (
+                ("class scan", class_scan_insight),
+                ("student scoped", get_student_insight),
+            ):
+                start = time.perf_counter()
+                for _ in range(REPEATS):
+                    insight(1, 1)
+                elapsed = (time.perf_counter() - start) / REPEATS
+                print(f"{class_size:>6} students  {label:<15} {elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
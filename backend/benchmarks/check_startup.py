@@ -0,0 +1,79 @@
+"""Cold-start budget check for the app factory.
+
+Run from the backend folder:
+
+    python benchmarks/check_startup.py --budget 0.75
+
+Imports the app in fresh interpreters against an up-to-date scratch
+database and exits non-zero if the median start-up exceeds the budget, or
+if pandas / numpy / sklearn were imported before the first request.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("pandas", "numpy", "sklearn", "scipy", "pyarrow")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "heavy": sorted(m for m in %r if m in sys.modules),
+}))
+""" % (HEAVY_MODULES,)
+
+
+def probe(env):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.75, help="Median seconds allowed")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_PATH=os.path.join(tempfile.mkdtemp(), "startup.db"))
+
+    # First start creates the schema; it is not part of the budget
+    probe(env)
+
+    runs = [probe(env) for _ in range(args.runs)]
+    seconds = [run["seconds"] for run in runs]
+    heavy = sorted({module for run in runs for module in run["heavy"]})
+    median = statistics.median(seconds)
+
+    print(f"app start-up over {args.runs} runs: median {median * 1000:.0f} ms, "
+          f"max {max(seconds) * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms)")
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"median start-up {median:.3f} s exceeds budget {args.budget:.3f} s")
+    if heavy:
+        failures.append(f"heavy modules imported at start-up: {', '.join(heavy)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    if failures:
+        sys.exit(1)
+
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
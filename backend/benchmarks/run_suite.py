@@ -0,0 +1,236 @@
+"""Benchmark suite: ingestion plus every /api/ml and /api/analytics endpoint.
+
+Builds a scratch database from a deterministic synthetic school through the
+real upload endpoint, then times each endpoint via the Flask test client.
+Run from the backend folder:
+
+    python benchmarks/run_suite.py --output bench.json
+    python benchmarks/run_suite.py --compare bench.json
+
+Results are JSON (p50/p95/mean in ms, rows/s) so runs on different commits
+can be compared with --compare.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from synthetic import SyntheticSchool
+
+ENDPOINT_PREFIXES = ("/api/ml/", "/api/analytics/")
+
+# Endpoints that need a query string or a student token to do real work
+ENDPOINT_QUERIES = {
+    "/api/ml/student-insights": lambda school: "student_ids=" + ",".join(
+        str(i) for i in range(1, min(school.students, 10) + 1)
+    ),
+}
+STUDENT_ENDPOINTS = {"/api/ml/student-insight"}
+EXTRA_CASES = [("/api/ml/class-health", "semester=1")]
+
+
+def percentile(values, p):
+    """Nearest-rank percentile, stable for the small samples used here."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarise(samples, rows):
+    p50 = percentile(samples, 50)
+    return {
+        "samples": len(samples),
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "rows_per_second": round(rows / p50) if p50 else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def login(client, roll_number, password):
+    response = client.post("/api/login", json={"roll_number": roll_number, "password": password})
+    return {"Authorization": f"Bearer {response.json['access_token']}"}
+
+
+def discover_endpoints(app):
+    """GET endpoints under the benchmarked prefixes that take no URL arguments."""
+    return sorted(
+        rule.rule for rule in app.url_map.iter_rules()
+        if rule.rule.startswith(ENDPOINT_PREFIXES)
+        and "GET" in rule.methods
+        and not rule.arguments
+    )
+
+
+def run(school, repeats):
+    from wsgi import app
+    from utils.response_cache import response_cache
+
+    app.config["BCRYPT_LOG_ROUNDS"] = 4
+    app.config["BULK_PASSWORD_LOG_ROUNDS"] = 4
+    client = app.test_client()
+
+    teacher_headers = []
+    for teacher in range(school.teachers):
+        roll_number = f"SYNT{teacher:03d}"
+        client.post("/api/register-teacher", json={
+            "roll_number": roll_number,
+            "password": "bench",
+            "secret_key": app.config["TEACHER_SECRET_KEY"]
+        })
+        teacher_headers.append(login(client, roll_number, "bench"))
+
+    # 🔹 Ingestion through the real upload endpoint
+    upload_samples = []
+    rows_uploaded = 0
+
+    for teacher, semester in school.uploads():
+        body = school.csv_bytes(teacher, semester)
+        start = time.perf_counter()
+        response = client.post(
+            "/api/upload/csv",
+            data={"file": (io.BytesIO(body), "upload.csv"), "semester": str(semester)},
+            headers=teacher_headers[teacher],
+            content_type="multipart/form-data"
+        )
+        upload_samples.append(time.perf_counter() - start)
+
+        if response.status_code != 200:
+            raise SystemExit(f"Upload failed: {response.status_code} {response.get_data(as_text=True)}")
+        rows_uploaded += response.json["accepted"]
+
+    ingestion = summarise(upload_samples, rows_uploaded / len(upload_samples))
+    ingestion.update(
+        uploads=len(upload_samples),
+        rows=rows_uploaded,
+        seconds=round(sum(upload_samples), 3),
+        rows_per_second=round(rows_uploaded / sum(upload_samples)),
+    )
+
+    # 🔹 Endpoints, timed as the first teacher (and their first student)
+    student_headers = login(client, school.roll_number(0), school.roll_number(0))
+    teacher_rows = school.students * len(school.teacher_subjects(0)) * school.semesters
+
+    cases = [
+        (path, ENDPOINT_QUERIES.get(path, lambda s: "")(school))
+        for path in discover_endpoints(app)
+    ] + EXTRA_CASES
+
+    endpoints = {}
+
+    for path, query in cases:
+        url = f"{path}?{query}" if query else path
+        headers = student_headers if path in STUDENT_ENDPOINTS else teacher_headers[0]
+        rows = school.subjects * school.semesters if path in STUDENT_ENDPOINTS else teacher_rows
+
+        # Warm-up request, not timed
+        status = client.get(url, headers=headers).status_code
+        samples = []
+
+        for _ in range(repeats):
+            # Time the computation, not the response cache
+            response_cache.clear()
+            start = time.perf_counter()
+            client.get(url, headers=headers)
+            samples.append(time.perf_counter() - start)
+
+        endpoints[url] = dict(summarise(samples, rows), status=status)
+
+    return ingestion, endpoints
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    print(f"\n{'p50 ms':>40} {'baseline':>10} {'current':>10} {'change':>8}")
+
+    rows = [("ingestion", baseline["ingestion"], current["ingestion"])] + [
+        (name, baseline["endpoints"].get(name), stats)
+        for name, stats in current["endpoints"].items()
+    ]
+
+    for name, old, new in rows:
+        if not old:
+            print(f"{name:>40} {'-':>10} {new['p50_ms']:>10.2f}")
+            continue
+        change = (new["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0
+        print(f"{name:>40} {old['p50_ms']:>10.2f} {new['p50_ms']:>10.2f} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--teachers", type=int, default=4)
+    parser.add_argument("--subjects", type=int, default=12)
+    parser.add_argument("--semesters", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Previous JSON report to diff p50s against")
+    args = parser.parse_args()
+
+    school = SyntheticSchool(
+        students=args.students,
+        teachers=args.teachers,
+        subjects=args.subjects,
+        semesters=args.semesters,
+        seed=args.seed
+    )
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+
+    # Scratch database, picked up by the app on import
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+    os.environ["DATABASE_PATH"] = os.path.join(workdir, "bench.db")
+    os.chdir(workdir)
+
+    ingestion, endpoints = run(school, args.repeats)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+            "dataset": school.config(),
+        },
+        "ingestion": ingestion,
+        "endpoints": endpoints,
+    }
+
+    text = json.dumps(report, indent=2)
+
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+
+    print(text)
+
+    if baseline:
+        compare(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Deterministic synthetic school data for benchmarks.
+
+The same arguments always produce the same rows, so timings from different
+commits are comparable. Data goes in through the real upload endpoint.
+"""
+import csv
+import io
+import random
+
+
+class SyntheticSchool:
+    """``students`` taking ``subjects`` split round-robin across ``teachers``.
+
+    Marks are ability + subject difficulty + a per-student semester drift +
+    noise, so at-risk students, trends and subject difficulty all have
+    something real to find.
+    """
+
+    def __init__(self, students=500, teachers=4, subjects=12, semesters=4, seed=42):
+        self.students = students
+        self.teachers = teachers
+        self.subjects = subjects
+        self.semesters = semesters
+        self.seed = seed
+
+        rnd = random.Random(seed)
+        self.ability = [rnd.gauss(60, 15) for _ in range(students)]
+        self.drift = [rnd.gauss(0, 3) for _ in range(students)]
+        self.difficulty = [rnd.gauss(0, 8) for _ in range(subjects)]
+
+    @property
+    def total_rows(self):
+        return self.students * self.subjects * self.semesters
+
+    def roll_number(self, student):
+        return f"SYN{student:06d}"
+
+    def subject_name(self, subject):
+        return f"Subject {subject:03d}"
+
+    def teacher_subjects(self, teacher):
+        return [s for s in range(self.subjects) if s % self.teachers == teacher]
+
+    def rows(self, teacher, semester):
+        """CSV rows one teacher uploads for one semester (1-based)."""
+        rnd = random.Random(f"{self.seed}:{teacher}:{semester}")
+        rows = []
+
+        for student in range(self.students):
+            for subject in self.teacher_subjects(teacher):
+                marks = (
+                    self.ability[student]
+                    - self.difficulty[subject]
+                    + self.drift[student] * semester
+                    + rnd.gauss(0, 8)
+                )
+                marks = int(min(100, max(0, round(marks))))
+                attendance = int(min(100, max(30, round(55 + marks * 0.4 + rnd.gauss(0, 8)))))
+
+                rows.append({
+                    "student_id": self.roll_number(student),
+                    "subject": self.subject_name(subject),
+                    "semester": str(semester),
+                    "marks": marks,
+                    "attendance": attendance,
+                })
+
+        return rows
+
+    def csv_bytes(self, teacher, semester):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(
+            buffer, fieldnames=["student_id", "subject", "semester", "marks", "attendance"]
+        )
+        writer.writeheader()
+        writer.writerows(self.rows(teacher, semester))
+        return buffer.getvalue().encode("utf-8")
+
+    def uploads(self):
+        """(teacher, semester) in the order a school would upload them."""
+        for semester in range(1, self.semesters + 1):
+            for teacher in range(self.teachers):
+                yield teacher, semester
+
+    def config(self):
+        return {
+            "students": self.students,
+            "teachers": self.teachers,
+            "subjects": self.subjects,
+            "semesters": self.semesters,
+            "seed": self.seed,
+            "rows": self.total_rows,
+        }
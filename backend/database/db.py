@@ -1,7 +1,304 @@
+import os
 import sqlite3
+import threading
+import time
+
+from flask import current_app, g, has_app_context
+
+from utils.metrics import COLLECTORS, request_sql_stats
+
+DEFAULT_DATABASE_PATH = os.environ.get("DATABASE_PATH", "academic.db")
+
+# Applied to every new connection
+PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -20000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+MAX_IDLE_CONNECTIONS = 8
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Adds the time spent in SQLite to the owning request's SQL stats."""
+
+    def _timed(self, method, *args):
+        stats = self.connection.sql_stats
+        if stats is None:
+            return method(*args)
+
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            stats["seconds"] += time.perf_counter() - start
+
+    def execute(self, *args):
+        return self._timed(super().execute, *args)
+
+    def executemany(self, *args):
+        return self._timed(super().executemany, *args)
+
+    def fetchone(self):
+        return self._timed(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed(super().fetchall)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool.
+
+    A connection pinned to a Flask request ignores close() entirely and is
+    released once by the app context teardown, so helpers that open and
+    close "their own" connection all share one per request.
+    """
+
+    pool = None
+    pinned = False
+    # SQL stats of the request this connection is pinned to, if any
+    sql_stats = None
+
+    def cursor(self, factory=TimedCursor):
+        # conn.execute() goes through here too
+        return super().cursor(factory)
+
+    def count_statement(self, statement):
+        # sqlite3 trace callback: once per statement SQLite runs
+        if self.sql_stats is not None:
+            self.sql_stats["queries"] += 1
+
+    def close(self):
+        if self.pinned:
+            return
+        self.pool.release(self)
+
+    def discard(self):
+        super().close()
+
+
+class ConnectionPool:
+    def __init__(self, path, readonly=False, max_idle=MAX_IDLE_CONNECTIONS):
+        self.path = path
+        self.readonly = readonly
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "released": 0,
+            "discarded": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+        }
+
+    def _connect(self):
+        if self.readonly:
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro",
+                uri=True,
+                factory=PooledConnection,
+                check_same_thread=False
+            )
+        else:
+            conn = sqlite3.connect(
+                self.path,
+                factory=PooledConnection,
+                check_same_thread=False
+            )
+            # Persistent per database file, readers no longer block writers
+            conn.execute("PRAGMA journal_mode = WAL")
+
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        if self.readonly:
+            conn.execute("PRAGMA query_only = ON")
+
+        # Counts every statement SQLite runs, attributed to the pinned request
+        conn.set_trace_callback(conn.count_statement)
+
+        conn.pool = self
+        return conn
+
+    def acquire(self):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            self._stats["reused" if conn else "created"] += 1
+            self._stats["in_use"] += 1
+            self._stats["peak_in_use"] = max(
+                self._stats["peak_in_use"], self._stats["in_use"]
+            )
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._stats["in_use"] -= 1
+                raise
+
+        return conn
+
+    def release(self, conn):
+        conn.pinned = False
+        conn.sql_stats = None
+
+        # Whatever the caller did not commit is discarded, as close() did
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            self._stats["in_use"] -= 1
+            self._stats["released"] += 1
+
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+
+            self._stats["discarded"] += 1
+
+        conn.discard()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.discard()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, idle=len(self._idle))
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_database_path():
+    if has_app_context():
+        return current_app.config.get("DATABASE_PATH", DEFAULT_DATABASE_PATH)
+    return DEFAULT_DATABASE_PATH
+
+
+def get_pool(readonly=False):
+    key = (get_database_path(), readonly)
+
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(key[0], readonly=readonly)
+        return _pools[key]
+
+
+_writer_locks = {}
+
+
+def get_writer_lock():
+    """Process-wide lock serialising bulk writers on the current database.
+
+    SQLite allows one writer at a time; taking this before a long write
+    transaction queues uploads in-process instead of tripping busy_timeout.
+    """
+    path = get_database_path()
+
+    with _pools_lock:
+        if path not in _writer_locks:
+            _writer_locks[path] = threading.Lock()
+        return _writer_locks[path]
+
+
+def _get_pooled(readonly):
+    pool = get_pool(readonly)
+
+    # Outside a request every caller gets its own pooled connection
+    if not has_app_context():
+        return pool.acquire()
+
+    attr = "_db_read_conn" if readonly else "_db_conn"
+    conn = g.get(attr)
+
+    if conn is None:
+        conn = pool.acquire()
+        conn.pinned = True
+        conn.sql_stats = request_sql_stats()
+        setattr(g, attr, conn)
+
+    return conn
+
 
 def get_connection():
-    conn = sqlite3.connect("academic.db")
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
\ No newline at end of file
+    return _get_pooled(readonly=False)
+
+
+def get_read_connection():
+    """Read-only connection for analytics queries.
+
+    Falls back to the read-write connection until the database file exists.
+    """
+    if not os.path.exists(get_database_path()):
+        return get_connection()
+    return _get_pooled(readonly=True)
+
+
+def release_connections(exception=None):
+    for attr in ("_db_conn", "_db_read_conn"):
+        conn = g.pop(attr, None)
+        if conn is not None:
+            conn.pool.release(conn)
+
+
+def get_pool_stats():
+    with _pools_lock:
+        pools = list(_pools.values())
+
+    return {
+        f"{pool.path}{' (read-only)' if pool.readonly else ''}": pool.stats()
+        for pool in pools
+    }
+
+
+# Pool stat -> (metric type, help) for /metrics
+POOL_METRICS = {
+    "created": ("counter", "Connections opened by the pool."),
+    "reused": ("counter", "Connections handed out from the idle list."),
+    "released": ("counter", "Connections returned to the pool."),
+    "discarded": ("counter", "Connections closed instead of kept idle."),
+    "in_use": ("gauge", "Connections currently checked out."),
+    "peak_in_use": ("gauge", "Most connections checked out at once."),
+    "idle": ("gauge", "Connections waiting in the idle list."),
+}
+
+
+def render_pool_metrics():
+    """Pool counters for the app's database, labelled by pool, not by path."""
+    path = get_database_path()
+
+    with _pools_lock:
+        pools = [pool for pool in _pools.values() if pool.path == path]
+
+    series = [("read" if pool.readonly else "write", pool.stats()) for pool in pools]
+    lines = []
+
+    for stat, (kind, help_text) in POOL_METRICS.items():
+        name = f"db_pool_{stat}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for label, stats in sorted(series):
+            lines.append(f'{name}{{pool="{label}"}} {stats[stat]}')
+
+    return lines
+
+
+def init_app(app):
+    app.config.setdefault("DATABASE_PATH", DEFAULT_DATABASE_PATH)
+    app.teardown_appcontext(release_connections)
+
+    if render_pool_metrics not in COLLECTORS:
+        COLLECTORS.append(render_pool_metrics)
@@ -0,0 +1,240 @@
+from datetime import datetime
+
+from database.db import get_connection
+
+from models.user import create_user_table
+from models.student import create_student_table
+from models.semester import create_semester_table
+from models.enrollment import create_enrollment_table
+from models.performance import create_performance_table
+from models.performance import migrate_performance_allocation
+from models.subject import create_subject_table
+from models.teacher import create_teacher_table
+from models.subject_allocation import create_subject_allocation_table
+from models.aggregates import create_aggregate_tables, rebuild_aggregates
+from models.cube import create_cube_table, rebuild_cube
+from models.data_version import create_data_version_table
+from models.upload_job import add_upload_job_lease_columns, create_upload_job_table
+from models.student_features import create_student_features_table, rebuild_student_features
+
+
+# Every step must be safe to re-run: two workers booting at once may both
+# apply a pending step before either records it.
+
+def create_base_tables():
+    create_user_table()
+    create_student_table()
+    create_semester_table()
+    create_enrollment_table()
+    create_performance_table()
+
+    # 🔥 INDUSTRY STRUCTURE
+    create_subject_table()
+    create_teacher_table()
+    create_subject_allocation_table()
+
+
+def add_performance_unique_record():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # Older uploads could leave duplicates behind, keep the latest one
+    cursor.execute("""
+        DELETE FROM performance
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM performance
+            GROUP BY student_id, subject, semester, teacher_id
+        )
+    """)
+
+    # 🔹 One record per student/subject/semester/teacher (UPSERT target)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_performance_record
+        ON performance (student_id, subject, semester, teacher_id)
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def add_unique_enrollment():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # Re-run assignments left duplicates behind, keep the first enrollment
+    cursor.execute("""
+        DELETE FROM student_semester_enrollment
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM student_semester_enrollment
+            GROUP BY student_id, semester_id
+        )
+    """)
+
+    # 🔹 One enrollment per student and semester (INSERT OR IGNORE target)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_enrollment_student_semester
+        ON student_semester_enrollment (student_id, semester_id)
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def add_hot_path_indexes():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # Teacher dashboards: teachers.user_id (UNIQUE) -> allocations -> performance
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_subject_allocations_teacher_semester
+        ON subject_allocations (teacher_id, semester_id, subject_id)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_performance_allocation
+        ON performance (allocation_id, student_id, marks, attendance)
+    """)
+
+    # Student views and trend prediction
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_performance_student
+        ON performance (student_id, recorded_at)
+    """)
+
+    # Subject difficulty reads the denormalised teacher/subject columns
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_performance_teacher_subject
+        ON performance (teacher_id, subject, marks)
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_students_user
+        ON students (user_id)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_semesters_name
+        ON semesters (name)
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def add_aggregate_tables():
+    create_aggregate_tables()
+    rebuild_aggregates()
+
+
+def add_student_scope_index():
+    conn = get_connection()
+
+    # Covers student-scoped insight queries: seek by student, join allocation
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_performance_student_scope
+        ON performance (student_id, allocation_id, marks, attendance, recorded_at)
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def add_performance_keyset_indexes():
+    conn = get_connection()
+
+    # /api/performance pages: seek teacher (and semester), walk rowid order
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_performance_teacher_keyset
+        ON performance (teacher_id)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_performance_teacher_semester_keyset
+        ON performance (teacher_id, semester)
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def add_student_feature_store():
+    create_student_features_table()
+    rebuild_student_features()
+
+
+def add_institution_cube():
+    create_cube_table()
+    rebuild_cube()
+
+
+def drop_student_scope_index():
+    conn = get_connection()
+
+    # Student-scoped insights read student_features now; the remaining
+    # student_id seeks are served by ix_performance_student
+    conn.execute("DROP INDEX IF EXISTS ix_performance_student_scope")
+
+    conn.commit()
+    conn.close()
+
+
+# (version, name, step) - append only, never renumber
+MIGRATIONS = [
+    (1, "create base tables", create_base_tables),
+    (2, "unique performance record", add_performance_unique_record),
+    (3, "backfill performance allocation ids", migrate_performance_allocation),
+    (4, "hot path indexes", add_hot_path_indexes),
+    (5, "aggregate tables", add_aggregate_tables),
+    (6, "student scope index", add_student_scope_index),
+    (7, "teacher data versions", create_data_version_table),
+    (8, "background upload jobs", create_upload_job_table),
+    (9, "performance keyset indexes", add_performance_keyset_indexes),
+    (10, "student feature store", add_student_feature_store),
+    (11, "unique semester enrollment", add_unique_enrollment),
+    (12, "institution rollup cube", add_institution_cube),
+    (13, "upload job leases", add_upload_job_lease_columns),
+    (14, "drop student scope index", drop_student_scope_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("SELECT MAX(version) as version FROM schema_migrations")
+    version = cursor.fetchone()["version"] or 0
+
+    conn.commit()
+    conn.close()
+
+    return version
+
+
+def run_migrations():
+    """Apply pending migrations in order, returns the versions applied."""
+    current = get_schema_version()
+    applied = []
+
+    for version, name, step in MIGRATIONS:
+        if version <= current:
+            continue
+
+        step()
+
+        conn = get_connection()
+        conn.execute("""
+            INSERT OR IGNORE INTO schema_migrations (version, name, applied_at)
+            VALUES (?, ?, ?)
+        """, (version, name, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+
+        applied.append(version)
+
+    return applied
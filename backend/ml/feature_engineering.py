@@ -1,40 +1,43 @@
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
 
-def build_student_features(student_df):
-    features = {}
+def features_from_sums(sums):
+    """Insight features from stored running sums, O(1) per student.
 
-    # Average Marks
-    features["average_marks"] = float(student_df["marks"].mean())
+    ``sums`` maps each models.student_features column to a scalar or an
+    array (one entry per student). Trends are OLS slopes per semester.
+    Returns a dict of arrays shaped like the input; ml.forecasting turns
+    the same sums into forecasts.
+    """
+    def column(name):
+        return np.asarray(sums[name], dtype=float)
 
-    # Attendance Rate
-    features["attendance_rate"] = float(student_df["attendance"].mean())
+    n = column("n")
+    sum_marks = column("sum_marks")
+    sum_x = column("sum_x")
 
-    # Failed Subjects Count
-    features["failed_subjects"] = int((student_df["marks"] < 40).sum())
+    average_marks = sum_marks / n
 
-    # Marks Variance (performance stability)
-    features["marks_variance"] = float(student_df["marks"].var() or 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Exact integer sums, so the textbook formula loses nothing here
+        variance = np.where(
+            n > 1, (n * column("sum_sq_marks") - sum_marks ** 2) / (n * (n - 1)), 0.0
+        )
 
-    # ---- Performance Trend ----
-    if len(student_df) > 1:
-        X = np.arange(len(student_df)).reshape(-1, 1)
-        y_marks = student_df["marks"].values
+        sxx = n * column("sum_xx") - sum_x ** 2
+        has_trend = sxx > 0
 
-        model_marks = LinearRegression().fit(X, y_marks)
-        features["performance_trend"] = float(model_marks.coef_[0])
-    else:
-        features["performance_trend"] = 0.0
+        def slope(sum_xy, sum_y):
+            return np.where(has_trend, (n * sum_xy - sum_x * sum_y) / sxx, 0.0)
 
-    # ---- Attendance Trend ----
-    if len(student_df) > 1:
-        X = np.arange(len(student_df)).reshape(-1, 1)
-        y_att = student_df["attendance"].values
+        performance_trend = slope(column("sum_x_marks"), sum_marks)
+        attendance_trend = slope(column("sum_x_attendance"), column("sum_attendance"))
 
-        model_att = LinearRegression().fit(X, y_att)
-        features["attendance_trend"] = float(model_att.coef_[0])
-    else:
-        features["attendance_trend"] = 0.0
-
-    return features
\ No newline at end of file
+    return {
+        "average_marks": average_marks,
+        "attendance_rate": column("sum_attendance") / n,
+        "failed_subjects": np.asarray(sums["fail_count"], dtype=int),
+        "marks_variance": variance,
+        "performance_trend": performance_trend,
+        "attendance_trend": attendance_trend,
+    }
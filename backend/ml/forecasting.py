@@ -1,17 +1,107 @@
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
+# One engine for every marks forecast: the closed-form OLS line per student,
+# computed for a whole cohort at once from the running sums kept in
+# models.student_features (x = semester ordinal), or simple exponential
+# smoothing over per-semester means. Both return a point forecast and a
+# prediction interval for each requested horizon (semesters ahead).
 
-def forecast_next_marks(student_df):
-    if len(student_df) < 2:
-        return float(student_df["marks"].mean())
+FORECAST_METHODS = ("ols", "ses")
+DEFAULT_SMOOTHING = 0.5
 
-    X = np.arange(len(student_df)).reshape(-1, 1)
-    y = student_df["marks"].values
 
-    model = LinearRegression().fit(X, y)
+def _quantile(level, dof):
+    """Two-sided critical value: Student's t where dof is known, else normal."""
+    from scipy.stats import norm, t
 
-    next_semester = np.array([[len(student_df)]])
-    prediction = model.predict(next_semester)
+    tail = (1 + level) / 2
 
-    return float(prediction[0])
\ No newline at end of file
+    with np.errstate(invalid="ignore"):
+        return np.where(dof > 0, t.ppf(tail, np.maximum(dof, 1)), norm.ppf(tail))
+
+
+def ols_forecast(sums, horizons=(1,), level=0.95):
+    """Closed-form OLS forecasts from stored sums, one row per student.
+
+    ``sums`` maps the student_features columns to arrays. Returns
+    (predicted, lower, upper), each shaped (students, len(horizons)) and
+    evaluated at max_x + h. Students with a single semester get their mean
+    and, with fewer than three rows, no interval (NaN bounds).
+    """
+    def column(name):
+        return np.asarray(sums[name], dtype=float).reshape(-1, 1)
+
+    n = column("n")
+    sum_x = column("sum_x")
+    sum_y = column("sum_marks")
+
+    mean_x = sum_x / n
+    mean_y = sum_y / n
+
+    # Centred sums of squares and products
+    sxx = column("sum_xx") - sum_x * mean_x
+    syy = column("sum_sq_marks") - sum_y * mean_y
+    sxy = column("sum_x_marks") - sum_x * mean_y
+
+    has_trend = sxx > 1e-9
+    target = column("max_x") + np.asarray(horizons, dtype=float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(has_trend, sxy / sxx, 0.0)
+        predicted = mean_y + slope * (target - mean_x)
+
+        # Residual variance: n - 2 dof for a line, n - 1 for a flat mean
+        dof = n - np.where(has_trend, 2, 1)
+        sse = np.where(has_trend, syy - slope * sxy, syy)
+        sigma = np.sqrt(np.maximum(sse, 0) / dof)
+
+        leverage = 1 + 1 / n + np.where(has_trend, (target - mean_x) ** 2 / sxx, 0.0)
+        half_width = _quantile(level, dof) * sigma * np.sqrt(leverage)
+
+    half_width = np.where(dof > 0, half_width, np.nan)
+
+    return predicted, predicted - half_width, predicted + half_width
+
+
+def ses_forecast(history, horizons=(1,), level=0.95, alpha=DEFAULT_SMOOTHING):
+    """Simple exponential smoothing over a (students, semesters) matrix.
+
+    ``history`` holds each student's mean marks per semester in semester
+    order, NaN where a student has no marks. The loop runs over semesters
+    only; every student is updated at once. The forecast is flat across
+    horizons and the interval widens as sigma * sqrt(1 + (h - 1) * alpha²).
+    """
+    history = np.asarray(history, dtype=float)
+    students = history.shape[0]
+
+    smoothed = np.full(students, np.nan)
+    squared_errors = np.zeros(students)
+    errors = np.zeros(students)
+
+    for y in history.T:
+        seen = ~np.isnan(y)
+        started = seen & ~np.isnan(smoothed)
+
+        # One-step-ahead errors feed sigma
+        error = np.where(started, y - smoothed, 0.0)
+        squared_errors += error ** 2
+        errors += started
+
+        smoothed = np.where(
+            started, smoothed + alpha * error, np.where(seen, y, smoothed)
+        )
+
+    horizons = np.asarray(horizons, dtype=float)
+    predicted = np.repeat(smoothed.reshape(-1, 1), len(horizons), axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sigma = np.sqrt(squared_errors / errors).reshape(-1, 1)
+        half_width = (
+            _quantile(level, errors.reshape(-1, 1))
+            * sigma
+            * np.sqrt(1 + (horizons - 1) * alpha ** 2)
+        )
+
+    half_width = np.where(errors.reshape(-1, 1) > 0, half_width, np.nan)
+
+    return predicted, predicted - half_width, predicted + half_width
@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+
+# A directory of versioned artifacts:
+#
+#   <name>-v<N>.joblib    the fitted estimator
+#   registry.json         {"active": {name: N}, "models": [metadata, ...]}
+#
+# Artifacts are never overwritten; activating a version only rewrites
+# registry.json, atomically, so a worker loading concurrently always sees
+# a complete file.
+
+REGISTRY_FILE = "registry.json"
+
+
+def _read_registry(directory):
+    try:
+        with open(os.path.join(directory, REGISTRY_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"active": {}, "models": []}
+
+
+def _write_registry(directory, registry):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, REGISTRY_FILE))
+
+
+def list_models(directory, name=None):
+    registry = _read_registry(directory)
+    active = registry["active"]
+
+    return [
+        dict(entry, active=active.get(entry["name"]) == entry["version"])
+        for entry in registry["models"]
+        if name is None or entry["name"] == name
+    ]
+
+
+def save_model(directory, name, model, metadata, activate=True):
+    """Store a new version of ``name``; returns its metadata entry."""
+    import joblib
+
+    os.makedirs(directory, exist_ok=True)
+    registry = _read_registry(directory)
+
+    version = 1 + max(
+        (entry["version"] for entry in registry["models"] if entry["name"] == name),
+        default=0
+    )
+    artifact = f"{name}-v{version}.joblib"
+    joblib.dump(model, os.path.join(directory, artifact))
+
+    entry = dict(
+        metadata,
+        name=name,
+        version=version,
+        artifact=artifact,
+        created_at=datetime.now().isoformat(timespec="seconds")
+    )
+    registry["models"].append(entry)
+
+    if activate:
+        registry["active"][name] = version
+
+    _write_registry(directory, registry)
+
+    return entry
+
+
+def activate_model(directory, name, version):
+    registry = _read_registry(directory)
+
+    if not any(
+        entry["name"] == name and entry["version"] == version
+        for entry in registry["models"]
+    ):
+        raise ValueError(f"No {name} model version {version}")
+
+    registry["active"][name] = version
+    _write_registry(directory, registry)
+
+
+def load_active_model(directory, name):
+    """(model, metadata) for the active version of ``name``, or (None, None)."""
+    import joblib
+
+    registry = _read_registry(directory)
+    version = registry["active"].get(name)
+
+    for entry in registry["models"]:
+        if entry["name"] == name and entry["version"] == version:
+            return joblib.load(os.path.join(directory, entry["artifact"])), entry
+
+    return None, None
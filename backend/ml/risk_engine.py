@@ -1,28 +1,25 @@
-def calculate_risk_score(features):
-    score = 0
+import numpy as np
 
-    # Marks impact (40% weight)
-    score += (100 - features["average_marks"]) * 0.4
 
-    # Attendance impact (30% weight)
-    score += (100 - features["attendance_rate"]) * 0.3
+def calculate_risk_scores(features):
+    """Hand-tuned risk score over a whole cohort.
 
-    # Failed subjects impact
-    score += features["failed_subjects"] * 5
+    The fallback when no trained model is active. ``features`` maps each
+    feature name to an array (from features_from_sums). Returns (scores,
+    levels) arrays.
+    """
+    trend = np.asarray(features["performance_trend"], dtype=float)
 
-    # Negative performance trend impact
-    if features["performance_trend"] < 0:
-        score += abs(features["performance_trend"]) * 2
+    score = (100 - np.asarray(features["average_marks"], dtype=float)) * 0.4
+    score = score + (100 - np.asarray(features["attendance_rate"], dtype=float)) * 0.3
+    score = score + np.asarray(features["failed_subjects"]) * 5
+    score = score + np.where(trend < 0, np.abs(trend) * 2, 0.0)
 
-    # Cap score at 100
-    score = min(score, 100)
+    score = np.minimum(score, 100)
 
-    # Risk level classification
-    if score >= 70:
-        level = "High"
-    elif score >= 40:
-        level = "Medium"
-    else:
-        level = "Low"
+    return score, risk_levels(score)
 
-    return score, level
\ No newline at end of file
+def risk_levels(scores):
+    """High / Medium / Low bands shared by every 0-100 risk score."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select([scores >= 70, scores >= 40], ["High", "Medium"], "Low")
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from ml.feature_engineering import features_from_sums
+
+# A classifier for "fails at least one subject next semester", trained on
+# the same features the insight endpoints compute from the feature store,
+# so a student's stored sums can be scored directly.
+
+FEATURE_NAMES = (
+    "average_marks",
+    "attendance_rate",
+    "failed_subjects",
+    "marks_variance",
+    "performance_trend",
+    "attendance_trend",
+)
+
+SEMESTER_SUM_COLUMNS = ["n", "sum_marks", "sum_sq_marks", "sum_attendance", "fail_count"]
+
+
+def feature_matrix(features):
+    """(students, features) float matrix in FEATURE_NAMES order."""
+    return np.column_stack([
+        np.asarray(features[name], dtype=float).reshape(-1) for name in FEATURE_NAMES
+    ])
+
+
+def build_training_set(semester_sums):
+    """Features as of each semester, labelled with the following semester.
+
+    ``semester_sums`` has one row per (teacher_user_id, student_id, x) with
+    the agg_student_semester sums. Cumulative sums up to semester x are
+    exactly what student_features held at that point, so training and
+    serving see the same features. Returns (X, y).
+    """
+    df = pd.DataFrame(semester_sums).sort_values(["teacher_user_id", "student_id", "x"])
+
+    x = df["x"].astype(float)
+    df["sum_x"] = x * df["n"]
+    df["sum_xx"] = x * x * df["n"]
+    df["sum_x_marks"] = x * df["sum_marks"]
+    df["sum_x_attendance"] = x * df["sum_attendance"]
+
+    groups = df.groupby(["teacher_user_id", "student_id"], sort=False)
+    columns = SEMESTER_SUM_COLUMNS + ["sum_x", "sum_xx", "sum_x_marks", "sum_x_attendance"]
+
+    cumulative = groups[columns].cumsum()
+    cumulative["max_x"] = df["x"]
+
+    # Label: any failed subject in the student's next semester with this teacher
+    next_fail = groups["fail_count"].shift(-1)
+    labelled = next_fail.notna().to_numpy()
+
+    features = features_from_sums({c: cumulative[c].to_numpy() for c in cumulative})
+
+    return feature_matrix(features)[labelled], (next_fail[labelled] > 0).to_numpy(dtype=int)
+
+
+def train_risk_model(X, y, seed=0):
+    """Fit the classifier; returns (model, metrics on a 20% holdout)."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import brier_score_loss, roc_auc_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    if len(np.unique(y)) < 2:
+        raise ValueError("Training data needs both failing and passing outcomes")
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=seed, stratify=y
+    )
+
+    def fit(features, labels):
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000)).fit(
+            features, labels
+        )
+
+    probabilities = fit(X_train, y_train).predict_proba(X_test)[:, 1]
+
+    metrics = {
+        "samples": int(len(y)),
+        "positive_rate": round(float(y.mean()), 4),
+        "holdout_auc": round(float(roc_auc_score(y_test, probabilities)), 4),
+        "holdout_brier": round(float(brier_score_loss(y_test, probabilities)), 4),
+    }
+
+    # Ship the model fitted on everything
+    return fit(X, y), metrics
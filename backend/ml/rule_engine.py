@@ -0,0 +1,266 @@
+import hashlib
+import json
+import operator
+
+import numpy as np
+
+# Declarative recommendation rules (ml/rules.json by default). Each rule set
+# is compiled once into comparisons over cohort feature arrays, so a whole
+# class is evaluated in one vectorised pass instead of an if-chain per student.
+#
+#   {"rule_sets": {"<name>": {
+#       "mode": "first" | "all",
+#       "rules": [{"when": {"<feature>": {"<op>": <number>, ...}, ...}, "text": ...}],
+#       "default": {"text": ...}
+#   }}}
+#
+# Clauses of one "when" object must all hold; a list of "when" objects
+# matches when any of them does. "first" picks the first matching rule (an
+# if/elif chain), "all" collects every match in file order. The default is
+# used when nothing matches.
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+MODES = ("first", "all")
+
+# Rule set -> features its conditions may use, and keys every outcome needs
+INTERVENTION_FEATURES = ("risk_score", "average_marks", "average_attendance")
+
+RULE_SETS = {
+    "intervention_priority": (INTERVENTION_FEATURES, ("priority", "text")),
+    "intervention_notes": (INTERVENTION_FEATURES, ("text",)),
+    "suggestions": (
+        ("average_marks", "attendance_rate", "failed_subjects",
+         "marks_variance", "performance_trend", "attendance_trend"),
+        ("text",)
+    ),
+    "student_insight": (("average_marks", "average_attendance"), ("text",)),
+}
+
+# "all" outcomes are packed into one int64 bit code per student
+MAX_RULES_PER_SET = 63
+
+
+class RuleSet:
+    def __init__(self, name, mode, conditions, outcomes, default):
+        self.name = name
+        self.mode = mode
+        self.conditions = conditions
+        self.outcomes = outcomes
+        self.default = default
+
+    def masks(self, features):
+        """(rules, students) boolean matrix: which rule matches whom."""
+        columns = {}
+        comparisons = {}
+
+        def compare(feature, op, value):
+            key = (feature, op, value)
+            if key not in comparisons:
+                if feature not in columns:
+                    columns[feature] = np.asarray(features[feature], dtype=float).reshape(-1)
+                comparisons[key] = OPERATORS[op](columns[feature], value)
+            return comparisons[key]
+
+        rows = []
+        for alternatives in self.conditions:
+            matched = None
+            for clauses in alternatives:
+                mask = np.logical_and.reduce([compare(*clause) for clause in clauses])
+                matched = mask if matched is None else matched | mask
+            rows.append(matched)
+
+        if not rows:
+            return np.zeros((0, _cohort_size(features)), dtype=bool)
+
+        return np.vstack(rows)
+
+    def evaluate(self, features):
+        """One integer per student identifying its outcome.
+
+        "first": index of the first matching rule, len(rules) for none.
+        "all": bit j set when rule j matches.
+        """
+        masks = self.masks(features)
+
+        if self.mode == "first":
+            if not len(masks):
+                return np.zeros(masks.shape[1], dtype=np.int64)
+            return np.where(masks.any(axis=0), masks.argmax(axis=0), len(masks))
+
+        bits = np.left_shift(np.int64(1), np.arange(len(masks), dtype=np.int64))
+        return bits @ masks.astype(np.int64)
+
+    def code_count(self):
+        """Number of distinct values evaluate() can return."""
+        if self.mode == "first":
+            return len(self.outcomes) + 1
+        return 1 << len(self.outcomes)
+
+    def outcome(self, code):
+        code = int(code)
+
+        if self.mode == "first":
+            return self.outcomes[code] if code < len(self.outcomes) else self.default
+
+        matched = [o for j, o in enumerate(self.outcomes) if code >> j & 1]
+        if not matched and self.default is not None:
+            matched = [self.default]
+        return matched
+
+    def apply(self, features, combine=None):
+        """Outcome per student (a rule's outcome, or a list of them for "all")."""
+        return apply_rules([self], features, combine)
+
+
+class RuleBook:
+    def __init__(self, rule_sets, version):
+        self.rule_sets = rule_sets
+        self.version = version
+
+    def __getitem__(self, name):
+        return self.rule_sets[name]
+
+
+def apply_rules(rule_sets, features, combine=None):
+    """combine(outcome of each rule set) for every student.
+
+    ``combine`` runs once per distinct combination of matches and students
+    sharing one share the result object, so after the vectorised pass the
+    per-student cost is a list lookup.
+    """
+    # Pack the per-set codes into one mixed-radix integer per student
+    combined = 0
+    radices = []
+    for rule_set in rule_sets:
+        radix = rule_set.code_count()
+        if radices and np.prod(radices + [radix], dtype=float) > 2 ** 62:
+            raise ValueError("Too many rules to combine")
+        combined = combined * radix + rule_set.evaluate(features)
+        radices.append(radix)
+
+    unique, inverse = np.unique(combined, return_inverse=True)
+
+    def outcomes(code):
+        codes = []
+        for radix in reversed(radices):
+            code, rest = divmod(code, radix)
+            codes.append(rest)
+        return [rule_set.outcome(c) for rule_set, c in zip(rule_sets, reversed(codes))]
+
+    table = [
+        (combine or (lambda outcome: outcome))(*outcomes(int(code)))
+        for code in unique
+    ]
+
+    return [table[i] for i in inverse.reshape(-1).tolist()]
+
+
+def _cohort_size(features):
+    for values in features.values():
+        return np.asarray(values).reshape(-1).shape[0]
+    return 0
+
+
+def _compile_when(name, when, allowed):
+    alternatives = when if isinstance(when, list) else [when]
+
+    if not alternatives:
+        raise ValueError(f"{name}: 'when' must not be empty")
+
+    compiled = []
+    for clauses in alternatives:
+        if not isinstance(clauses, dict) or not clauses:
+            raise ValueError(f"{name}: 'when' needs feature conditions")
+
+        compiled_clauses = []
+        for feature, tests in clauses.items():
+            if feature not in allowed:
+                raise ValueError(f"{name}: unknown feature '{feature}'")
+            if not isinstance(tests, dict) or not tests:
+                raise ValueError(f"{name}: '{feature}' needs an {{operator: value}} object")
+
+            for op, value in tests.items():
+                if op not in OPERATORS:
+                    raise ValueError(f"{name}: unknown operator '{op}'")
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"{name}: '{feature} {op}' needs a number")
+                compiled_clauses.append((feature, op, float(value)))
+
+        compiled.append(tuple(compiled_clauses))
+
+    return tuple(compiled)
+
+
+def _outcome(name, rule, required):
+    outcome = {key: value for key, value in rule.items() if key != "when"}
+    missing = [key for key in required if key not in outcome]
+
+    if missing:
+        raise ValueError(f"{name}: missing {', '.join(missing)}")
+
+    return outcome
+
+
+def compile_rules(document, version=None):
+    """Validate a rule document and compile it; raises ValueError."""
+    rule_sets = document.get("rule_sets") if isinstance(document, dict) else None
+
+    if not isinstance(rule_sets, dict):
+        raise ValueError("Rule file needs a 'rule_sets' object")
+
+    unknown = sorted(set(rule_sets) - set(RULE_SETS))
+    missing = sorted(set(RULE_SETS) - set(rule_sets))
+    if unknown:
+        raise ValueError(f"Unknown rule sets: {', '.join(unknown)}")
+    if missing:
+        raise ValueError(f"Missing rule sets: {', '.join(missing)}")
+
+    compiled = {}
+
+    for name, spec in rule_sets.items():
+        allowed, required = RULE_SETS[name]
+        mode = spec.get("mode", "all")
+        rules = spec.get("rules", [])
+
+        if mode not in MODES:
+            raise ValueError(f"{name}: mode must be one of {', '.join(MODES)}")
+        if not isinstance(rules, list) or len(rules) > MAX_RULES_PER_SET:
+            raise ValueError(f"{name}: 'rules' must be a list of at most {MAX_RULES_PER_SET}")
+
+        conditions = []
+        outcomes = []
+        for i, rule in enumerate(rules):
+            label = f"{name}[{i}]"
+            if not isinstance(rule, dict) or "when" not in rule:
+                raise ValueError(f"{label}: a rule needs 'when'")
+            conditions.append(_compile_when(label, rule["when"], allowed))
+            outcomes.append(_outcome(label, rule, required))
+
+        default = spec.get("default")
+        if default is not None:
+            default = _outcome(f"{name}.default", default, required)
+
+        compiled[name] = RuleSet(name, mode, tuple(conditions), tuple(outcomes), default)
+
+    return RuleBook(compiled, version)
+
+
+def load_rules(path):
+    """Compile a rule file; its content hash is the book's version."""
+    with open(path, "rb") as f:
+        content = f.read()
+
+    try:
+        document = json.loads(content)
+    except ValueError as e:
+        raise ValueError(f"{path}: invalid JSON ({e})")
+
+    return compile_rules(document, version=hashlib.sha1(content).hexdigest()[:12])
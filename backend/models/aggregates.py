@@ -0,0 +1,174 @@
+from database.db import get_connection
+
+PASS_MARK = 40
+
+# Both tables are keyed by the teacher's user id, like every dashboard query.
+# Deltas are applied in the upload transaction, rebuild_aggregates() recomputes
+# them from performance for verification.
+
+
+def create_aggregate_tables():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS agg_teacher_subject (
+            teacher_user_id INTEGER NOT NULL,
+            semester_id INTEGER NOT NULL,
+            subject_id INTEGER NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            sum_marks INTEGER NOT NULL DEFAULT 0,
+            sum_sq_marks INTEGER NOT NULL DEFAULT 0,
+            sum_attendance INTEGER NOT NULL DEFAULT 0,
+            fail_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (teacher_user_id, semester_id, subject_id)
+        ) WITHOUT ROWID
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS agg_student_semester (
+            teacher_user_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL,
+            semester_id INTEGER NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            sum_marks INTEGER NOT NULL DEFAULT 0,
+            sum_sq_marks INTEGER NOT NULL DEFAULT 0,
+            sum_attendance INTEGER NOT NULL DEFAULT 0,
+            fail_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (teacher_user_id, student_id, semester_id)
+        ) WITHOUT ROWID
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def _contribution(marks, attendance):
+    marks = marks or 0
+    return (
+        1,
+        marks,
+        marks * marks,
+        attendance or 0,
+        1 if marks < PASS_MARK else 0
+    )
+
+
+def collect_deltas(changes):
+    """Net aggregate deltas for a batch of performance writes.
+
+    ``changes`` yields (teacher_user_id, semester_id, subject_id, student_id,
+    old, new) where old/new are (marks, attendance) tuples or None.
+    """
+    subject_deltas = {}
+    student_deltas = {}
+
+    for teacher_user_id, semester_id, subject_id, student_id, old, new in changes:
+        delta = [0] * 5
+
+        if new is not None:
+            delta = [d + c for d, c in zip(delta, _contribution(*new))]
+        if old is not None:
+            delta = [d - c for d, c in zip(delta, _contribution(*old))]
+
+        for deltas, key in (
+            (subject_deltas, (teacher_user_id, semester_id, subject_id)),
+            (student_deltas, (teacher_user_id, student_id, semester_id)),
+        ):
+            current = deltas.get(key, [0] * 5)
+            deltas[key] = [c + d for c, d in zip(current, delta)]
+
+    return subject_deltas, student_deltas
+
+
+def apply_aggregate_deltas(cursor, subject_deltas, student_deltas):
+    for (table, key_columns, _), deltas in zip(
+        AGGREGATE_TABLES, (subject_deltas, student_deltas)
+    ):
+        cursor.executemany(f"""
+            INSERT INTO {table} ({key_columns}, {VALUE_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT ({key_columns}) DO UPDATE SET
+                n = n + excluded.n,
+                sum_marks = sum_marks + excluded.sum_marks,
+                sum_sq_marks = sum_sq_marks + excluded.sum_sq_marks,
+                sum_attendance = sum_attendance + excluded.sum_attendance,
+                fail_count = fail_count + excluded.fail_count
+        """, [
+            (*key, *delta)
+            for key, delta in deltas.items()
+            if any(delta)
+        ])
+
+
+# 🔹 FROM-SCRATCH RECOMPUTATION
+
+AGGREGATE_SELECT = """
+    SELECT
+        {keys},
+        COUNT(p.id) as n,
+        SUM(COALESCE(p.marks, 0)) as sum_marks,
+        SUM(COALESCE(p.marks, 0) * COALESCE(p.marks, 0)) as sum_sq_marks,
+        SUM(COALESCE(p.attendance, 0)) as sum_attendance,
+        SUM(CASE WHEN COALESCE(p.marks, 0) < 40 THEN 1 ELSE 0 END) as fail_count
+    FROM performance p
+    JOIN subject_allocations sa ON p.allocation_id = sa.id
+    JOIN teachers t ON sa.teacher_id = t.id
+    GROUP BY 1, 2, 3
+"""
+
+# (table, key columns, key expressions over the performance join)
+AGGREGATE_TABLES = (
+    (
+        "agg_teacher_subject",
+        "teacher_user_id, semester_id, subject_id",
+        "t.user_id as teacher_user_id, sa.semester_id, sa.subject_id",
+    ),
+    (
+        "agg_student_semester",
+        "teacher_user_id, student_id, semester_id",
+        "t.user_id as teacher_user_id, p.student_id, sa.semester_id",
+    ),
+)
+
+VALUE_COLUMNS = "n, sum_marks, sum_sq_marks, sum_attendance, fail_count"
+
+
+def find_aggregate_mismatches():
+    """Groups whose stored aggregates differ from a fresh recomputation."""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    mismatches = {}
+
+    for table, columns, keys in AGGREGATE_TABLES:
+        stored = f"SELECT {columns}, {VALUE_COLUMNS} FROM {table} WHERE n != 0"
+        fresh = AGGREGATE_SELECT.format(keys=keys)
+
+        cursor.execute(f"""
+            SELECT COUNT(*) as c FROM (
+                SELECT {columns} FROM ({stored} EXCEPT SELECT * FROM ({fresh}))
+                UNION
+                SELECT {columns} FROM ({fresh} EXCEPT SELECT * FROM ({stored}))
+            )
+        """)
+        mismatches[table] = cursor.fetchone()["c"]
+
+    conn.close()
+
+    return mismatches
+
+
+def rebuild_aggregates():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    for table, columns, keys in AGGREGATE_TABLES:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {table} ({columns}, {VALUE_COLUMNS})
+            {AGGREGATE_SELECT.format(keys=keys)}
+        """)
+
+    conn.commit()
+    conn.close()
@@ -0,0 +1,133 @@
+from flask import g, has_app_context
+
+from database.db import get_read_connection
+from models.student_features import SEMESTER_ORDINAL_SQL
+
+
+class Aggregate:
+    __slots__ = ("count", "sum_marks", "sum_attendance", "passed")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_marks = 0
+        self.sum_attendance = 0
+        self.passed = 0
+
+    def add(self, row):
+        self.count += row["n"]
+        self.sum_marks += row["sum_marks"]
+        self.sum_attendance += row["sum_attendance"]
+        self.passed += row["passed"]
+
+    @property
+    def failed(self):
+        return self.count - self.passed
+
+    @property
+    def average_marks(self):
+        return self.sum_marks / self.count if self.count else None
+
+    @property
+    def average_attendance(self):
+        return self.sum_attendance / self.count if self.count else None
+
+
+class TeacherSnapshot:
+    """All teacher-level aggregates, rolled up from the aggregate tables."""
+
+    def __init__(self, group_rows, student_rows):
+        self.total = Aggregate()
+        self.students = {}
+        self.subjects = {}
+        self.roll_numbers = {}
+
+        for row in group_rows:
+            self.total.add(row)
+            self.subjects.setdefault(row["subject"], Aggregate()).add(row)
+
+        for row in student_rows:
+            if row["roll_number"] is not None:
+                self.students.setdefault(row["student_id"], Aggregate()).add(row)
+                self.roll_numbers[row["student_id"]] = row["roll_number"]
+
+
+def load_teacher_snapshot(teacher_user_id):
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    # 🔥 O(groups): reads agg_* tables maintained on upload, never performance
+    cursor.execute("""
+        SELECT
+            sub.name as subject,
+            a.n,
+            a.sum_marks,
+            a.sum_attendance,
+            a.n - a.fail_count as passed
+        FROM agg_teacher_subject a
+        JOIN subjects sub ON a.subject_id = sub.id
+        WHERE a.teacher_user_id = ? AND a.n > 0
+    """, (teacher_user_id,))
+    group_rows = cursor.fetchall()
+
+    cursor.execute("""
+        SELECT
+            a.student_id,
+            u.roll_number,
+            a.semester_id,
+            a.n,
+            a.sum_marks,
+            a.sum_attendance,
+            a.n - a.fail_count as passed
+        FROM agg_student_semester a
+        LEFT JOIN students s ON a.student_id = s.id
+        LEFT JOIN users u ON s.user_id = u.id
+        WHERE a.teacher_user_id = ? AND a.n > 0
+    """, (teacher_user_id,))
+    student_rows = cursor.fetchall()
+
+    conn.close()
+
+    return TeacherSnapshot(group_rows, student_rows)
+
+
+def get_teacher_snapshot(teacher_user_id):
+    """Snapshot for the teacher, computed at most once per request."""
+    if not has_app_context():
+        return load_teacher_snapshot(teacher_user_id)
+
+    snapshots = g.setdefault("_teacher_snapshots", {})
+
+    if teacher_user_id not in snapshots:
+        snapshots[teacher_user_id] = load_teacher_snapshot(teacher_user_id)
+
+    return snapshots[teacher_user_id]
+
+
+def invalidate_teacher_snapshot(teacher_user_id):
+    if has_app_context():
+        g.get("_teacher_snapshots", {}).pop(teacher_user_id, None)
+
+
+def get_semester_rollup(teacher_user_id):
+    """Per-semester totals in semester order, one query over agg_student_semester."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT
+            sem.name as semester,
+            SUM(a.n) as n,
+            SUM(a.sum_marks) as sum_marks,
+            SUM(a.sum_attendance) as sum_attendance,
+            SUM(a.n - a.fail_count) as passed
+        FROM agg_student_semester a
+        JOIN semesters sem ON a.semester_id = sem.id
+        WHERE a.teacher_user_id = ? AND a.n > 0
+        GROUP BY sem.id
+        ORDER BY {SEMESTER_ORDINAL_SQL}, sem.id
+    """, (teacher_user_id,))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
@@ -0,0 +1,267 @@
+from database.db import get_connection, get_read_connection
+from models.aggregates import PASS_MARK, VALUE_COLUMNS
+from models.student_features import MAX_IDS_PER_QUERY, SEMESTER_ORDINAL_SQL
+
+# Institution-wide rollup cube for admin analytics: one row per
+# (semester, subject, department, section, batch) with the same additive sums
+# as the teacher aggregates. Academic year and semester name come from the
+# semesters table, so every slice of (academic_year, semester, department,
+# section, batch, subject) is a GROUP BY over a few thousand cube rows,
+# however large performance grows. Deltas are applied in the upload
+# transaction, rebuild_cube() recomputes everything from performance.
+
+CUBE_KEY_COLUMNS = "semester_id, subject_id, department, section, batch"
+
+# Dimension -> SQL over the cube joined to semesters / subjects
+DIMENSIONS = {
+    "academic_year": "sem.academic_year",
+    "semester": "sem.name",
+    "department": "c.department",
+    "section": "c.section",
+    "batch": "c.batch",
+    "subject": "sub.name",
+}
+
+# Drill-down order, coarsest first
+HIERARCHY = ("academic_year", "semester", "department", "batch", "section", "subject")
+
+CUBE_SELECT = f"""
+    SELECT
+        sa.semester_id,
+        sa.subject_id,
+        COALESCE(s.department, '') as department,
+        COALESCE(s.section, '') as section,
+        COALESCE(s.batch, '') as batch,
+        COUNT(p.id) as n,
+        SUM(COALESCE(p.marks, 0)) as sum_marks,
+        SUM(COALESCE(p.marks, 0) * COALESCE(p.marks, 0)) as sum_sq_marks,
+        SUM(COALESCE(p.attendance, 0)) as sum_attendance,
+        SUM(CASE WHEN COALESCE(p.marks, 0) < {PASS_MARK} THEN 1 ELSE 0 END) as fail_count
+    FROM performance p
+    JOIN subject_allocations sa ON p.allocation_id = sa.id
+    JOIN students s ON p.student_id = s.id
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def create_cube_table():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS agg_institution_cube (
+            semester_id INTEGER NOT NULL,
+            subject_id INTEGER NOT NULL,
+            department TEXT NOT NULL,
+            section TEXT NOT NULL,
+            batch TEXT NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            sum_marks INTEGER NOT NULL DEFAULT 0,
+            sum_sq_marks INTEGER NOT NULL DEFAULT 0,
+            sum_attendance INTEGER NOT NULL DEFAULT 0,
+            fail_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (semester_id, subject_id, department, section, batch)
+        ) WITHOUT ROWID
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+# 🔹 INCREMENTAL REFRESH
+
+def load_student_dimensions(cursor, student_ids):
+    """{student_id: (department, section, batch)} for an upload's students."""
+    student_ids = list(student_ids)
+    dimensions = {}
+
+    for i in range(0, len(student_ids), MAX_IDS_PER_QUERY):
+        chunk = student_ids[i:i + MAX_IDS_PER_QUERY]
+        cursor.execute(f"""
+            SELECT
+                id,
+                COALESCE(department, '') as department,
+                COALESCE(section, '') as section,
+                COALESCE(batch, '') as batch
+            FROM students
+            WHERE id IN ({", ".join("?" * len(chunk))})
+        """, chunk)
+        dimensions.update({
+            r["id"]: (r["department"], r["section"], r["batch"])
+            for r in cursor.fetchall()
+        })
+
+    return dimensions
+
+
+def collect_cube_deltas(changes, dimensions):
+    """Net cube deltas for a batch of performance writes.
+
+    ``changes`` yields (semester_id, subject_id, student_id, old, new) where
+    old/new are (marks, attendance) tuples or None; ``dimensions`` comes
+    from load_student_dimensions.
+    """
+    deltas = {}
+
+    for semester_id, subject_id, student_id, old, new in changes:
+        key = (semester_id, subject_id, *dimensions[student_id])
+        delta = deltas.setdefault(key, [0] * 5)
+
+        for values, sign in ((new, 1), (old, -1)):
+            if values is None:
+                continue
+            marks = values[0] or 0
+            for j, c in enumerate((
+                1, marks, marks * marks, values[1] or 0, 1 if marks < PASS_MARK else 0
+            )):
+                delta[j] += sign * c
+
+    return deltas
+
+
+def apply_cube_deltas(cursor, deltas):
+    cursor.executemany(f"""
+        INSERT INTO agg_institution_cube ({CUBE_KEY_COLUMNS}, {VALUE_COLUMNS})
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT ({CUBE_KEY_COLUMNS}) DO UPDATE SET
+            n = n + excluded.n,
+            sum_marks = sum_marks + excluded.sum_marks,
+            sum_sq_marks = sum_sq_marks + excluded.sum_sq_marks,
+            sum_attendance = sum_attendance + excluded.sum_attendance,
+            fail_count = fail_count + excluded.fail_count
+    """, [
+        (*key, *delta)
+        for key, delta in deltas.items()
+        if any(delta)
+    ])
+
+
+# 🔹 FROM-SCRATCH RECOMPUTATION
+
+def find_cube_mismatches():
+    """Cube cells whose stored sums differ from a fresh recomputation."""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    stored = f"SELECT {CUBE_KEY_COLUMNS}, {VALUE_COLUMNS} FROM agg_institution_cube WHERE n != 0"
+
+    cursor.execute(f"""
+        SELECT COUNT(*) as c FROM (
+            SELECT {CUBE_KEY_COLUMNS} FROM ({stored} EXCEPT SELECT * FROM ({CUBE_SELECT}))
+            UNION
+            SELECT {CUBE_KEY_COLUMNS} FROM ({CUBE_SELECT} EXCEPT SELECT * FROM ({stored}))
+        )
+    """)
+    mismatches = cursor.fetchone()["c"]
+
+    conn.close()
+
+    return mismatches
+
+
+def rebuild_cube():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM agg_institution_cube")
+    cursor.execute(f"""
+        INSERT INTO agg_institution_cube ({CUBE_KEY_COLUMNS}, {VALUE_COLUMNS})
+        {CUBE_SELECT}
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+# 🔹 SLICE / DRILL-DOWN
+
+def parse_dimensions(value):
+    """Comma separated dimension names, validated, in the given order."""
+    dimensions = list(dict.fromkeys(d.strip() for d in (value or "").split(",") if d.strip()))
+    unknown = [d for d in dimensions if d not in DIMENSIONS]
+
+    if unknown:
+        raise ValueError(
+            f"Unknown dimensions: {', '.join(unknown)} "
+            f"(expected {', '.join(HIERARCHY)})"
+        )
+
+    return dimensions
+
+
+def _summary(row):
+    n = row["n"] or 0
+    average = row["sum_marks"] / n if n else 0
+    variance = max(row["sum_sq_marks"] / n - average * average, 0) if n else 0
+
+    return {
+        "records": n,
+        "average_marks": round(average, 2),
+        "marks_std": round(variance ** 0.5, 2),
+        "average_attendance": round(row["sum_attendance"] / n, 2) if n else 0,
+        "pass_rate": round((n - row["fail_count"]) / n * 100, 2) if n else 0,
+        "fail_count": row["fail_count"] or 0,
+    }
+
+
+def query_cube(group_by, filters):
+    """Cube totals grouped by ``group_by`` within ``filters``.
+
+    ``filters`` maps dimension names to a list of accepted values. Returns
+    one row per group with the dimension values and summary statistics;
+    with no group_by, a single institution-wide row.
+    """
+    where = ["c.n != 0"]
+    params = []
+
+    for dimension, values in filters.items():
+        where.append(f"{DIMENSIONS[dimension]} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+
+    select = [f"{DIMENSIONS[d]} as {d}" for d in group_by]
+    order = [
+        f"MIN({SEMESTER_ORDINAL_SQL})" if d == "semester" else DIMENSIONS[d]
+        for d in group_by
+    ]
+
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT
+            {"".join(s + ", " for s in select)}
+            SUM(c.n) as n,
+            SUM(c.sum_marks) as sum_marks,
+            SUM(c.sum_sq_marks) as sum_sq_marks,
+            SUM(c.sum_attendance) as sum_attendance,
+            SUM(c.fail_count) as fail_count
+        FROM agg_institution_cube c
+        JOIN semesters sem ON c.semester_id = sem.id
+        JOIN subjects sub ON c.subject_id = sub.id
+        WHERE {" AND ".join(where)}
+        {"GROUP BY " + ", ".join(DIMENSIONS[d] for d in group_by) if group_by else ""}
+        {"ORDER BY " + ", ".join(order) if group_by else ""}
+    """, params)
+    rows = cursor.fetchall()
+
+    conn.close()
+
+    return [
+        {**{d: row[d] for d in group_by}, **_summary(row)}
+        for row in rows
+        if row["n"]
+    ]
+
+
+def drill_down(filters):
+    """Next level of HIERARCHY below the dimensions already fixed by filters."""
+    level = next((d for d in HIERARCHY if d not in filters), None)
+
+    total = query_cube([], filters)
+
+    return {
+        "level": level,
+        "filters": filters,
+        "total": total[0] if total else None,
+        "rows": query_cube([level], filters) if level else [],
+    }
@@ -0,0 +1,40 @@
+from database.db import get_connection, get_read_connection
+
+
+def create_data_version_table():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS teacher_data_versions (
+            teacher_user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def bump_data_version(cursor, teacher_user_id):
+    # Called inside the write transaction, so readers never see new data
+    # under an old version
+    cursor.execute("""
+        INSERT INTO teacher_data_versions (teacher_user_id, version)
+        VALUES (?, 1)
+        ON CONFLICT (teacher_user_id) DO UPDATE SET version = version + 1
+    """, (teacher_user_id,))
+
+
+def get_data_version(teacher_user_id):
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "SELECT version FROM teacher_data_versions WHERE teacher_user_id = ?",
+        (teacher_user_id,)
+    )
+    row = cursor.fetchone()
+    conn.close()
+
+    return row["version"] if row else 0
@@ -17,3 +17,39 @@ def create_enrollment_table():
 
     conn.commit()
     conn.close()
+
+
+def semester_exists(cursor, semester_id):
+    cursor.execute("SELECT 1 FROM semesters WHERE id = ?", (semester_id,))
+    return cursor.fetchone() is not None
+
+
+# Set-based enrollment: each helper is one statement (or one executemany)
+# and returns (inserted, skipped); existing enrollments are skipped by
+# ux_enrollment_student_semester.
+
+def enroll_students(cursor, student_ids, semester_id):
+    """Enroll existing students by id; unknown ids count as skipped."""
+    student_ids = list(dict.fromkeys(student_ids))
+    before = cursor.connection.total_changes
+
+    cursor.executemany("""
+        INSERT OR IGNORE INTO student_semester_enrollment (student_id, semester_id)
+        SELECT id, ? FROM students WHERE id = ?
+    """, [(semester_id, sid) for sid in student_ids])
+
+    inserted = cursor.connection.total_changes - before
+
+    return inserted, len(student_ids) - inserted
+
+
+def enroll_all_students(cursor, semester_id):
+    cursor.execute("SELECT COUNT(*) as c FROM students")
+    total = cursor.fetchone()["c"]
+
+    cursor.execute("""
+        INSERT OR IGNORE INTO student_semester_enrollment (student_id, semester_id)
+        SELECT id, ? FROM students
+    """, (semester_id,))
+
+    return cursor.rowcount, total - cursor.rowcount
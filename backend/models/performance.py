@@ -1,6 +1,19 @@
 from models.teacher import create_teacher_table
 from models.semester import create_semester_table
-from database.db import get_connection
+from database.db import get_connection, get_read_connection
+from models.analytics import (
+    get_semester_rollup,
+    get_teacher_snapshot,
+    invalidate_teacher_snapshot
+)
+from models.aggregates import apply_aggregate_deltas, collect_deltas
+from models.cube import apply_cube_deltas, collect_cube_deltas, load_student_dimensions
+from models.student_features import (
+    apply_feature_deltas,
+    collect_feature_deltas,
+    semester_ordinal
+)
+from models.data_version import bump_data_version
 from datetime import datetime
 
 def create_performance_table():
@@ -35,54 +48,6 @@ def create_performance_table():
     conn.close()
 
 
-def get_or_create_student(cursor, roll_number):
-    from flask_bcrypt import Bcrypt
-    from flask import current_app
-
-    # 🔹 Check if user exists
-    cursor.execute(
-        "SELECT id FROM users WHERE roll_number = ?",
-        (roll_number,)
-    )
-    user = cursor.fetchone()
-
-    if not user:
-        # 🔥 Hash password = roll_number
-        bcrypt = Bcrypt(current_app)
-        hashed_password = bcrypt.generate_password_hash(
-            roll_number
-        ).decode("utf-8")
-
-        cursor.execute(
-            "INSERT INTO users (roll_number, password_hash, role) VALUES (?, ?, 'student')",
-            (roll_number, hashed_password)
-        )
-
-        user_id = cursor.lastrowid
-    else:
-        user_id = user["id"]
-
-    # 🔹 Check if student record exists
-    cursor.execute(
-        "SELECT id FROM students WHERE user_id = ?",
-        (user_id,)
-    )
-    student = cursor.fetchone()
-
-    if not student:
-        cursor.execute(
-            """
-            INSERT INTO students 
-            (user_id, name, department, section, batch) 
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (user_id, roll_number, "BTECH", "A", "2024")
-        )
-        student_id = cursor.lastrowid
-    else:
-        student_id = student["id"]
-
-    return student_id
 def get_or_create_subject(cursor, subject_name):
     cursor.execute(
         "SELECT id FROM subjects WHERE name = ?",
@@ -101,42 +66,45 @@ def get_or_create_subject(cursor, subject_name):
 
     return cursor.lastrowid
 
-def get_or_create_subject_allocation(cursor, subject_id, teacher_user_id, semester_name):
-    # 🔹 Get semester id
+def get_or_create_semester(cursor, semester_name):
     cursor.execute(
         "SELECT id FROM semesters WHERE name = ?",
         (semester_name,)
     )
     semester = cursor.fetchone()
 
+    if semester:
+        return semester["id"]
+
     # 🔥 Auto-create semester if not exists
-    if not semester:
-        cursor.execute("""
-            INSERT INTO semesters (name, academic_year, active_status)
-            VALUES (?, ?, ?)
-        """, (semester_name, "2025-2026", 1))
+    cursor.execute("""
+        INSERT INTO semesters (name, academic_year, active_status)
+        VALUES (?, ?, ?)
+    """, (semester_name, "2025-2026", 1))
 
-        semester_id = cursor.lastrowid
-    else:
-        semester_id = semester["id"]
+    return cursor.lastrowid
 
-    # 🔹 Get teacher id from teachers table
+def get_or_create_teacher(cursor, teacher_user_id):
     cursor.execute(
         "SELECT id FROM teachers WHERE user_id = ?",
         (teacher_user_id,)
     )
     teacher = cursor.fetchone()
 
+    if teacher:
+        return teacher["id"]
+
     # 🔥 Auto-create teacher if not exists (production safe)
-    if not teacher:
-        cursor.execute("""
-            INSERT INTO teachers (user_id, department)
-            VALUES (?, ?)
-        """, (teacher_user_id, "General"))
+    cursor.execute("""
+        INSERT INTO teachers (user_id, department)
+        VALUES (?, ?)
+    """, (teacher_user_id, "General"))
 
-        teacher_id = cursor.lastrowid
-    else:
-        teacher_id = teacher["id"]
+    return cursor.lastrowid
+
+def get_or_create_subject_allocation(cursor, subject_id, teacher_user_id, semester_name):
+    semester_id = get_or_create_semester(cursor, semester_name)
+    teacher_id = get_or_create_teacher(cursor, teacher_user_id)
 
     # 🔹 Check if allocation exists
     cursor.execute("""
@@ -157,157 +125,389 @@ def get_or_create_subject_allocation(cursor, subject_id, teacher_user_id, semest
 
     return cursor.lastrowid
 
+# 🔹 BULK INGESTION HELPERS
+# Each helper resolves a whole upload's worth of keys with a handful of
+# set-based queries instead of one lookup per CSV row.
+
+SQLITE_MAX_PARAMS = 500
+
+
+def _chunked(values, size=SQLITE_MAX_PARAMS):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _placeholders(values):
+    return ",".join("?" * len(values))
+
+
+def resolve_subjects(cursor, subject_names):
+    subject_map = {}
+
+    for chunk in _chunked(subject_names):
+        cursor.execute(
+            f"SELECT id, name FROM subjects WHERE name IN ({_placeholders(chunk)})",
+            chunk
+        )
+        subject_map.update({r["name"]: r["id"] for r in cursor.fetchall()})
+
+    missing = [name for name in subject_names if name not in subject_map]
+
+    if missing:
+        cursor.executemany(
+            "INSERT INTO subjects (name, code, credits) VALUES (?, ?, ?)",
+            [(name, name[:3].upper(), 4) for name in missing]
+        )
+        for chunk in _chunked(missing):
+            cursor.execute(
+                f"SELECT id, name FROM subjects WHERE name IN ({_placeholders(chunk)})",
+                chunk
+            )
+            subject_map.update({r["name"]: r["id"] for r in cursor.fetchall()})
+
+    return subject_map
+
+
+def _fetch_student_accounts(cursor, roll_numbers):
+    accounts = {}
+
+    for chunk in _chunked(roll_numbers):
+        cursor.execute(f"""
+            SELECT u.roll_number, u.id as user_id, s.id as student_id
+            FROM users u
+            LEFT JOIN students s ON s.user_id = u.id
+            WHERE u.roll_number IN ({_placeholders(chunk)})
+        """, chunk)
+
+        for r in cursor.fetchall():
+            # Keep the first student record for a user
+            if r["roll_number"] not in accounts or accounts[r["roll_number"]][1] is None:
+                accounts[r["roll_number"]] = (r["user_id"], r["student_id"])
+
+    return accounts
+
+
+def resolve_students(cursor, roll_numbers):
+    from services.password_service import hash_passwords
+
+    accounts = _fetch_student_accounts(cursor, roll_numbers)
+
+    new_users = [roll for roll in roll_numbers if roll not in accounts]
+
+    if new_users:
+        # 🔥 Hash password = roll_number (whole batch, all cores)
+        hashes = hash_passwords(new_users)
+        cursor.executemany(
+            "INSERT INTO users (roll_number, password_hash, role) VALUES (?, ?, 'student')",
+            list(zip(new_users, hashes))
+        )
+
+    new_students = new_users + [
+        roll for roll, (_, student_id) in accounts.items() if student_id is None
+    ]
+
+    if new_students:
+        accounts = _fetch_student_accounts(cursor, roll_numbers)
+        cursor.executemany(
+            """
+            INSERT INTO students 
+            (user_id, name, department, section, batch) 
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (accounts[roll][0], roll, "BTECH", "A", "2024")
+                for roll in new_students
+            ]
+        )
+        accounts = _fetch_student_accounts(cursor, roll_numbers)
+
+    return {roll: student_id for roll, (_, student_id) in accounts.items()}
+
+
+def resolve_subject_allocations(cursor, subject_ids, teacher_user_id, semester_name):
+    semester_id = get_or_create_semester(cursor, semester_name)
+    teacher_id = get_or_create_teacher(cursor, teacher_user_id)
+
+    def fetch():
+        cursor.execute("""
+            SELECT subject_id, MIN(id) as id FROM subject_allocations
+            WHERE teacher_id = ? AND semester_id = ?
+            GROUP BY subject_id
+        """, (teacher_id, semester_id))
+        return {r["subject_id"]: r["id"] for r in cursor.fetchall()}
+
+    allocation_map = fetch()
+
+    missing = [sid for sid in subject_ids if sid not in allocation_map]
+
+    if missing:
+        cursor.executemany("""
+            INSERT INTO subject_allocations (subject_id, teacher_id, semester_id)
+            VALUES (?, ?, ?)
+        """, [(sid, teacher_id, semester_id) for sid in missing])
+        allocation_map = fetch()
+
+    return semester_id, allocation_map
+
+
 def insert_performance_data(rows, semester, teacher_id):
     conn = get_connection()
     cursor = conn.cursor()
 
-    count = 0
+    rows = [
+        (
+            row["student_id"],
+            row["subject"],
+            int(row["marks"]),
+            int(row["attendance"])
+        )
+        for row in rows
+    ]
 
-    for row in rows:
-        roll = row["student_id"]
-        subject = row["subject"]
-        marks = int(row["marks"])
-        attendance = int(row["attendance"])
+    if not rows:
+        conn.close()
+        return 0
 
-        # 🔹 Ensure subject exists
-        subject_id = get_or_create_subject(cursor, subject)
+    # 🔹 Resolve every distinct key once per upload
+    subject_names = list(dict.fromkeys(r[1] for r in rows))
+    roll_numbers = list(dict.fromkeys(r[0] for r in rows))
+
+    subject_map = resolve_subjects(cursor, subject_names)
+    student_map = resolve_students(cursor, roll_numbers)
+    semester_id, allocation_map = resolve_subject_allocations(
+        cursor,
+        list(subject_map.values()),
+        teacher_id,
+        semester
+    )
 
-        # 🔹 Ensure student exists
-        student_id = get_or_create_student(cursor, roll)
+    # 🔹 Existing records: what counts as new, and the old values to subtract.
+    # Scoped to this batch's students and subjects so chunked uploads stay
+    # linear in the file size.
+    existing = {}
+    student_ids = list(set(student_map[roll] for roll in roll_numbers))
+
+    for subject_chunk in _chunked(subject_names, SQLITE_MAX_PARAMS // 2):
+        for student_chunk in _chunked(student_ids, SQLITE_MAX_PARAMS // 2):
+            cursor.execute(f"""
+                SELECT student_id, subject, marks, attendance FROM performance
+                WHERE student_id IN ({_placeholders(student_chunk)})
+                AND subject IN ({_placeholders(subject_chunk)})
+                AND teacher_id = ? AND semester = ?
+            """, (*student_chunk, *subject_chunk, teacher_id, semester))
+            existing.update({
+                (r["student_id"], r["subject"]): (r["marks"], r["attendance"])
+                for r in cursor.fetchall()
+            })
 
-        # 🔹 Ensure subject allocation exists (NEW UPGRADE)
-        allocation_id = get_or_create_subject_allocation(
-            cursor,
-            subject_id,
+    recorded_at = datetime.now().isoformat()
+    params = []
+    final = {}
+
+    for roll, subject, marks, attendance in rows:
+        student_id = student_map[roll]
+
+        # Later rows for the same record win, as the UPSERT does
+        final[(student_id, subject)] = (marks, attendance)
+
+        params.append((
+            student_id,
             teacher_id,
-            semester
+            subject,
+            semester,
+            marks,
+            attendance,
+            recorded_at,
+            allocation_map[subject_map[subject]]
+        ))
+
+    # 🔥 Single UPSERT keyed on ux_performance_record
+    cursor.executemany("""
+        INSERT INTO performance
+        (student_id, teacher_id, subject, semester, marks, attendance, recorded_at, allocation_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (student_id, subject, semester, teacher_id) DO UPDATE SET
+            marks = excluded.marks,
+            attendance = excluded.attendance,
+            recorded_at = excluded.recorded_at,
+            allocation_id = excluded.allocation_id
+    """, params)
+
+    # 🔥 Keep aggregate tables in step, in the same transaction
+    apply_aggregate_deltas(cursor, *collect_deltas(
+        (
+            teacher_id,
+            semester_id,
+            subject_map[subject],
+            student_id,
+            existing.get((student_id, subject)),
+            values
         )
-
-        # 🔹 Keep old performance logic (safe phase)
-        cursor.execute("""
-            SELECT id FROM performance
-            WHERE student_id = ? AND subject = ? AND semester = ? AND teacher_id = ?
-        """, (student_id, subject, semester, teacher_id))
-
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.execute("""
-                UPDATE performance
-                SET marks = ?, attendance = ?, recorded_at = ?
-                WHERE id = ?
-            """, (
-                marks,
-                attendance,
-                datetime.now().isoformat(),
-                existing["id"]
-            ))
-        else:
-            cursor.execute("""
-                INSERT INTO performance
-                (student_id, teacher_id, subject, semester, marks, attendance, recorded_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                student_id,
-                teacher_id,
-                subject,
-                semester,
-                marks,
-                attendance,
-                datetime.now().isoformat()
-            ))
-            count += 1
+        for (student_id, subject), values in final.items()
+    ))
+
+    # 🔥 ...and the per-student feature store
+    x = semester_ordinal(semester, semester_id)
+    apply_feature_deltas(cursor, collect_feature_deltas(
+        (
+            (teacher_id, student_id, existing.get((student_id, subject)), values)
+            for (student_id, subject), values in final.items()
+        ),
+        x
+    ), x)
+
+    # 🔥 ...and the institution-wide rollup cube
+    apply_cube_deltas(cursor, collect_cube_deltas(
+        (
+            (semester_id, subject_map[subject], student_id, existing.get((student_id, subject)), values)
+            for (student_id, subject), values in final.items()
+        ),
+        load_student_dimensions(cursor, student_ids)
+    ))
+
+    # 🔹 Invalidates this teacher's cached /api/ml responses
+    bump_data_version(cursor, teacher_id)
 
     conn.commit()
     conn.close()
 
-    return count
+    invalidate_teacher_snapshot(teacher_id)
+
+    return sum(1 for key in final if key not in existing)
+
+PERFORMANCE_SELECT = """
+    SELECT 
+        s.id as student_id,
+        u.roll_number,
+        s.name,
+        sub.name as subject,
+        sem.name as semester,
+        p.marks,
+        p.attendance,
+        p.recorded_at
+    FROM performance p
+    JOIN students s ON p.student_id = s.id
+    JOIN users u ON s.user_id = u.id
+    JOIN subject_allocations sa ON p.allocation_id = sa.id
+    JOIN subjects sub ON sa.subject_id = sub.id
+    JOIN semesters sem ON sa.semester_id = sem.id
+    JOIN teachers t ON sa.teacher_id = t.id
+    WHERE t.user_id = ?
+"""
 
 def get_all_performance_data(teacher_user_id):
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT 
-            s.id as student_id,
-            u.roll_number,
-            s.name,
-            sub.name as subject,
-            sem.name as semester,
-            p.marks,
-            p.attendance,
-            p.recorded_at
-        FROM performance p
-        JOIN students s ON p.student_id = s.id
-        JOIN users u ON s.user_id = u.id
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN subjects sub ON sa.subject_id = sub.id
-        JOIN semesters sem ON sa.semester_id = sem.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        WHERE t.user_id = ?
-    """, (teacher_user_id,))
+    cursor.execute(PERFORMANCE_SELECT, (teacher_user_id,))
 
     rows = cursor.fetchall()
     conn.close()
 
     return [dict(row) for row in rows]
 
-def get_average_marks(teacher_user_id):
-    conn = get_connection()
+# 🔹 KEYSET PAGINATION
+# Selectable columns of the performance join, by API field name
+PERFORMANCE_FIELDS = {
+    "student_id": "s.id",
+    "roll_number": "u.roll_number",
+    "name": "s.name",
+    "subject": "sub.name",
+    "semester": "sem.name",
+    "marks": "p.marks",
+    "attendance": "p.attendance",
+    "recorded_at": "p.recorded_at",
+    "teacher_id": "p.teacher_id",
+}
+
+# What get_all_performance_data returns, the default selection
+DEFAULT_PERFORMANCE_FIELDS = [
+    "student_id", "roll_number", "name", "subject",
+    "semester", "marks", "attendance", "recorded_at"
+]
+
+PERFORMANCE_KEYSET_SELECT = """
+    SELECT p.id as _id, {columns}
+    FROM performance p
+    JOIN students s ON p.student_id = s.id
+    JOIN users u ON s.user_id = u.id
+    JOIN subject_allocations sa ON p.allocation_id = sa.id
+    JOIN subjects sub ON sa.subject_id = sub.id
+    JOIN semesters sem ON sa.semester_id = sem.id
+    JOIN teachers t ON sa.teacher_id = t.id
+    WHERE t.user_id = p.teacher_id
+"""
+
+def iter_performance_data(teacher_user_id, fields=None, semester=None,
+                          subject=None, student_id=None, after_id=None,
+                          limit=None, batch_size=1000):
+    """Rows of get_all_performance_data in performance id order, streamed.
+
+    Yields (id, row) pairs straight off the cursor, ``batch_size`` at a
+    time, so memory does not grow with the teacher's history. Pass the last
+    id seen as ``after_id`` to continue where a page stopped. A
+    ``teacher_user_id`` of None covers the whole institution.
+    """
+    fields = fields or DEFAULT_PERFORMANCE_FIELDS
+    columns = ", ".join(f"{PERFORMANCE_FIELDS[f]} as {f}" for f in fields)
+
+    sql = PERFORMANCE_KEYSET_SELECT.format(columns=columns)
+    params = []
+
+    # Filters use the denormalised columns so ix_performance_teacher_* seek
+    for condition, value in (
+        ("p.teacher_id = ?", teacher_user_id),
+        ("p.semester = ?", semester),
+        ("p.subject = ?", subject),
+        ("p.student_id = ?", student_id),
+        ("p.id > ?", after_id),
+    ):
+        if value is not None:
+            sql += f" AND {condition}"
+            params.append(value)
+
+    sql += " ORDER BY p.id"
+
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    conn = get_read_connection()
     cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT AVG(p.marks) as avg_marks
-        FROM performance p
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        WHERE t.user_id = ?
-    """, (teacher_user_id,))
-
-    result = cursor.fetchone()
-    conn.close()
+    try:
+        cursor.execute(sql, params)
 
-    return round(result["avg_marks"] or 0, 2)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                values = dict(row)
+                yield values.pop("_id"), values
+    finally:
+        cursor.close()
+        conn.close()
 
+def get_average_marks(teacher_user_id):
+    total = get_teacher_snapshot(teacher_user_id).total
 
-def get_average_attendance(teacher_user_id):
-    conn = get_connection()
-    cursor = conn.cursor()
+    return round(total.average_marks or 0, 2)
 
-    cursor.execute("""
-        SELECT AVG(p.attendance) as avg_att
-        FROM performance p
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        WHERE t.user_id = ?
-    """, (teacher_user_id,))
-
-    result = cursor.fetchone()
-    conn.close()
 
-    return round(result["avg_att"] or 0, 2)
+def get_average_attendance(teacher_user_id):
+    total = get_teacher_snapshot(teacher_user_id).total
 
+    return round(total.average_attendance or 0, 2)
 
-def get_pass_fail_count(teacher_user_id):
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT 
-            SUM(CASE WHEN p.marks >= 40 THEN 1 ELSE 0 END) as pass,
-            SUM(CASE WHEN p.marks < 40 THEN 1 ELSE 0 END) as fail
-        FROM performance p
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        WHERE t.user_id = ?
-    """, (teacher_user_id,))
-
-    result = cursor.fetchone()
-    conn.close()
+def get_pass_fail_count(teacher_user_id):
+    total = get_teacher_snapshot(teacher_user_id).total
 
     return {
-        "pass": result["pass"] or 0,
-        "fail": result["fail"] or 0
+        "pass": total.passed,
+        "fail": total.failed
     }
 
 
@@ -323,41 +523,23 @@ def calculate_risk(avg_marks, avg_attendance):
 
 
 def get_at_risk_students(teacher_user_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT 
-            s.id as student_id,
-            u.roll_number,
-            AVG(p.marks) as avg_marks,
-            AVG(p.attendance) as avg_attendance,
-            COUNT(p.id) as subject_count
-        FROM performance p
-        JOIN students s ON p.student_id = s.id
-        JOIN users u ON s.user_id = u.id
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        WHERE t.user_id = ?
-        GROUP BY s.id
-    """, (teacher_user_id,))
-
-    rows = cursor.fetchall()
-    conn.close()
+    snapshot = get_teacher_snapshot(teacher_user_id)
 
     results = []
 
-    for r in rows:
-        avg_marks = round(r["avg_marks"] or 0, 2)
-        avg_att = round(r["avg_attendance"] or 0, 2)
+    for student_id in sorted(snapshot.students):
+        student = snapshot.students[student_id]
+
+        avg_marks = round(student.average_marks or 0, 2)
+        avg_att = round(student.average_attendance or 0, 2)
 
         risk_score = calculate_risk(avg_marks, avg_att)
 
         if risk_score > 0:
             results.append({
-                "student_id": r["student_id"],
-                "roll_number": r["roll_number"],
-                "subject_count": r["subject_count"],
+                "student_id": student_id,
+                "roll_number": snapshot.roll_numbers[student_id],
+                "subject_count": student.count,
                 "average_marks": avg_marks,
                 "average_attendance": avg_att,
                 "risk_score": risk_score,
@@ -365,53 +547,14 @@ def get_at_risk_students(teacher_user_id):
             })
 
     return results
-# 🔹 SIMPLE TREND-BASED PREDICTION
-def predict_next_marks(student_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT marks
-        FROM performance
-        WHERE student_id = ?
-        ORDER BY recorded_at
-    """, (student_id,))
-
-    rows = cursor.fetchall()
-    conn.close()
-
-    if not rows:
-        return 0
-
-    if len(rows) == 1:
-        return rows[0]["marks"]
-
-    improvements = []
-    for i in range(1, len(rows)):
-        improvements.append(rows[i]["marks"] - rows[i - 1]["marks"])
-
-    avg_change = sum(improvements) / len(improvements)
-
-    return round(rows[-1]["marks"] + avg_change, 2)
 
 def get_subject_difficulty(teacher_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT subject, AVG(marks) as avg_marks
-        FROM performance
-        WHERE teacher_id = ?
-        GROUP BY subject
-    """, (teacher_id,))
-
-    rows = cursor.fetchall()
-    conn.close()
+    snapshot = get_teacher_snapshot(teacher_id)
 
     results = []
 
-    for r in rows:
-        avg = round(r["avg_marks"], 2)
+    for subject in sorted(snapshot.subjects):
+        avg = round(snapshot.subjects[subject].average_marks, 2)
 
         if avg < 50:
             difficulty = "Hard"
@@ -421,7 +564,7 @@ def get_subject_difficulty(teacher_id):
             difficulty = "Easy"
 
         results.append({
-            "subject": r["subject"],
+            "subject": subject,
             "average_marks": avg,
             "difficulty": difficulty
         })
@@ -466,65 +609,16 @@ def migrate_performance_allocation():
     conn.commit()
     conn.close()
      
-def calculate_class_health(teacher_user_id, semester_name=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    semester_filter = ""
-    params = [teacher_user_id]
-
-    if semester_name:
-        semester_filter = "AND sem.name = ?"
-        params.append(semester_name)
-
-    # Average Marks
-    cursor.execute(f"""
-        SELECT AVG(p.marks) as avg_marks
-        FROM performance p
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        JOIN semesters sem ON sa.semester_id = sem.id
-        WHERE t.user_id = ?
-        {semester_filter}
-    """, tuple(params))
-    avg_marks = cursor.fetchone()["avg_marks"] or 0
-
-    # Average Attendance
-    cursor.execute(f"""
-        SELECT AVG(p.attendance) as avg_att
-        FROM performance p
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        JOIN semesters sem ON sa.semester_id = sem.id
-        WHERE t.user_id = ?
-        {semester_filter}
-    """, tuple(params))
-    avg_att = cursor.fetchone()["avg_att"] or 0
+def _class_health(count, sum_marks, sum_attendance, passed, at_risk):
+    avg_marks = sum_marks / count if count else 0
+    avg_att = sum_attendance / count if count else 0
 
     # Pass Rate
-    cursor.execute(f"""
-        SELECT 
-            SUM(CASE WHEN p.marks >= 40 THEN 1 ELSE 0 END) as pass,
-            COUNT(p.id) as total
-        FROM performance p
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        JOIN semesters sem ON sa.semester_id = sem.id
-        WHERE t.user_id = ?
-        {semester_filter}
-    """, tuple(params))
-    result = cursor.fetchone()
-
-    pass_count = result["pass"] or 0
-    total = result["total"] or 1
-    pass_rate = (pass_count / total) * 100
+    pass_rate = (passed / (count or 1)) * 100
 
     # Risk Distribution
-    at_risk = len(get_at_risk_students(teacher_user_id))
     risk_penalty = max(0, 100 - (at_risk * 5))
 
-    conn.close()
-
     health_score = (
         (avg_marks * 0.4) +
         (avg_att * 0.3) +
@@ -541,6 +635,31 @@ def calculate_class_health(teacher_user_id, semester_name=None):
     else:
         status = "Critical"
 
+    return health_score, status
+
+
+def calculate_class_health(teacher_user_id, semester_name=None):
+    # The risk penalty always counts the teacher's at-risk students, also
+    # for a single semester's score
+    at_risk = len(get_at_risk_students(teacher_user_id))
+
+    if semester_name:
+        # Same numbers as this semester's point on the trend
+        scope = next(
+            (row for row in get_semester_rollup(teacher_user_id) if row["semester"] == semester_name),
+            {"n": 0, "sum_marks": 0, "sum_attendance": 0, "passed": 0}
+        )
+        health_score, status = _class_health(
+            scope["n"], scope["sum_marks"], scope["sum_attendance"],
+            scope["passed"], at_risk
+        )
+    else:
+        snapshot = get_teacher_snapshot(teacher_user_id)
+        total = snapshot.total
+        health_score, status = _class_health(
+            total.count, total.sum_marks, total.sum_attendance, total.passed, at_risk
+        )
+
     return {
         "health_score": health_score,
         "status": status,
@@ -548,61 +667,48 @@ def calculate_class_health(teacher_user_id, semester_name=None):
     }
 
 def get_semester_trend(teacher_user_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT DISTINCT sem.name as semester
-        FROM performance p
-        JOIN subject_allocations sa ON p.allocation_id = sa.id
-        JOIN teachers t ON sa.teacher_id = t.id
-        JOIN semesters sem ON sa.semester_id = sem.id
-        WHERE t.user_id = ?
-        ORDER BY sem.name
-    """, (teacher_user_id,))
-
-    semesters = cursor.fetchall()
-    conn.close()
-
+    # 🔥 One GROUP BY semester query, whatever the number of semesters
     trend_data = []
+    at_risk = len(get_at_risk_students(teacher_user_id))
 
-    for s in semesters:
-        semester_name = s["semester"]
-        result = calculate_class_health(teacher_user_id, semester_name)
+    for row in get_semester_rollup(teacher_user_id):
+        health_score, status = _class_health(
+            row["n"], row["sum_marks"], row["sum_attendance"], row["passed"], at_risk
+        )
         trend_data.append({
-            "semester": semester_name,
-            "health_score": result["health_score"],
-            "status": result["status"]
+            "semester": row["semester"],
+            "health_score": health_score,
+            "status": status
         })
 
     return trend_data
 
 def generate_interventions(teacher_user_id):
+    import numpy as np
+    from ml.rule_engine import apply_rules
+    from services.rules import get_rules
+
     at_risk_students = get_at_risk_students(teacher_user_id)
 
-    interventions = []
+    if not at_risk_students:
+        return []
 
-    for student in at_risk_students:
-        risk_score = student["risk_score"]
-        avg_marks = student["average_marks"]
-        avg_att = student["average_attendance"]
-
-        if risk_score >= 60:
-            priority = "Immediate"
-            recommendation = "Schedule 1-on-1 mentoring and assign remedial tasks."
-        elif risk_score >= 30:
-            priority = "Monitor"
-            recommendation = "Provide additional practice materials and monitor weekly."
-        else:
-            priority = "Low"
-            recommendation = "Encourage consistent performance."
+    # 🔥 Whole class through the compiled rules in one vectorised pass
+    features = {
+        name: np.array([student[name] for student in at_risk_students], dtype=float)
+        for name in ("risk_score", "average_marks", "average_attendance")
+    }
+    rules = get_rules()
+    outcomes = apply_rules(
+        [rules["intervention_priority"], rules["intervention_notes"]], features,
+        lambda priority, notes: (
+            priority["priority"], " ".join([priority["text"]] + [n["text"] for n in notes])
+        )
+    )
 
-        # Extra intelligence layer
-        if avg_att < 60:
-            recommendation += " Focus on improving attendance."
-        if avg_marks < 40:
-            recommendation += " Provide subject-specific doubt clearing sessions."
+    interventions = []
 
+    for student, (priority, recommendation) in zip(at_risk_students, outcomes):
         interventions.append({
             "student_id": student["student_id"],
             "roll_number": student["roll_number"],
@@ -622,9 +728,7 @@ def generate_comparative_insight(teacher_user_id):
             "message": "Not enough semester data for comparison."
         }
 
-    # Sort semesters numerically (if they are numbers)
-    trend_data = sorted(trend_data, key=lambda x: int(x["semester"]))
-
+    # Already in semester order
     previous = trend_data[-2]
     current = trend_data[-1]
 
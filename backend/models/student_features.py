@@ -0,0 +1,289 @@
+from database.db import get_connection, get_read_connection
+
+PASS_MARK = 40
+MAX_IDS_PER_QUERY = 500
+
+# One row per (teacher, student) holding the running sums every insight
+# feature is derived from, so risk scoring, suggestions and forecasts read
+# O(1) per student instead of re-fitting raw rows. x is the semester ordinal:
+# marks are integers, so every sum is exact and the variance / OLS slopes
+# computed from them match a fresh fit without any floating-point drift.
+# Deltas are applied in the upload transaction, rebuild_student_features()
+# recomputes everything from performance for verification.
+
+FEATURE_SUM_COLUMNS = (
+    "n", "sum_marks", "sum_sq_marks", "sum_attendance", "fail_count",
+    "sum_x", "sum_xx", "sum_x_marks", "sum_x_attendance", "max_x"
+)
+SUM_COLUMNS_SQL = ", ".join(FEATURE_SUM_COLUMNS)
+
+# Numeric semester names ("1", "2", "10") order by value, anything else by id
+SEMESTER_ORDINAL_SQL = """
+    CASE WHEN sem.name != '' AND sem.name NOT GLOB '*[^0-9]*'
+         THEN CAST(sem.name AS INTEGER) ELSE sem.id END
+"""
+
+FEATURE_SUMS_SELECT = f"""
+    SELECT
+        teacher_user_id,
+        student_id,
+        COUNT(*) as n,
+        SUM(marks) as sum_marks,
+        SUM(marks * marks) as sum_sq_marks,
+        SUM(attendance) as sum_attendance,
+        SUM(CASE WHEN marks < {PASS_MARK} THEN 1 ELSE 0 END) as fail_count,
+        SUM(x) as sum_x,
+        SUM(x * x) as sum_xx,
+        SUM(x * marks) as sum_x_marks,
+        SUM(x * attendance) as sum_x_attendance,
+        MAX(x) as max_x
+    FROM (
+        SELECT
+            t.user_id as teacher_user_id,
+            p.student_id,
+            COALESCE(p.marks, 0) as marks,
+            COALESCE(p.attendance, 0) as attendance,
+            {SEMESTER_ORDINAL_SQL} as x
+        FROM performance p
+        JOIN subject_allocations sa ON p.allocation_id = sa.id
+        JOIN semesters sem ON sa.semester_id = sem.id
+        JOIN teachers t ON sa.teacher_id = t.id
+    )
+    GROUP BY 1, 2
+"""
+
+
+def create_student_features_table():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS student_features (
+            teacher_user_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            sum_marks INTEGER NOT NULL DEFAULT 0,
+            sum_sq_marks INTEGER NOT NULL DEFAULT 0,
+            sum_attendance INTEGER NOT NULL DEFAULT 0,
+            fail_count INTEGER NOT NULL DEFAULT 0,
+            sum_x INTEGER NOT NULL DEFAULT 0,
+            sum_xx INTEGER NOT NULL DEFAULT 0,
+            sum_x_marks INTEGER NOT NULL DEFAULT 0,
+            sum_x_attendance INTEGER NOT NULL DEFAULT 0,
+            max_x INTEGER,
+            PRIMARY KEY (teacher_user_id, student_id)
+        ) WITHOUT ROWID
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def semester_ordinal(semester_name, semester_id):
+    """Python twin of SEMESTER_ORDINAL_SQL."""
+    if semester_name and semester_name.isascii() and semester_name.isdigit():
+        return int(semester_name)
+    return semester_id
+
+
+def _contribution(x, marks, attendance):
+    marks = marks or 0
+    attendance = attendance or 0
+    return (
+        1,
+        marks,
+        marks * marks,
+        attendance,
+        1 if marks < PASS_MARK else 0,
+        x,
+        x * x,
+        x * marks,
+        x * attendance
+    )
+
+
+def collect_feature_deltas(changes, x):
+    """Net feature-sum deltas for one upload batch (all rows share semester x).
+
+    ``changes`` yields (teacher_user_id, student_id, old, new) where old/new
+    are (marks, attendance) tuples or None.
+    """
+    deltas = {}
+
+    for teacher_user_id, student_id, old, new in changes:
+        delta = deltas.setdefault((teacher_user_id, student_id), [0] * 9)
+
+        if new is not None:
+            for i, c in enumerate(_contribution(x, *new)):
+                delta[i] += c
+        if old is not None:
+            for i, c in enumerate(_contribution(x, *old)):
+                delta[i] -= c
+
+    return deltas
+
+
+def apply_feature_deltas(cursor, deltas, x):
+    # Records are only ever overwritten in place, so max_x can only grow
+    cursor.executemany(f"""
+        INSERT INTO student_features (teacher_user_id, student_id, {SUM_COLUMNS_SQL})
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (teacher_user_id, student_id) DO UPDATE SET
+            n = n + excluded.n,
+            sum_marks = sum_marks + excluded.sum_marks,
+            sum_sq_marks = sum_sq_marks + excluded.sum_sq_marks,
+            sum_attendance = sum_attendance + excluded.sum_attendance,
+            fail_count = fail_count + excluded.fail_count,
+            sum_x = sum_x + excluded.sum_x,
+            sum_xx = sum_xx + excluded.sum_xx,
+            sum_x_marks = sum_x_marks + excluded.sum_x_marks,
+            sum_x_attendance = sum_x_attendance + excluded.sum_x_attendance,
+            max_x = MAX(COALESCE(max_x, excluded.max_x), excluded.max_x)
+    """, [
+        (*key, *delta, x)
+        for key, delta in deltas.items()
+        if any(delta)
+    ])
+
+
+# 🔹 READS
+
+def get_student_feature_sums(teacher_user_id, student_ids):
+    """Stored sums for the given students, keyed by student id."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    student_ids = list(dict.fromkeys(student_ids))
+    sums = {}
+
+    for start in range(0, len(student_ids), MAX_IDS_PER_QUERY):
+        chunk = student_ids[start:start + MAX_IDS_PER_QUERY]
+        cursor.execute(f"""
+            SELECT student_id, {SUM_COLUMNS_SQL}
+            FROM student_features
+            WHERE teacher_user_id = ? AND n > 0
+            AND student_id IN ({",".join("?" * len(chunk))})
+        """, (teacher_user_id, *chunk))
+        sums.update({row["student_id"]: dict(row) for row in cursor.fetchall()})
+
+    conn.close()
+
+    return sums
+
+
+def get_teacher_feature_sums(teacher_user_id):
+    """Stored sums and roll numbers for every student a teacher has marks for."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT u.roll_number, f.student_id, {", ".join("f." + c for c in FEATURE_SUM_COLUMNS)}
+        FROM student_features f
+        JOIN students s ON f.student_id = s.id
+        JOIN users u ON s.user_id = u.id
+        WHERE f.teacher_user_id = ? AND f.n > 0
+        ORDER BY f.student_id
+    """, (teacher_user_id,))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def get_student_total_sums(student_id):
+    """A student's sums across all their teachers (every column adds up)."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT {", ".join(
+            f"MAX({c}) as {c}" if c == "max_x" else f"SUM({c}) as {c}"
+            for c in FEATURE_SUM_COLUMNS
+        )}
+        FROM student_features
+        WHERE student_id = ? AND n > 0
+    """, (student_id,))
+
+    row = cursor.fetchone()
+    conn.close()
+
+    return dict(row) if row["n"] else None
+
+
+def get_teacher_semester_means(teacher_user_id):
+    """(student_id, semester ordinal, mean marks) rows from agg_student_semester."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT a.student_id, {SEMESTER_ORDINAL_SQL} as x,
+               CAST(a.sum_marks AS REAL) / a.n as mean_marks
+        FROM agg_student_semester a
+        JOIN semesters sem ON a.semester_id = sem.id
+        WHERE a.teacher_user_id = ? AND a.n > 0
+    """, (teacher_user_id,))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def get_semester_sums():
+    """Every teacher's agg_student_semester sums with the semester ordinal."""
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT a.teacher_user_id, a.student_id, {SEMESTER_ORDINAL_SQL} as x,
+               a.n, a.sum_marks, a.sum_sq_marks, a.sum_attendance, a.fail_count
+        FROM agg_student_semester a
+        JOIN semesters sem ON a.semester_id = sem.id
+        WHERE a.n > 0
+    """)
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+# 🔹 FROM-SCRATCH RECOMPUTATION
+
+def find_feature_mismatches():
+    """Students whose stored sums differ from a fresh recomputation."""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    columns = f"teacher_user_id, student_id, {SUM_COLUMNS_SQL}"
+    stored = f"SELECT {columns} FROM student_features WHERE n != 0"
+
+    cursor.execute(f"""
+        SELECT COUNT(*) as c FROM (
+            SELECT teacher_user_id, student_id
+            FROM ({stored} EXCEPT SELECT * FROM ({FEATURE_SUMS_SELECT}))
+            UNION
+            SELECT teacher_user_id, student_id
+            FROM ({FEATURE_SUMS_SELECT} EXCEPT SELECT * FROM ({stored}))
+        )
+    """)
+    mismatches = cursor.fetchone()["c"]
+
+    conn.close()
+
+    return mismatches
+
+
+def rebuild_student_features():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM student_features")
+    cursor.execute(f"""
+        INSERT INTO student_features (teacher_user_id, student_id, {SUM_COLUMNS_SQL})
+        {FEATURE_SUMS_SELECT}
+    """)
+
+    conn.commit()
+    conn.close()
@@ -0,0 +1,166 @@
+import json
+from datetime import datetime, timedelta
+
+from database.db import get_connection, get_read_connection
+
+# queued -> running -> completed | failed
+UNFINISHED_STATUSES = ("queued", "running")
+
+# A running job belongs to the worker process named in owner for as long as
+# its lease (renewed after every chunk) has not expired. Only expired jobs
+# are requeued, so a worker never takes over another live worker's job.
+
+
+def create_upload_job_table():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS upload_jobs (
+            id TEXT PRIMARY KEY,
+            teacher_id INTEGER NOT NULL,
+            semester TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            total_bytes INTEGER NOT NULL DEFAULT 0,
+            bytes_processed INTEGER NOT NULL DEFAULT 0,
+            rows_processed INTEGER NOT NULL DEFAULT 0,
+            rows_rejected INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'queued',
+            result TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            FOREIGN KEY (teacher_id) REFERENCES users(id)
+        )
+    """)
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ix_upload_jobs_status
+        ON upload_jobs(status)
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+def add_upload_job_lease_columns():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA table_info(upload_jobs)")
+    columns = {r["name"] for r in cursor.fetchall()}
+
+    if "owner" not in columns:
+        cursor.execute("ALTER TABLE upload_jobs ADD COLUMN owner TEXT")
+    if "lease_expires_at" not in columns:
+        cursor.execute("ALTER TABLE upload_jobs ADD COLUMN lease_expires_at TEXT")
+
+    conn.commit()
+    conn.close()
+
+
+def _lease_expiry(lease_seconds):
+    return (datetime.now() + timedelta(seconds=lease_seconds)).isoformat()
+
+
+def create_upload_job(job_id, teacher_id, semester, file_path, total_bytes):
+    conn = get_connection()
+    conn.execute("""
+        INSERT INTO upload_jobs
+        (id, teacher_id, semester, file_path, total_bytes, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (job_id, teacher_id, semester, file_path, total_bytes,
+          datetime.now().isoformat()))
+    conn.commit()
+    conn.close()
+
+
+def claim_upload_job(job_id, owner, lease_seconds):
+    """Mark a queued job as running under ``owner``; False if someone else has it."""
+    conn = get_connection()
+    cursor = conn.execute("""
+        UPDATE upload_jobs
+        SET status = 'running', started_at = ?, owner = ?, lease_expires_at = ?,
+            bytes_processed = 0, rows_processed = 0, rows_rejected = 0
+        WHERE id = ? AND status = 'queued'
+    """, (datetime.now().isoformat(), owner, _lease_expiry(lease_seconds), job_id))
+    claimed = cursor.rowcount == 1
+    conn.commit()
+    conn.close()
+
+    return claimed
+
+
+def update_upload_job_progress(job_id, owner, lease_seconds,
+                               bytes_processed, rows_processed, rows_rejected):
+    """Record progress and renew the lease; False if ``owner`` lost the job."""
+    conn = get_connection()
+    cursor = conn.execute("""
+        UPDATE upload_jobs
+        SET bytes_processed = ?, rows_processed = ?, rows_rejected = ?,
+            lease_expires_at = ?
+        WHERE id = ? AND owner = ? AND status = 'running'
+    """, (bytes_processed, rows_processed, rows_rejected,
+          _lease_expiry(lease_seconds), job_id, owner))
+    renewed = cursor.rowcount == 1
+    conn.commit()
+    conn.close()
+
+    return renewed
+
+
+def finish_upload_job(job_id, owner, result=None, error=None):
+    conn = get_connection()
+    conn.execute("""
+        UPDATE upload_jobs
+        SET status = ?, result = ?, error = ?, finished_at = ?, lease_expires_at = NULL,
+            bytes_processed = CASE WHEN ? IS NULL THEN total_bytes ELSE bytes_processed END
+        WHERE id = ? AND owner = ? AND status = 'running'
+    """, (
+        "failed" if error else "completed",
+        json.dumps(result) if result is not None else None,
+        error,
+        datetime.now().isoformat(),
+        error,
+        job_id,
+        owner
+    ))
+    conn.commit()
+    conn.close()
+
+
+def requeue_unfinished_upload_jobs():
+    """Put jobs whose worker died (lease expired) back in the queue.
+
+    Returns every queued job id, oldest first. Re-running a half-finished
+    job is safe: every chunk is an UPSERT.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        UPDATE upload_jobs SET status = 'queued', owner = NULL, lease_expires_at = NULL
+        WHERE status = 'running'
+        AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+    """, (datetime.now().isoformat(),))
+    cursor.execute(
+        "SELECT id FROM upload_jobs WHERE status = 'queued' ORDER BY created_at"
+    )
+    job_ids = [r["id"] for r in cursor.fetchall()]
+
+    conn.commit()
+    conn.close()
+
+    return job_ids
+
+
+def get_upload_job(job_id):
+    conn = get_read_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT * FROM upload_jobs WHERE id = ?", (job_id,))
+    row = cursor.fetchone()
+    conn.close()
+
+    return dict(row) if row else None
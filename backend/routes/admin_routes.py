@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from database.db import get_connection
+from models.cube import DIMENSIONS, drill_down, parse_dimensions, query_cube
+from models.enrollment import enroll_all_students, enroll_students, semester_exists
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
 
@@ -76,58 +78,93 @@ def bulk_upload_students():
 
     import csv
     from io import StringIO
-    from flask_bcrypt import Bcrypt
-
-    bcrypt = Bcrypt()
+    from services.password_service import hash_passwords
 
     stream = StringIO(file.stream.read().decode("UTF8"), newline=None)
     reader = csv.DictReader(stream)
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    count = 0
-
+    # First row wins for a roll number repeated in the file
+    rows = []
+    seen = set()
     for row in reader:
-        roll_number = row["roll_number"]
-        name = row["name"]
-        department = row["department"]
-        section = row["section"]
-        batch = row["batch"]
-        password = row["password"]
+        if row["roll_number"] not in seen:
+            seen.add(row["roll_number"])
+            rows.append(row)
 
-        password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+    roll_numbers = [row["roll_number"] for row in rows]
 
-        # Insert user
-        cursor.execute("""
-            INSERT INTO users (roll_number, password_hash, role)
-            VALUES (?, ?, ?)
-        """, (roll_number, password_hash, "student"))
-
-        user_id = cursor.lastrowid
-
-        # Insert student
-        cursor.execute("""
-            INSERT INTO students (user_id, name, department, section, batch)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user_id, name, department, section, batch))
-
-        student_id = cursor.lastrowid
-
-        # 🔥 Auto enroll student to selected semester
-        cursor.execute("""
-            INSERT INTO student_semester_enrollment (student_id, semester_id)
-            VALUES (?, ?)
-        """, (student_id, semester_id))
+    conn = get_connection()
+    cursor = conn.cursor()
 
-        count += 1
+    if not semester_exists(cursor, semester_id):
+        conn.close()
+        return jsonify({"error": "Semester not found"}), 404
+
+    def fetch_user_ids():
+        user_ids = {}
+        for start in range(0, len(roll_numbers), 500):
+            chunk = roll_numbers[start:start + 500]
+            cursor.execute(f"""
+                SELECT id, roll_number FROM users
+                WHERE roll_number IN ({",".join("?" * len(chunk))})
+            """, chunk)
+            user_ids.update({r["roll_number"]: r["id"] for r in cursor.fetchall()})
+        return user_ids
+
+    # 🔹 Re-uploads skip existing accounts instead of failing on them
+    existing = fetch_user_ids()
+    new_rows = [row for row in rows if row["roll_number"] not in existing]
+
+    # 🔥 Hash every new initial password in one parallel batch
+    password_hashes = hash_passwords(row["password"] for row in new_rows)
+
+    # Insert users
+    cursor.executemany("""
+        INSERT INTO users (roll_number, password_hash, role)
+        VALUES (?, ?, ?)
+    """, [
+        (row["roll_number"], password_hash, "student")
+        for row, password_hash in zip(new_rows, password_hashes)
+    ])
+
+    user_ids = fetch_user_ids()
+
+    # Insert students
+    cursor.executemany("""
+        INSERT INTO students (user_id, name, department, section, batch)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (
+            user_ids[row["roll_number"]],
+            row["name"],
+            row["department"],
+            row["section"],
+            row["batch"]
+        )
+        for row in new_rows
+    ])
+
+    # 🔥 Auto enroll every listed student, one INSERT ... SELECT per chunk
+    enrolled = 0
+    ids = list(user_ids.values())
+
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO student_semester_enrollment (student_id, semester_id)
+            SELECT id, ? FROM students WHERE user_id IN ({",".join("?" * len(chunk))})
+        """, (semester_id, *chunk))
+        enrolled += cursor.rowcount
 
     conn.commit()
     conn.close()
 
     return jsonify({
         "message": "Students uploaded and enrolled successfully",
-        "students_created": count
+        "students_created": len(new_rows),
+        "students_skipped": len(rows) - len(new_rows),
+        "enrolled": enrolled,
+        "already_enrolled": len(rows) - enrolled
     })
 
 @admin_bp.route("/students", methods=["GET"])
@@ -171,16 +208,21 @@ def assign_students_to_semester():
     conn = get_connection()
     cursor = conn.cursor()
 
-    for sid in student_ids:
-        cursor.execute("""
-            INSERT INTO student_semester_enrollment (student_id, semester_id)
-            VALUES (?, ?)
-        """, (sid, semester_id))
+    if not semester_exists(cursor, semester_id):
+        conn.close()
+        return jsonify({"error": "Semester not found"}), 404
+
+    inserted, skipped = enroll_students(cursor, student_ids, semester_id)
 
     conn.commit()
     conn.close()
 
-    return jsonify({"message": "Students assigned successfully"})
+    return jsonify({
+        "message": "Students assigned successfully",
+        "inserted": inserted,
+        "skipped": skipped
+    })
+
 @admin_bp.route("/assign-all-to-semester", methods=["POST"])
 @jwt_required()
 def assign_all_students_to_semester():
@@ -199,24 +241,63 @@ def assign_all_students_to_semester():
     conn = get_connection()
     cursor = conn.cursor()
 
-    # Get all students
-    cursor.execute("SELECT id FROM students")
-    students = cursor.fetchall()
-
-    count = 0
+    if not semester_exists(cursor, semester_id):
+        conn.close()
+        return jsonify({"error": "Semester not found"}), 404
 
-    for student in students:
-        cursor.execute("""
-            INSERT OR IGNORE INTO student_semester_enrollment
-            (student_id, semester_id)
-            VALUES (?, ?)
-        """, (student["id"], semester_id))
-        count += 1
+    # 🔥 One INSERT ... SELECT for the whole student body
+    inserted, skipped = enroll_all_students(cursor, semester_id)
 
     conn.commit()
     conn.close()
 
     return jsonify({
         "message": "All students assigned successfully",
-        "students_assigned": count
+        "students_assigned": inserted + skipped,
+        "inserted": inserted,
+        "skipped": skipped
     })
+
+
+# 🔹 INSTITUTION ANALYTICS (rollup cube, never scans performance)
+def _cube_filters():
+    # ?department=CSE&department=ECE&semester=3 -> {dimension: [values]}
+    return {
+        dimension: request.args.getlist(dimension)
+        for dimension in DIMENSIONS
+        if request.args.getlist(dimension)
+    }
+
+@admin_bp.route("/analytics/slice", methods=["GET"])
+@jwt_required()
+def analytics_slice():
+    claims = get_jwt()
+    role = claims.get("role")
+
+    if role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    try:
+        group_by = parse_dimensions(request.args.get("group_by"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    filters = _cube_filters()
+
+    return jsonify({
+        "group_by": group_by,
+        "filters": filters,
+        "rows": query_cube(group_by, filters)
+    })
+
+@admin_bp.route("/analytics/drill", methods=["GET"])
+@jwt_required()
+def analytics_drill():
+    claims = get_jwt()
+    role = claims.get("role")
+
+    if role != "admin":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    # Each level's rows become the next call's filter
+    return jsonify(drill_down(_cube_filters()))
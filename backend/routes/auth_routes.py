@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token
 from database.db import get_connection
 from flask_bcrypt import Bcrypt
+from services.password_service import verify_password, LoginOverloaded
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -32,11 +33,27 @@ def login():
     if not user:
         return jsonify({"error": "Invalid credentials"}), 401
 
-    bcrypt = Bcrypt(current_app)
+    # 🔥 bcrypt runs on the verify pool; shed load rather than queue forever
+    try:
+        ok, new_hash = verify_password(password, user["password_hash"])
+    except LoginOverloaded as e:
+        response = jsonify({"error": "Too many logins, please retry"})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 503
 
-    if not bcrypt.check_password_hash(user["password_hash"], password):
+    if not ok:
         return jsonify({"error": "Invalid credentials"}), 401
 
+    # Stored hash used another work factor: swap in the re-hashed one
+    if new_hash:
+        conn = get_connection()
+        conn.execute(
+            "UPDATE users SET password_hash = ? WHERE id = ?",
+            (new_hash, user["id"])
+        )
+        conn.commit()
+        conn.close()
+
     access_token = create_access_token(
         identity=str(user["id"]),
         additional_claims={"role": user["role"]}
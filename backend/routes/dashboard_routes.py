@@ -0,0 +1,39 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+
+from services.dashboard_service import build_dashboard, parse_sections, server_timing
+from services.risk_models import risk_model_version
+from services.rules import rules_version
+from utils.response_cache import cached_response
+
+dashboard_bp = Blueprint("dashboard", __name__)
+
+
+def dashboard_version():
+    # Top-risk scores follow the active model, interventions the rule file
+    return f"{risk_model_version()}.{rules_version()}"
+
+
+# 🔹 TEACHER DASHBOARD (every card in one request)
+@dashboard_bp.route("/api/dashboard", methods=["GET"])
+@jwt_required()
+@cached_response("dashboard", depends_on=dashboard_version)
+def teacher_dashboard():
+    claims = get_jwt()
+    role = claims.get("role")
+
+    if role != "teacher":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    teacher_id = int(get_jwt_identity())
+
+    try:
+        sections = parse_sections(request.args.get("sections"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    dashboard, timings = build_dashboard(teacher_id, sections)
+
+    response = jsonify(dashboard)
+    response.headers["Server-Timing"] = server_timing(timings)
+    return response
@@ -0,0 +1,60 @@
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+
+from services.export_service import (
+    export_performance,
+    describe_throughput,
+    EXPORT_FORMATS,
+    DEFAULT_BATCH_ROWS
+)
+
+export_bp = Blueprint("export_routes", __name__)
+
+
+@export_bp.route("/api/export/performance", methods=["GET"])
+@jwt_required()
+def export_performance_data():
+    user_id = int(get_jwt_identity())
+    claims = get_jwt()
+    role = claims.get("role")
+
+    # Teachers export their own classes, admins any teacher or everything
+    if role == "teacher":
+        teacher_id = user_id
+    elif role == "admin":
+        teacher_id = request.args.get("teacher_id", type=int)
+    else:
+        return jsonify({"error": "Unauthorized"}), 403
+
+    fmt = request.args.get("format", "csv")
+    semester = request.args.get("semester")
+
+    stats = {}
+
+    try:
+        chunks = export_performance(
+            fmt,
+            teacher_user_id=teacher_id,
+            semester=semester,
+            batch_rows=current_app.config.get("EXPORT_BATCH_ROWS", DEFAULT_BATCH_ROWS),
+            stats=stats
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 501
+
+    logger = current_app.logger
+    scope = f"teacher {teacher_id}" if teacher_id else "institution"
+
+    def generate():
+        yield from chunks
+        logger.info("Exported %s performance (%s): %s", fmt, scope, describe_throughput(stats))
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=performance.{extension}"}
+    )
@@ -1,6 +1,6 @@
 from flask import Blueprint, app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from models.performance import get_semester_trend, predict_next_marks
+from models.performance import get_semester_trend
 from models.performance import get_subject_difficulty
 from models.performance import calculate_class_health  # 🔥 ADD THIS IMPORT
 from models.performance import get_semester_trend
@@ -8,11 +8,18 @@ from models.performance import generate_interventions
 from models.performance import generate_comparative_insight
 from services.ml_service import (
     get_student_insight,
+    get_student_insights,
     get_top_risk_students,
-    get_class_health
+    get_class_health,
+    get_cohort_forecast,
+    get_student_risk,
+    predict_student_next_marks
 )
 
-from database.db import get_connection
+from database.db import get_read_connection
+from services.risk_models import risk_model_version
+from services.rules import get_rules, rules_version
+from utils.response_cache import cached_response
 
 ml_bp = Blueprint("ml", __name__, url_prefix="/api/ml")
 
@@ -27,7 +34,7 @@ def student_insight():
     if role != "student":
         return jsonify({"error": "Unauthorized"}), 403
 
-    conn = get_connection()
+    conn = get_read_connection()
     cursor = conn.cursor()
 
     cursor.execute("SELECT id FROM students WHERE user_id = ?", (user_id,))
@@ -53,38 +60,16 @@ def student_insight():
     avg_marks = sum(r["marks"] for r in rows) / len(rows)
     avg_attendance = sum(r["attendance"] for r in rows) / len(rows)
 
-    predicted_marks = predict_next_marks(student_id)
-
-    # 🔥 RISK SCORE
-    risk_score = 0
-    if avg_marks < 40:
-        risk_score += 50
-    elif avg_marks < 60:
-        risk_score += 25
-
-    if avg_attendance < 75:
-        risk_score += 30
-
-    risk_score = min(risk_score, 100)
-
-    # 🔥 RISK LEVEL (THIS FIXES YOUR ISSUE)
-    if risk_score >= 60:
-        risk_level = "High"
-    elif risk_score >= 30:
-        risk_level = "Medium"
-    else:
-        risk_level = "Low"
+    predicted_marks = predict_student_next_marks(student_id)
 
-    suggestions = []
+    # 🔥 Same scorer as the teacher views (trained model when one is active)
+    risk_score, risk_level = get_student_risk(student_id)
 
-    if avg_marks < 60:
-        suggestions.append("Improve subject understanding and practice more.")
-
-    if avg_attendance < 75:
-        suggestions.append("Increase attendance for better performance.")
-
-    if avg_marks >= 70 and avg_attendance >= 80:
-        suggestions.append("Great work! Keep maintaining consistency.")
+    # Same rule file as the teacher views, reloaded when it changes
+    suggestions = get_rules()["student_insight"].apply(
+        {"average_marks": avg_marks, "average_attendance": avg_attendance},
+        lambda outcomes: [outcome["text"] for outcome in outcomes]
+    )[0]
 
     conn.close()
 
@@ -99,9 +84,77 @@ def student_insight():
         "suggestions": suggestions
     })
 
+# 🔹 STUDENT INSIGHTS (Teacher View, one or many students)
+@ml_bp.route("/student-insights", methods=["GET"])
+@jwt_required()
+def student_insights():
+    claims = get_jwt()
+    role = claims.get("role")
+
+    if role != "teacher":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    teacher_id = int(get_jwt_identity())
+
+    try:
+        student_ids = [
+            int(sid) for sid in request.args.get("student_ids", "").split(",") if sid
+        ]
+    except ValueError:
+        return jsonify({"error": "student_ids must be comma separated integers"}), 400
+
+    if not student_ids:
+        return jsonify({"error": "student_ids required"}), 400
+
+    if len(student_ids) == 1:
+        return jsonify({student_ids[0]: get_student_insight(student_ids[0], teacher_id)})
+
+    return jsonify(get_student_insights(student_ids, teacher_id))
+
+# 🔹 COHORT FORECAST (Teacher View, every student in one call)
+MAX_FORECAST_HORIZON = 8
+
+@ml_bp.route("/cohort-forecast", methods=["GET"])
+@jwt_required()
+@cached_response("cohort-forecast")
+def cohort_forecast():
+    claims = get_jwt()
+    role = claims.get("role")
+
+    if role != "teacher":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    teacher_id = int(get_jwt_identity())
+
+    horizon = request.args.get("horizon", 1, type=int)
+    method = request.args.get("method", "ols")
+    level = request.args.get("level", 0.95, type=float)
+    alpha = request.args.get("alpha", type=float)
+
+    if not 1 <= horizon <= MAX_FORECAST_HORIZON:
+        return jsonify({"error": f"horizon must be between 1 and {MAX_FORECAST_HORIZON}"}), 400
+    if not 0 < level < 1:
+        return jsonify({"error": "level must be between 0 and 1"}), 400
+    if alpha is not None and not 0 < alpha <= 1:
+        return jsonify({"error": "alpha must be in (0, 1]"}), 400
+
+    try:
+        students = get_cohort_forecast(teacher_id, horizon, method, level, alpha)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "method": method,
+        "horizon": horizon,
+        "level": level,
+        "count": len(students),
+        "students": students
+    })
+
 # 🔹 TOP RISK STUDENTS (Teacher View)
 @ml_bp.route("/top-risk", methods=["GET"])
 @jwt_required()
+@cached_response("top-risk", depends_on=risk_model_version)
 def top_risk_students():
     claims = get_jwt()
     role = claims.get("role")
@@ -117,6 +170,7 @@ def top_risk_students():
 
 @ml_bp.route("/subject-difficulty", methods=["GET"])
 @jwt_required()
+@cached_response("subject-difficulty")
 def subject_difficulty():
     claims = get_jwt()
     role = claims.get("role")
@@ -137,6 +191,7 @@ def test_class_health(user_id):
 
 @ml_bp.route("/class-health", methods=["GET"])
 @jwt_required()
+@cached_response("class-health")
 def class_health():
     claims = get_jwt()
     role = claims.get("role")
@@ -154,6 +209,7 @@ def class_health():
 
 @ml_bp.route("/semester-trend", methods=["GET"])
 @jwt_required()
+@cached_response("semester-trend")
 def semester_trend():
     claims = get_jwt()
     role = claims.get("role")
@@ -168,6 +224,7 @@ def semester_trend():
 
 @ml_bp.route("/interventions", methods=["GET"])
 @jwt_required()
+@cached_response("interventions", depends_on=rules_version)
 def intervention_engine():
     claims = get_jwt()
     role = claims.get("role")
@@ -183,6 +240,7 @@ def intervention_engine():
 
 @ml_bp.route("/comparison-insight", methods=["GET"])
 @jwt_required()
+@cached_response("comparison-insight")
 def comparison_insight():
     claims = get_jwt()
     role = claims.get("role")
@@ -1,10 +1,17 @@
-from flask import Blueprint, request, jsonify
+import json
+
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from flask_bcrypt import Bcrypt
-from utils.csv_parser import parse_csv
+from services.ingestion_service import ingest_csv, MAX_REPORTED_REJECTIONS
+from services.upload_jobs import submit_upload, describe_job
+from models.upload_job import get_upload_job
+from utils.csv_parser import DEFAULT_CHUNK_SIZE
+from utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor, parse_limit
 from models.performance import (
-    insert_performance_data,
     get_all_performance_data,
+    iter_performance_data,
+    PERFORMANCE_FIELDS,
     get_average_marks,
     get_average_attendance,
     get_pass_fail_count,
@@ -13,6 +20,7 @@ from models.performance import (
 from database.db import get_connection
 
 upload_bp = Blueprint("upload_routes", __name__)
+NDJSON_FLUSH_ROWS = 500
 bcrypt = Bcrypt()
 
 
@@ -32,23 +40,114 @@ def upload_csv():
     semester = request.form.get("semester") or "1"
 
     file = request.files["file"]
-    rows = parse_csv(file)
 
-    # 🔥 Insert performance normally
-    inserted = insert_performance_data(rows, semester, user_id)
+    # 🔹 Async mode: spool the file, hand back a job id to poll
+    if request.args.get("async") in ("1", "true") or request.form.get("async") in ("1", "true"):
+        job_id = submit_upload(file, semester, user_id)
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/upload/jobs/{job_id}"
+        }), 202
+
+    chunk_size = current_app.config.get("UPLOAD_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    max_rejections = current_app.config.get(
+        "UPLOAD_MAX_REPORTED_REJECTIONS", MAX_REPORTED_REJECTIONS
+    )
+
+    try:
+        # 🔥 Stream the file, committing one chunk at a time
+        report = ingest_csv(file, semester, user_id, chunk_size,
+                            max_rejections=max_rejections)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     return jsonify({
         "message": "Upload successful",
-        "records_processed": inserted
+        "records_processed": report["inserted"],
+        **report
     })
 
 
+@upload_bp.route("/api/upload/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def upload_job_status(job_id):
+    user_id = int(get_jwt_identity())
+    job = get_upload_job(job_id)
+
+    # Teachers only ever see their own jobs
+    if job is None or job["teacher_id"] != user_id:
+        return jsonify({"error": "Job not found"}), 404
+
+    return jsonify(describe_job(job))
+
+
 @upload_bp.route("/api/performance", methods=["GET"])
 @jwt_required()
 def get_performance():
     teacher_id = int(get_jwt_identity())
-    data = get_all_performance_data(teacher_id)
-    return jsonify({"count": len(data), "data": data})
+
+    # No parameters: the original unpaginated response
+    if not request.args:
+        data = get_all_performance_data(teacher_id)
+        return jsonify({"count": len(data), "data": data})
+
+    args = request.args
+    stream = args.get("format") == "ndjson"
+
+    try:
+        fields = [f for f in args.get("fields", "").split(",") if f] or None
+        unknown = set(fields or []) - set(PERFORMANCE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+
+        after_id = decode_cursor(args["cursor"]) if args.get("cursor") else None
+        # NDJSON streams everything after the cursor unless told otherwise
+        limit = parse_limit(args.get("limit"), None if stream else DEFAULT_PAGE_SIZE)
+        student_id = args.get("student_id", type=int)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # One extra row tells us whether there is a next page
+    rows = iter_performance_data(
+        teacher_id,
+        fields=fields,
+        semester=args.get("semester"),
+        subject=args.get("subject"),
+        student_id=student_id,
+        after_id=after_id,
+        limit=limit + 1 if limit else None
+    )
+
+    if stream:
+        def generate():
+            lines = []
+            try:
+                for i, (row_id, row) in enumerate(rows):
+                    if limit and i == limit:
+                        # Trailer line: where the next request should resume
+                        lines.append(json.dumps({"next_cursor": encode_cursor(last_id)}))
+                        break
+                    last_id = row_id
+                    lines.append(json.dumps(row))
+
+                    # Flush in blocks: one write per row is slower than the query
+                    if len(lines) == NDJSON_FLUSH_ROWS:
+                        yield "\n".join(lines) + "\n"
+                        lines = []
+            finally:
+                rows.close()
+
+            if lines:
+                yield "\n".join(lines) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    page = list(rows)
+    next_cursor = encode_cursor(page[limit - 1][0]) if len(page) > limit else None
+    data = [row for _, row in page[:limit]]
+
+    return jsonify({"count": len(data), "data": data, "next_cursor": next_cursor})
 
 
 @upload_bp.route("/api/analytics/average-marks", methods=["GET"])
@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, g
+
+from models.analytics import get_teacher_snapshot
+from models.performance import (
+    get_average_marks,
+    get_average_attendance,
+    get_pass_fail_count,
+    get_at_risk_students,
+    calculate_class_health,
+    get_subject_difficulty,
+    get_semester_trend,
+    generate_interventions,
+    generate_comparative_insight
+)
+from services.ml_service import get_top_risk_students
+from utils.metrics import request_sql_stats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+# Section name -> body of the standalone endpoint it replaces
+SECTIONS = {
+    "average-marks": lambda t: {"average_marks": get_average_marks(t)},
+    "average-attendance": lambda t: {"average_attendance": get_average_attendance(t)},
+    "pass-fail": get_pass_fail_count,
+    "at-risk": get_at_risk_students,
+    "class-health": calculate_class_health,
+    "top-risk": get_top_risk_students,
+    "subject-difficulty": get_subject_difficulty,
+    "semester-trend": get_semester_trend,
+    "interventions": generate_interventions,
+    "comparison-insight": generate_comparative_insight,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app):
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("DASHBOARD_WORKERS", DEFAULT_WORKERS),
+                thread_name_prefix="dashboard"
+            )
+        return _executor
+
+
+def parse_sections(value):
+    """Requested section names in order; all of them when none are given."""
+    if not value:
+        return list(SECTIONS)
+
+    sections = list(dict.fromkeys(s.strip() for s in value.split(",") if s.strip()))
+    unknown = [s for s in sections if s not in SECTIONS]
+
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+
+    return sections
+
+
+def _run_section(app, name, teacher_id, snapshots):
+    # Each section runs in its own app context (its own pinned connection),
+    # seeded with the request's snapshot so nothing is loaded twice
+    with app.app_context():
+        g._teacher_snapshots = snapshots
+        start = time.perf_counter()
+
+        try:
+            data, error = SECTIONS[name](teacher_id), None
+        except Exception as e:
+            logger.exception("Dashboard section %s failed", name)
+            data, error = None, str(e)
+
+        return data, error, time.perf_counter() - start, g.get("_sql_stats")
+
+
+def build_dashboard(teacher_id, sections):
+    """Compute the sections concurrently.
+
+    Returns (dashboard, timings): the JSON document, and milliseconds per
+    section plus "load" and "total" for the Server-Timing header. Timings
+    stay out of the document, which the response cache replays.
+    """
+    app = current_app._get_current_object()
+    start = time.perf_counter()
+
+    # 🔥 Shared data load: the aggregate snapshot every section reads
+    get_teacher_snapshot(teacher_id)
+    snapshots = dict(g.get("_teacher_snapshots", {}))
+    load_seconds = time.perf_counter() - start
+
+    executor = _get_executor(app)
+    futures = {
+        name: executor.submit(_run_section, app, name, teacher_id, snapshots)
+        for name in sections
+    }
+
+    results = {}
+    errors = {}
+    timings = {}
+    sql = request_sql_stats()
+
+    for name, future in futures.items():
+        data, error, seconds, section_sql = future.result()
+        timings[name] = round(seconds * 1000, 3)
+
+        if error is None:
+            results[name] = data
+        else:
+            errors[name] = error
+
+        # Count the workers' queries against this request
+        if section_sql:
+            sql["queries"] += section_sql["queries"]
+            sql["seconds"] += section_sql["seconds"]
+
+    timings["load"] = round(load_seconds * 1000, 3)
+    timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+
+    dashboard = {"sections": results}
+
+    if errors:
+        dashboard["errors"] = errors
+
+    return dashboard, timings
+
+
+def server_timing(timings):
+    return ", ".join(f"{name};dur={ms}" for name, ms in timings.items())
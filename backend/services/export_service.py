@@ -0,0 +1,163 @@
+import csv
+import io
+import time
+
+from models.performance import iter_performance_data, DEFAULT_PERFORMANCE_FIELDS
+
+EXPORT_FIELDS = DEFAULT_PERFORMANCE_FIELDS + ["teacher_id"]
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Rows per Parquet row group / Arrow record batch / CSV write
+DEFAULT_BATCH_ROWS = 50000
+
+
+def load_pyarrow():
+    """pyarrow is optional: only the columnar formats need it."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow export requires pyarrow (pip install -r requirements-export.txt)")
+
+    return pyarrow
+
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file object the Arrow writers fill and we drain per batch."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _row_batches(teacher_user_id, semester, batch_rows):
+    batch = []
+
+    for _, row in iter_performance_data(
+        teacher_user_id,
+        fields=EXPORT_FIELDS,
+        semester=semester,
+        batch_size=min(batch_rows, 5000)
+    ):
+        batch.append(row)
+
+        if len(batch) == batch_rows:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _export_csv(batches):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+    writer.writeheader()
+
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8"), len(batch)
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8"), 0
+
+
+def _export_arrow(batches, fmt):
+    pa = load_pyarrow()
+
+    schema = pa.schema([
+        ("student_id", pa.int64()),
+        ("roll_number", pa.string()),
+        ("name", pa.string()),
+        ("subject", pa.string()),
+        ("semester", pa.string()),
+        ("marks", pa.int64()),
+        ("attendance", pa.int64()),
+        ("recorded_at", pa.string()),
+        ("teacher_id", pa.int64()),
+    ])
+
+    sink = _ByteSink()
+
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="snappy")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for batch in batches:
+        # One row group / record batch per chunk of rows
+        writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+        yield sink.drain(), len(batch)
+
+    writer.close()
+    yield sink.drain(), 0
+
+
+def export_performance(fmt, teacher_user_id=None, semester=None,
+                       batch_rows=DEFAULT_BATCH_ROWS, stats=None):
+    """Generator of the joined performance data as ``fmt`` bytes, per batch.
+
+    Scoped to one teacher, or the whole institution when ``teacher_user_id``
+    is None. Memory is bounded by ``batch_rows``. When given, ``stats`` is
+    filled with rows, bytes and seconds as the export runs.
+    """
+    # Validated up front, before any response has started streaming
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+
+    if fmt != "csv":
+        load_pyarrow()
+
+    stats = stats if stats is not None else {}
+    stats.update(rows=0, bytes=0, seconds=0.0)
+
+    batches = _row_batches(teacher_user_id, semester, batch_rows)
+    chunks = _export_csv(batches) if fmt == "csv" else _export_arrow(batches, fmt)
+
+    return _metered(chunks, stats)
+
+
+def _metered(chunks, stats):
+    start = time.perf_counter()
+
+    for data, rows in chunks:
+        stats["rows"] += rows
+        stats["bytes"] += len(data)
+        stats["seconds"] = time.perf_counter() - start
+
+        if data:
+            yield data
+
+
+def describe_throughput(stats):
+    seconds = stats["seconds"] or 1e-9
+    return (
+        f"{stats['rows']} rows, {stats['bytes'] / 2**20:.1f} MB in {stats['seconds']:.2f} s "
+        f"({stats['rows'] / seconds:,.0f} rows/s, {stats['bytes'] / 2**20 / seconds:.1f} MB/s)"
+    )
@@ -0,0 +1,54 @@
+from database.db import get_writer_lock
+from utils.csv_parser import iter_csv_chunks, DEFAULT_CHUNK_SIZE, RejectedRows
+from models.performance import insert_performance_data
+from utils.metrics import UPLOAD_ROWS
+
+# Rejected lines kept for the report, so a badly broken file cannot grow
+# memory or the response; the count stays exact
+MAX_REPORTED_REJECTIONS = 1000
+
+
+def _report(accepted, inserted, rejected, chunks):
+    return {
+        "accepted": accepted,
+        "inserted": inserted,
+        "updated": accepted - inserted,
+        "rejected": rejected.count,
+        "rejected_lines": [
+            {"line": line, "error": error}
+            for line, error in rejected.lines
+        ],
+        "chunks": chunks
+    }
+
+
+def ingest_csv(file, semester, teacher_id, chunk_size=DEFAULT_CHUNK_SIZE,
+               on_chunk=None, max_rejections=MAX_REPORTED_REJECTIONS):
+    """Stream a performance CSV into the database one committed chunk at a time.
+
+    Returns the upload report: ``accepted`` valid rows, of which ``inserted``
+    created a record and ``updated`` overwrote one (including repeats within
+    the file), plus the ``rejected`` count with line numbers and reasons for
+    the first ``max_rejections`` of them.
+    ``on_chunk(accepted, rejected)`` is called after every commit.
+    """
+    rejected = RejectedRows(max_rejections)
+    accepted = 0
+    inserted = 0
+    chunks = 0
+
+    for rows in iter_csv_chunks(file, chunk_size, rejected):
+        # 🔥 Each chunk is its own transaction, one writer at a time
+        with get_writer_lock():
+            inserted += insert_performance_data(rows, semester, teacher_id)
+        accepted += len(rows)
+        chunks += 1
+
+        if on_chunk is not None:
+            on_chunk(accepted, rejected.count)
+
+    UPLOAD_ROWS.inc(inserted, outcome="inserted")
+    UPLOAD_ROWS.inc(accepted - inserted, outcome="updated")
+    UPLOAD_ROWS.inc(rejected.count, outcome="rejected")
+
+    return _report(accepted, inserted, rejected, chunks)
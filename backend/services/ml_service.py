@@ -1,84 +1,209 @@
 from models.performance import get_all_performance_data
-from ml.feature_engineering import build_student_features
-from ml.risk_engine import calculate_risk_score
-from ml.forecasting import forecast_next_marks
-from ml.suggestions import generate_suggestions
+from models.student_features import (
+    FEATURE_SUM_COLUMNS,
+    get_student_feature_sums,
+    get_student_total_sums,
+    get_teacher_feature_sums,
+    get_teacher_semester_means
+)
 
-import pandas as pd
-import math
+from services.risk_models import score_risk
+from services.rules import get_rules
+from utils.metrics import timed_ml
+
+# pandas / numpy / sklearn and the ml package are imported inside each
+# function: importing this module (and so the app) stays cheap, and the
+# analytics stack is only loaded by the first request that needs it.
 
 
 # 🔹 STUDENT INSIGHT
+@timed_ml("get_student_insight")
 def get_student_insight(student_id, teacher_id):
-    all_data = get_all_performance_data(teacher_id)  # ✅ FIXED
-    df = pd.DataFrame(all_data)
+    return get_student_insights([student_id], teacher_id)[int(student_id)]
 
-    if df.empty:
-        return {"error": "No performance data available"}
 
-    # 🔥 FIX TYPE MATCH (important)
-    student_df = df[df["student_id"] == int(student_id)]
+# 🔹 BATCH STUDENT INSIGHTS
+@timed_ml("get_student_insights")
+def get_student_insights(student_ids, teacher_id):
+    """Insights for many students from the feature store, one indexed read."""
+    from ml.feature_engineering import features_from_sums
+    from ml.forecasting import ols_forecast
+    from ml.suggestions import generate_suggestions
 
-    if student_df.empty:
-        return {"error": "Student not found"}
+    student_ids = [int(sid) for sid in student_ids]
 
-    student_df = student_df.sort_values(by="semester")
+    # 🔥 Precomputed running sums, cost independent of history length
+    stored = get_student_feature_sums(teacher_id, student_ids)
+    found = [sid for sid in student_ids if sid in stored]
 
-    features = build_student_features(student_df)
+    insights = {}
 
-    # 🔥 FIX NaN values
-    for key, value in features.items():
-        if isinstance(value, float) and math.isnan(value):
-            features[key] = 0
+    if found:
+        sums = {
+            column: [stored[sid][column] for sid in found]
+            for column in FEATURE_SUM_COLUMNS
+        }
+        features = features_from_sums(sums)
+        predicted = ols_forecast(sums)[0][:, 0]
+        risk_scores, risk_levels = score_risk(features)
+        suggestions = generate_suggestions(features, get_rules())
 
-    risk_score, risk_level = calculate_risk_score(features)
-    predicted_marks = forecast_next_marks(student_df)
-    suggestions = generate_suggestions(features)
+        for i, sid in enumerate(found):
+            student_features = {
+                key: (int(values[i]) if key == "failed_subjects" else float(values[i]))
+                for key, values in features.items()
+            }
+            insights[sid] = {
+                "student_id": sid,
+                "risk_score": float(round(risk_scores[i], 2)),
+                "risk_level": str(risk_levels[i]),
+                "predicted_next_marks": float(round(predicted[i], 2)),
+                "features": student_features,
+                "suggestions": suggestions[i],
+            }
 
     return {
-        "student_id": int(student_id),  # 🔥 FIX
-        "risk_score": float(round(risk_score, 2)),  # 🔥 FIX
-        "risk_level": str(risk_level),  # 🔥 FIX
-        "predicted_next_marks": float(round(predicted_marks, 2)),  # 🔥 FIX
-        "features": features,
-        "suggestions": suggestions,
+        sid: insights.get(sid, {"error": "Student not found"})
+        for sid in student_ids
     }
 
 
 # 🔹 TOP RISK STUDENTS
-def get_top_risk_students(teacher_id):
-    all_data = get_all_performance_data(teacher_id)
-    df = pd.DataFrame(all_data)
+@timed_ml("get_top_risk_students")
+def get_top_risk_students(teacher_id, limit=10):
+    import numpy as np
+    from ml.feature_engineering import features_from_sums
 
-    if df.empty:
+    rows = get_teacher_feature_sums(teacher_id)
+
+    if not rows:
         return []
 
-    results = []
+    # 🔥 Whole cohort from the feature store in one vectorised pass
+    features = features_from_sums({
+        column: [row[column] for row in rows] for column in FEATURE_SUM_COLUMNS
+    })
+    risk_scores, risk_levels = score_risk(features)
+
+    # Rank on the rounded score, ties keep student id order
+    rounded = np.array([round(score, 2) for score in risk_scores.tolist()])
+
+    if len(rounded) > limit:
+        threshold = -np.partition(-rounded, limit - 1)[limit - 1]
+        candidates = np.flatnonzero(rounded >= threshold)
+    else:
+        candidates = np.arange(len(rounded))
+
+    top = candidates[np.lexsort((candidates, -rounded[candidates]))][:limit]
+
+    return [
+        {
+            "student_id": int(rows[i]["student_id"]),
+            "roll_number": str(rows[i]["roll_number"]),
+            "risk_score": float(rounded[i]),
+            "risk_level": str(risk_levels[i])
+        }
+        for i in top
+    ]
+
+
+# 🔹 FORECASTS
+@timed_ml("predict_student_next_marks")
+def predict_student_next_marks(student_id):
+    """Next-semester OLS forecast over all of a student's marks."""
+    from ml.forecasting import ols_forecast
+
+    sums = get_student_total_sums(student_id)
+
+    if sums is None:
+        return 0
 
-    for student_id in df["student_id"].unique():
-        student_df = df[df["student_id"] == student_id]
-        student_df = student_df.sort_values(by="semester")
+    return round(float(ols_forecast(sums)[0][0, 0]), 2)
 
-        # 🔥 GET ROLL NUMBER
-        roll_number = str(student_df.iloc[0]["roll_number"])
 
-        features = build_student_features(student_df)
-        risk_score, risk_level = calculate_risk_score(features)
+@timed_ml("get_student_risk")
+def get_student_risk(student_id):
+    """(risk_score, risk_level) over all of a student's marks."""
+    from ml.feature_engineering import features_from_sums
 
-        results.append({
-            "student_id": int(student_id),
-            "roll_number": roll_number,   # ✅ FIX
-            "risk_score": float(round(risk_score, 2)),
-            "risk_level": risk_level
-        })
+    sums = get_student_total_sums(student_id)
 
-    results = sorted(results, key=lambda x: x["risk_score"], reverse=True)
+    if sums is None:
+        return 0.0, "Low"
 
-    return results[:10]
+    scores, levels = score_risk(features_from_sums(sums))
+
+    return float(round(scores.item(), 2)), str(levels.item())
+
+
+@timed_ml("get_cohort_forecast")
+def get_cohort_forecast(teacher_id, horizon=1, method="ols", level=0.95,
+                        alpha=None):
+    """Every student's forecast for the next ``horizon`` semesters, one pass."""
+    import numpy as np
+    from ml.forecasting import (
+        DEFAULT_SMOOTHING, FORECAST_METHODS, ols_forecast, ses_forecast
+    )
+
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"method must be one of {', '.join(FORECAST_METHODS)}")
+
+    rows = get_teacher_feature_sums(teacher_id)
+    horizons = list(range(1, horizon + 1))
+
+    if not rows:
+        return []
+
+    last_semesters = np.array([row["max_x"] for row in rows])
+
+    if method == "ols":
+        predicted, lower, upper = ols_forecast({
+            column: [row[column] for row in rows] for column in FEATURE_SUM_COLUMNS
+        }, horizons, level)
+    else:
+        # Students x semesters matrix of semester means, NaN where absent
+        means = get_teacher_semester_means(teacher_id)
+        positions = {row["student_id"]: i for i, row in enumerate(rows)}
+        semesters = sorted({m["x"] for m in means})
+        columns = {x: j for j, x in enumerate(semesters)}
+
+        history = np.full((len(rows), len(semesters)), np.nan)
+        for m in means:
+            if m["student_id"] in positions:
+                history[positions[m["student_id"]], columns[m["x"]]] = m["mean_marks"]
+
+        predicted, lower, upper = ses_forecast(
+            history, horizons, level,
+            DEFAULT_SMOOTHING if alpha is None else alpha
+        )
+
+    def bound(value):
+        return None if np.isnan(value) else float(round(value, 2))
+
+    return [
+        {
+            "student_id": int(row["student_id"]),
+            "roll_number": str(row["roll_number"]),
+            "last_semester": int(last_semesters[i]),
+            "forecasts": [
+                {
+                    "semester": int(last_semesters[i] + h),
+                    "predicted_marks": float(round(predicted[i, k], 2)),
+                    "lower": bound(lower[i, k]),
+                    "upper": bound(upper[i, k]),
+                }
+                for k, h in enumerate(horizons)
+            ]
+        }
+        for i, row in enumerate(rows)
+    ]
 
 
 # 🔹 CLASS HEALTH
+@timed_ml("get_class_health")
 def get_class_health(teacher_id):
+    import pandas as pd
+
     all_data = get_all_performance_data(teacher_id)
     df = pd.DataFrame(all_data)
 
@@ -117,6 +242,7 @@ def get_class_health(teacher_id):
         "pass_probability": float(round(pass_rate, 2)),  # 🔥 FIX
         "current_avg": float(round(avg_marks, 2))  # 🔥 FIX
     }
+@timed_ml("get_subject_difficulty")
 def get_subject_difficulty(teacher_id):
     from models.performance import get_subject_difficulty as db_func
     
@@ -0,0 +1,179 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+# Below this many passwords the process pool costs more than it saves
+MIN_PARALLEL_BATCH = 8
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Typical bcrypt time at work factor 12, for Retry-After estimates
+COST_12_SECONDS = 0.25
+
+# Login verification has its own pool, so a bulk upload never queues logins
+_verify_pool = None
+_verify_pool_lock = threading.Lock()
+_verify_lock = threading.Lock()
+_verify_pending = 0
+
+
+class LoginOverloaded(Exception):
+    """More logins queued than the verify pool can clear in time."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Login queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _hash_password(args):
+    password, rounds, prefix = args
+
+    if not password:
+        raise ValueError("Password must be non-empty.")
+
+    salt = bcrypt.gensalt(rounds=rounds, prefix=prefix.encode("utf-8"))
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def _get_pool(workers):
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context())
+
+    return _pool
+
+
+def bulk_log_rounds():
+    """Work factor for initial passwords of bulk-provisioned accounts."""
+    from flask import current_app
+
+    return current_app.config.get(
+        "BULK_PASSWORD_LOG_ROUNDS",
+        current_app.config.get("BCRYPT_LOG_ROUNDS", 12)
+    )
+
+
+def hash_passwords(passwords, rounds=None):
+    """Hash a whole upload's passwords at once, spread across all cores.
+
+    Returns the hashes in the same order as ``passwords``.
+    """
+    from flask import current_app
+
+    passwords = list(passwords)
+
+    if rounds is None:
+        rounds = bulk_log_rounds()
+
+    prefix = current_app.config.get("BCRYPT_HASH_PREFIX", "2b")
+    jobs = [(password, rounds, prefix) for password in passwords]
+
+    if len(jobs) < MIN_PARALLEL_BATCH:
+        return [_hash_password(job) for job in jobs]
+
+    workers = current_app.config.get("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    return list(_get_pool(workers).map(_hash_password, jobs, chunksize=chunksize))
+
+
+# 🔹 LOGIN VERIFICATION
+
+def hash_cost(hashed):
+    """Work factor of a stored bcrypt hash ($2b$12$... -> 12)."""
+    try:
+        return int(hashed.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _check_password(args):
+    password, hashed, rounds, prefix = args
+
+    try:
+        ok = bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        # Not a bcrypt hash
+        return False, None
+
+    # 🔥 Upgrade (or downgrade) the stored cost while we hold the plaintext
+    if ok and hash_cost(hashed) != rounds:
+        return True, _hash_password((password, rounds, prefix))
+
+    return ok, None
+
+
+def _worker_context():
+    """Start method for the hashing pools.
+
+    A forked child inherits every lock the threaded server held at fork
+    time and can hang on one; forkserver children fork from a clean
+    single-threaded process instead. spawn where forkserver is missing.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _get_verify_pool(workers):
+    global _verify_pool
+
+    # Double-checked, so concurrent first logins start only one pool
+    if _verify_pool is None:
+        with _verify_pool_lock:
+            if _verify_pool is None:
+                _verify_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=_worker_context()
+                )
+
+    return _verify_pool
+
+
+def verify_password(password, hashed):
+    """Check a login on the verify pool.
+
+    Returns (ok, new_hash); new_hash is set when the stored work factor
+    differs from BCRYPT_LOG_ROUNDS and should replace the stored hash.
+    Raises LoginOverloaded instead of queueing past LOGIN_MAX_PENDING.
+    """
+    from flask import current_app
+
+    global _verify_pending
+
+    if not password or not hashed:
+        return False, None
+
+    config = current_app.config
+    rounds = config.get("BCRYPT_LOG_ROUNDS", 12)
+    job = (password, hashed, rounds, config.get("BCRYPT_HASH_PREFIX", "2b"))
+
+    workers = config.get("LOGIN_VERIFY_WORKERS")
+    if workers == 0:
+        # Pool disabled: verify on the request thread
+        return _check_password(job)
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = config.get("LOGIN_MAX_PENDING") or workers * 8
+
+    with _verify_lock:
+        if _verify_pending >= max_pending:
+            # Roughly how long the queue ahead takes to drain
+            per_check = COST_12_SECONDS * 2 ** (rounds - 12)
+            retry_after = config.get("LOGIN_RETRY_AFTER") or max(
+                1, math.ceil(_verify_pending / workers * per_check)
+            )
+            raise LoginOverloaded(retry_after)
+        _verify_pending += 1
+
+    try:
+        return _get_verify_pool(workers).submit(_check_password, job).result()
+    finally:
+        with _verify_lock:
+            _verify_pending -= 1
@@ -0,0 +1,126 @@
+import os
+import threading
+
+from flask import current_app
+
+from database.db import get_database_path
+from ml.model_registry import list_models
+from models.student_features import get_semester_sums
+
+# The active risk model, loaded once per worker process. Keyed by registry
+# directory so apps pointed at different databases do not share a model.
+_models = {}
+_warmups = {}
+_lock = threading.Lock()
+
+MODEL_NAME = "risk"
+
+
+def get_model_dir():
+    return current_app.config.get("RISK_MODEL_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(get_database_path())), "risk_models"
+    )
+
+
+def _load(directory):
+    from ml.model_registry import load_active_model
+
+    model, metadata = load_active_model(directory, MODEL_NAME)
+
+    with _lock:
+        _models[directory] = (model, metadata)
+
+
+def init_app(app):
+    """Warm-load the active model in the background at start-up.
+
+    Importing sklearn and unpickling takes a second or more, so it runs on a
+    thread: the factory returns at once and only a request arriving before
+    the load finishes waits for it. Nothing is loaded when no model exists.
+    """
+    if not app.config.get("RISK_MODEL_PRELOAD", True):
+        return
+
+    with app.app_context():
+        directory = get_model_dir()
+
+    if not any(entry["active"] for entry in list_models(directory, MODEL_NAME)):
+        return
+
+    thread = threading.Thread(target=_load, args=(directory,), name="risk-model-warmup", daemon=True)
+    with _lock:
+        _warmups[directory] = thread
+    thread.start()
+
+
+def get_risk_model():
+    """(model, metadata) of the active risk model, or (None, None)."""
+    directory = get_model_dir()
+
+    warmup = _warmups.get(directory)
+    if warmup is not None:
+        warmup.join()
+
+    with _lock:
+        loaded = _models.get(directory)
+
+    if loaded is None:
+        _load(directory)
+        loaded = _models[directory]
+
+    return loaded
+
+
+def risk_model_version():
+    """Cache token for responses containing score_risk() output."""
+    _, metadata = get_risk_model()
+
+    # "rules" while the hand-tuned fallback is in use
+    return f"risk-v{metadata['version']}" if metadata else "rules"
+
+
+def score_risk(features):
+    """Risk (scores 0-100, levels) for a cohort of feature arrays.
+
+    With a trained model, the score is its probability of failing a subject
+    next semester; until one is trained, the hand-tuned weights are used.
+    """
+    from ml.risk_engine import calculate_risk_scores, risk_levels
+    from ml.risk_model import feature_matrix
+
+    model, _ = get_risk_model()
+
+    if model is None:
+        return calculate_risk_scores(features)
+
+    # 🔥 Whole cohort in a single predict_proba call
+    scores = model.predict_proba(feature_matrix(features))[:, 1] * 100
+
+    return scores, risk_levels(scores)
+
+
+def train_and_register(activate=True):
+    """Fit a risk model on every teacher's history and store a new version."""
+    from ml.model_registry import save_model
+    from ml.risk_model import FEATURE_NAMES, build_training_set, train_risk_model
+
+    semester_sums = get_semester_sums()
+
+    if not semester_sums:
+        raise ValueError("No performance data to train on")
+
+    X, y = build_training_set(semester_sums)
+    model, metrics = train_risk_model(X, y)
+
+    directory = get_model_dir()
+    entry = save_model(directory, MODEL_NAME, model, {
+        "features": list(FEATURE_NAMES),
+        "label": "fails a subject next semester",
+        **metrics
+    }, activate=activate)
+
+    if activate:
+        with _lock:
+            _models[directory] = (model, entry)
+
+    return entry
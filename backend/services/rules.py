@@ -0,0 +1,58 @@
+import logging
+import os
+import threading
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ml", "rules.json"
+)
+
+# path -> ((mtime_ns, size), compiled rule book), per worker process
+_books = {}
+_lock = threading.Lock()
+
+
+def get_rules_path():
+    return current_app.config.get("RULES_PATH") or DEFAULT_RULES_PATH
+
+
+def get_rules():
+    """The compiled rule book, recompiled whenever the file changes on disk.
+
+    Edits take effect on the next request without a restart. A file that
+    fails to load is logged and the previous rules stay in force.
+    """
+    path = get_rules_path()
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        loaded = _books.get(path)
+
+    if loaded is not None and loaded[0] == signature:
+        return loaded[1]
+
+    from ml.rule_engine import load_rules
+
+    try:
+        book = load_rules(path)
+    except (OSError, ValueError) as e:
+        if loaded is None:
+            raise
+        logger.error("Keeping rules %s, reload failed: %s", loaded[1].version, e)
+        book = loaded[1]
+    else:
+        logger.info("Loaded rules %s from %s", book.version, path)
+
+    # A broken file is remembered too, so it is not re-parsed every request
+    with _lock:
+        _books[path] = (signature, book)
+
+    return book
+
+
+def rules_version():
+    return get_rules().version
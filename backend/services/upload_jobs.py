@@ -0,0 +1,188 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+
+from database.db import get_database_path
+from models.upload_job import (
+    create_upload_job,
+    claim_upload_job,
+    update_upload_job_progress,
+    finish_upload_job,
+    requeue_unfinished_upload_jobs,
+    get_upload_job
+)
+from services.ingestion_service import ingest_csv, MAX_REPORTED_REJECTIONS
+from utils.csv_parser import DEFAULT_CHUNK_SIZE
+
+DEFAULT_WORKERS = 2
+DEFAULT_LEASE_SECONDS = 600
+
+_executor = None
+_executor_lock = threading.Lock()
+_instance = uuid.uuid4().hex[:8]
+
+
+class UploadJobLeaseLost(Exception):
+    pass
+
+
+def worker_id():
+    """Owner recorded on the jobs this process runs."""
+    return f"{socket.gethostname()}:{os.getpid()}:{_instance}"
+
+
+def _lease_seconds(app):
+    return app.config.get("UPLOAD_JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+
+
+def _get_executor(app):
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("UPLOAD_JOB_WORKERS", DEFAULT_WORKERS),
+                thread_name_prefix="upload-job"
+            )
+        return _executor
+
+
+def get_spool_dir():
+    spool_dir = current_app.config.get("UPLOAD_SPOOL_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(get_database_path())), "upload_spool"
+    )
+    os.makedirs(spool_dir, exist_ok=True)
+    return spool_dir
+
+
+def submit_upload(file, semester, teacher_id):
+    """Spool the upload to disk, record the job and queue it. Returns the id."""
+    job_id = uuid.uuid4().hex
+    file_path = os.path.join(get_spool_dir(), f"{job_id}.csv")
+
+    file.save(file_path)
+    create_upload_job(job_id, teacher_id, semester, file_path,
+                      os.path.getsize(file_path))
+
+    app = current_app._get_current_object()
+    _get_executor(app).submit(_run_job, app, job_id)
+
+    return job_id
+
+
+def _run_job(app, job_id):
+    # Each worker runs in its own app context: its own pinned connections
+    with app.app_context():
+        owner = worker_id()
+        lease = _lease_seconds(app)
+
+        if not claim_upload_job(job_id, owner, lease):
+            return
+
+        job = get_upload_job(job_id)
+        handed_over = False
+
+        try:
+            with open(job["file_path"], "rb") as f:
+                def on_chunk(accepted, rejected):
+                    # Progress doubles as the heartbeat that renews the lease
+                    if not update_upload_job_progress(
+                        job_id, owner, lease, f.tell(), accepted, rejected
+                    ):
+                        raise UploadJobLeaseLost(job_id)
+
+                report = ingest_csv(
+                    FileStorage(stream=f, filename=os.path.basename(job["file_path"])),
+                    job["semester"],
+                    job["teacher_id"],
+                    app.config.get("UPLOAD_CHUNK_SIZE", DEFAULT_CHUNK_SIZE),
+                    on_chunk,
+                    app.config.get("UPLOAD_MAX_REPORTED_REJECTIONS", MAX_REPORTED_REJECTIONS)
+                )
+
+            update_upload_job_progress(
+                job_id, owner, lease, job["total_bytes"], report["accepted"], report["rejected"]
+            )
+            finish_upload_job(job_id, owner, result=report)
+        except UploadJobLeaseLost:
+            # The worker that took the job over still needs the spool file
+            handed_over = True
+            app.logger.warning("Upload job %s lease expired, another worker took it over", job_id)
+        except Exception as e:
+            app.logger.exception("Upload job %s failed", job_id)
+            finish_upload_job(job_id, owner, error=str(e))
+        finally:
+            # Completed or failed, the spooled CSV is no longer needed
+            if not handed_over:
+                try:
+                    os.remove(job["file_path"])
+                except OSError:
+                    pass
+
+
+def resume_upload_jobs(app):
+    """Requeue jobs left queued, or running under an expired lease."""
+    with app.app_context():
+        job_ids = requeue_unfinished_upload_jobs()
+
+    for job_id in job_ids:
+        _get_executor(app).submit(_run_job, app, job_id)
+
+    return job_ids
+
+
+def init_app(app):
+    # Resume from the first request rather than at import, so CLI commands,
+    # benchmarks and the debug reloader's watcher never start workers. The
+    # check repeats once per lease period, which picks up jobs whose worker
+    # died after this process started.
+    state = {"next_check": 0.0}
+    lock = threading.Lock()
+
+    @app.before_request
+    def resume_pending_uploads():
+        now = time.monotonic()
+        if now < state["next_check"]:
+            return
+        with lock:
+            if now < state["next_check"]:
+                return
+            state["next_check"] = now + _lease_seconds(app)
+        resume_upload_jobs(app)
+
+
+def describe_job(job):
+    """Status payload for polling: progress, ETA and the final report."""
+    status = {
+        "job_id": job["id"],
+        "status": job["status"],
+        "semester": job["semester"],
+        "rows_processed": job["rows_processed"],
+        "rows_rejected": job["rows_rejected"],
+        "progress": round(job["bytes_processed"] / job["total_bytes"], 4)
+        if job["total_bytes"] else 1.0,
+        "eta_seconds": None,
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "error": job["error"],
+        "result": None
+    }
+
+    if job["status"] == "running" and job["started_at"] and job["bytes_processed"]:
+        elapsed = (datetime.now() - datetime.fromisoformat(job["started_at"])).total_seconds()
+        remaining = job["total_bytes"] - job["bytes_processed"]
+        status["eta_seconds"] = round(elapsed * remaining / job["bytes_processed"], 1)
+
+    if job["result"]:
+        status["result"] = json.loads(job["result"])
+
+    return status
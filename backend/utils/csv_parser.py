@@ -9,29 +9,95 @@ REQUIRED_HEADERS = [
     "attendance"
 ]
 
-def parse_csv(file):
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class RejectedRows:
+    """Exact count of rejected rows, with (line_number, reason) for the first ``limit``."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.count = 0
+        self.lines = []
+
+    def add(self, line_number, reason):
+        self.count += 1
+        if len(self.lines) < self.limit:
+            self.lines.append((line_number, reason))
+
+
+def _validate_row(row):
+    student_id = (row.get("student_id") or "").strip()
+    subject = (row.get("subject") or "").strip()
+
+    if not student_id:
+        raise ValueError("missing student_id")
+    if not subject:
+        raise ValueError("missing subject")
+
+    try:
+        marks = int(row["marks"])
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid marks {row.get('marks')!r}")
+
+    try:
+        attendance = int(row["attendance"])
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid attendance {row.get('attendance')!r}")
+
+    return {
+        "student_id": student_id,
+        "subject": subject,
+        "semester": (row.get("semester") or "").strip(),
+        "marks": marks,
+        "attendance": attendance,
+    }
+
+
+def iter_csv_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE, rejected=None):
+    """Yield validated rows in lists of at most ``chunk_size``.
+
+    Reads the upload as a stream, so memory stays flat however large the
+    file is. Every rejected row is recorded in ``rejected``, a RejectedRows.
+    """
     file.stream.seek(0)
     stream = TextIOWrapper(file.stream, encoding="utf-8-sig", newline="")
 
     reader = csv.DictReader(stream)
 
-    headers = [h.strip().lower() for h in reader.fieldnames]
+    headers = [h.strip().lower() for h in reader.fieldnames or []]
 
     if headers != REQUIRED_HEADERS:
         raise ValueError(f"Expected headers {REQUIRED_HEADERS}, got {headers}")
 
-    data = []
+    # Match the normalised header names whatever their case/padding was
+    reader.fieldnames = headers
+
+    chunk = []
 
     for row in reader:
         try:
-            data.append({
-                "student_id": row["student_id"].strip(),
-                "subject": row["subject"].strip(),
-                "semester": row["semester"].strip(),
-                "marks": int(row["marks"]),
-                "attendance": int(row["attendance"]),
-            })
-        except:
+            chunk.append(_validate_row(row))
+        except ValueError as e:
+            if rejected is not None:
+                rejected.add(reader.line_num, str(e))
             continue
 
-    return data
\ No newline at end of file
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+    # Hand the underlying stream back to its owner open
+    stream.detach()
+
+
+def parse_csv(file):
+    data = []
+
+    for chunk in iter_csv_chunks(file):
+        data.extend(chunk)
+
+    return data
@@ -0,0 +1,200 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from flask import Response, g, request
+
+# Prometheus' default latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+request_logger = logging.getLogger("request_log")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(names, key + (bound,))} {cumulative}"
+                    )
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by endpoint.",
+    labels=("endpoint", "method", "status")
+)
+REQUEST_SQL_QUERIES = Histogram(
+    "http_request_sql_queries",
+    "SQL statements executed per request.",
+    labels=("endpoint",),
+    buckets=COUNT_BUCKETS
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds",
+    "Cumulative time spent in SQLite per request.",
+    labels=("endpoint",)
+)
+ML_SECONDS = Histogram(
+    "ml_compute_seconds",
+    "Time spent in pandas/numpy/sklearn analytics by function.",
+    labels=("function",)
+)
+UPLOAD_ROWS = Counter(
+    "upload_rows_total",
+    "CSV rows processed by uploads.",
+    labels=("outcome",)
+)
+
+REGISTRY = [REQUEST_LATENCY, REQUEST_SQL_QUERIES, REQUEST_SQL_SECONDS, ML_SECONDS, UPLOAD_ROWS]
+
+# Callables returning extra exposition lines at scrape time (database pools)
+COLLECTORS = []
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    for collect in COLLECTORS:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
+
+
+# 🔹 SQL accounting, fed by the connection layer
+
+def request_sql_stats():
+    """Per-request SQL counters; database.db binds them to pinned connections."""
+    stats = g.get("_sql_stats")
+    if stats is None:
+        stats = g._sql_stats = {"queries": 0, "seconds": 0.0}
+    return stats
+
+
+def timed_ml(function_name):
+    """Record how long an analytics function takes in ml_compute_seconds."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ML_SECONDS.observe(time.perf_counter() - start, function=function_name)
+        return wrapper
+    return decorator
+
+
+# 🔹 Flask wiring
+
+def init_app(app):
+    if app.config.get("REQUEST_LOG", True) and not request_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        request_logger.addHandler(handler)
+        request_logger.setLevel(logging.INFO)
+        request_logger.propagate = False
+
+    @app.before_request
+    def start_request_timer():
+        g._request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop("_request_started", None)
+        if started is None:
+            return response
+
+        duration = time.perf_counter() - started
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        sql = g.get("_sql_stats") or {"queries": 0, "seconds": 0.0}
+
+        REQUEST_LATENCY.observe(
+            duration, endpoint=endpoint, method=request.method, status=response.status_code
+        )
+        REQUEST_SQL_QUERIES.observe(sql["queries"], endpoint=endpoint)
+        REQUEST_SQL_SECONDS.observe(sql["seconds"], endpoint=endpoint)
+
+        # One structured line per request
+        request_logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "endpoint": endpoint,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "sql_queries": sql["queries"],
+            "sql_ms": round(sql["seconds"] * 1000, 3),
+        }))
+
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
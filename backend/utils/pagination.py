@@ -0,0 +1,35 @@
+import base64
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
+
+def encode_cursor(last_id):
+    # Opaque to clients: they echo it back, never build it
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, last_id = base64.urlsafe_b64decode(padded).decode().split(":")
+        if prefix != "id":
+            raise ValueError
+        return int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE):
+    if value is None:
+        return default
+
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    return limit
@@ -0,0 +1,119 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+from models.data_version import get_data_version
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class LRUCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+response_cache = LRUCache()
+
+
+def _etag(user_id, endpoint, params, version):
+    digest = hashlib.sha1(repr((user_id, endpoint, params)).encode("utf-8"))
+    return f"{digest.hexdigest()[:16]}-v{version}"
+
+
+def cached_response(endpoint, depends_on=None):
+    """Cache a teacher's JSON response until their data version changes.
+
+    Must sit below @jwt_required(). Only 200 responses are stored; entries
+    are keyed by user, endpoint, query string and data version, so an upload
+    (which bumps the version) invalidates exactly that teacher's entries.
+    ``depends_on`` returns a further version token (e.g. of the rule file)
+    that the response also depends on.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = get_jwt_identity()
+            params = tuple(sorted(request.args.items(multi=True)))
+            version = get_data_version(int(user_id))
+
+            if depends_on is not None:
+                version = f"{version}.{depends_on()}"
+
+            etag = _etag(user_id, endpoint, params, version)
+
+            # Unchanged dashboard: skip the cache and the computation entirely
+            if etag in request.if_none_match:
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+
+            response_cache.max_entries = current_app.config.get(
+                "RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES
+            )
+            key = (user_id, endpoint, params, version)
+            cached = response_cache.get(key)
+            computed = None
+
+            if cached is None:
+                computed = make_response(view(*args, **kwargs))
+
+                if computed.status_code != 200:
+                    return computed
+
+                cached = (computed.get_data(), computed.mimetype)
+                response_cache.set(key, cached)
+
+            body, mimetype = cached
+            response = Response(body, status=200, mimetype=mimetype)
+            response.set_etag(etag)
+
+            # Timings describe this request's computation, never a cache hit
+            if computed is not None and "Server-Timing" in computed.headers:
+                response.headers["Server-Timing"] = computed.headers["Server-Timing"]
+
+            return response
+
+        return wrapper
+
+    return decorator